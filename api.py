@@ -0,0 +1,237 @@
+import argparse
+import json
+import sqlite3
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from app import claims, repository, search, writes
+from app.db import get_pool, transaction
+from app.schema import apply_schema
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BATCH = 500
+MAX_BODY_BYTES = 1_000_000
+
+# -------------------------------------------------------
+# JSON API
+# -------------------------------------------------------
+# A small HTTP API for partner kitchens and NGOs, run next to app.py on the
+# same database and data layer:
+#
+#   GET  /listings        open listings, filtered and paginated
+#   GET  /claims?ids=...  claims by ID, to poll their status
+#   POST /claims          claim many listings at once
+#   POST /claims/status   change many claims' statuses at once
+#
+# Every GET response carries an ETag made from the Table_Versions counters
+# of the tables it reads (plus today's date, since listings close at
+# midnight UTC). A client that sends it back in If-None-Match gets 304 Not
+# Modified until one of those tables is written to, which costs one read of
+# Table_Versions instead of the query. Writes go through the group-commit
+# write queue (app/writes.py), like the Manage pages' writes.
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _param(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{name} must be an integer")
+
+def _page_size(query):
+    limit = _int(_param(query, "limit", DEFAULT_PAGE_SIZE), "limit")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ApiError(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+def _batch(body, key):
+    items = body.get(key) if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ApiError(400, f"body must be an object with a non-empty '{key}' list")
+    if len(items) > MAX_BATCH:
+        raise ApiError(413, f"at most {MAX_BATCH} {key} per request")
+    if not all(isinstance(item, dict) for item in items):
+        raise ApiError(400, f"every item of '{key}' must be an object")
+    return items
+
+# -------------------------------------------------------
+# Endpoints
+# -------------------------------------------------------
+# The listings cursor is "YYYY-MM-DD,Food_ID" for open listings (soonest
+# expiry first) and "Food_ID" with open=0 (all listings by ID).
+def get_listings(query, pool):
+    open_only = _param(query, "open", "1") != "0"
+    after = _param(query, "after")
+    if after is not None:
+        if open_only:
+            expiry, _, food_id = after.rpartition(",")
+            after = (expiry, _int(food_id, "after"))
+        else:
+            after = _int(after, "after")
+
+    rows, next_after = search.find_listings(
+        location=_param(query, "location"), food_type=_param(query, "food_type"),
+        meal_type=_param(query, "meal_type"), expires_from=_param(query, "expires_from"),
+        expires_to=_param(query, "expires_to"), open_only=open_only, after=after,
+        limit=_page_size(query), pool=pool)
+    if next_after is not None and open_only:
+        next_after = f"{next_after[0]},{next_after[1]}"
+    return {"listings": rows, "next": None if next_after is None else str(next_after)}
+
+def get_claims(query, pool):
+    ids = [_int(i, "ids") for i in (_param(query, "ids") or "").split(",") if i.strip()]
+    if not ids:
+        raise ApiError(400, "ids must list one or more Claim_IDs, e.g. ids=1,2,3")
+    if len(ids) > MAX_BATCH:
+        raise ApiError(413, f"at most {MAX_BATCH} ids per request")
+    found = repository.get_many(repository.Claim, ids, pool=pool)
+    return {"claims": [record.as_dict() for record in found]}
+
+# {"claims": [{"food_id": 1, "receiver_id": 2}, ...]} -> one result per item,
+# in order: {"claim_id": ...} or {"error": "listing_closed"} etc.
+def post_claims(body, pool):
+    items = _batch(body, "claims")
+    pairs = [(_int(item.get("food_id"), "food_id"), _int(item.get("receiver_id"), "receiver_id")) for item in items]
+    results = writes.get_write_queue(pool).submit(claims.request_claims, pairs).result()
+    return {"results": [{"error": r} if isinstance(r, str) else {"claim_id": r} for r in results]}
+
+# {"updates": [{"claim_id": 1, "status": "Approved"}, ...]} -> one result per
+# update, in order: "updated", "not_found" or "out_of_stock"
+def post_claim_statuses(body, pool):
+    items = _batch(body, "updates")
+    updates = []
+    for item in items:
+        if item.get("status") not in claims.STATUSES:
+            raise ApiError(400, f"status must be one of {', '.join(claims.STATUSES)}")
+        updates.append((_int(item.get("claim_id"), "claim_id"), item["status"]))
+    results = writes.get_write_queue(pool).submit(claims.update_claim_statuses, updates).result()
+    return {"results": [{"claim_id": claim_id, "result": result} for claim_id, result in results]}
+
+# path -> method -> (endpoint, tables its GET response depends on)
+ROUTES = {
+    "/listings": {"GET": (get_listings, ["Food_Listings"])},
+    "/claims": {"GET": (get_claims, ["Claims"]), "POST": (post_claims, None)},
+    "/claims/status": {"POST": (post_claim_statuses, None)},
+}
+
+def etag(conn, tables):
+    versions = dict(conn.execute("SELECT Table_Name, Version FROM Table_Versions"))
+    return '"' + "-".join(str(versions.get(t, 0)) for t in tables) + time.strftime("-%Y%m%d", time.gmtime()) + '"'
+
+# If-None-Match is "*" or a comma-separated list of tags, each possibly weak
+# (W/"..."); GET compares them weakly, so W/"x" matches "x"
+def etag_matches(if_none_match, tag):
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or tag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+# -------------------------------------------------------
+# HTTP Server
+# -------------------------------------------------------
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pollers reuse one connection
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    pool = None
+    quiet = False
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload=None, headers=()):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = _int(self.headers.get("Content-Length", 0), "Content-Length")
+        # A body that isn't read would be taken for the next request, so the
+        # connection is closed after these errors; read(-1) would also block
+        # until the client hung up
+        if length < 0:
+            self.close_connection = True
+            raise ApiError(400, "Content-Length must not be negative")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(413, f"request body is larger than {MAX_BODY_BYTES} bytes")
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            raise ApiError(400, "request body must be JSON")
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        try:
+            methods = ROUTES.get(url.path.rstrip("/") or "/")
+            if methods is None:
+                raise ApiError(404, f"no endpoint {url.path}")
+            if method not in methods:
+                raise ApiError(405, f"{url.path} accepts {', '.join(methods)}")
+            endpoint, tables = methods[method]
+
+            if method == "POST":
+                self._send(200, endpoint(self._body(), self.pool))
+                return
+
+            # The ETag and the response are read in one transaction, so the
+            # tag always describes exactly the data that was sent
+            with self.pool.connection() as conn:
+                with transaction(conn):
+                    tag = etag(conn, tables)
+                    if etag_matches(self.headers.get("If-None-Match", ""), tag):
+                        self._send(304, headers=[("ETag", tag)])
+                        return
+                    payload = endpoint(parse_qs(url.query), self.pool)
+            self._send(200, payload, headers=[("ETag", tag), ("Cache-Control", "no-cache")])
+        except ApiError as e:
+            self._send(e.status, {"error": str(e)})
+        except sqlite3.OperationalError as e:
+            self._send(503, {"error": f"database busy, try again: {e}"}, headers=[("Retry-After", "1")])
+        except Exception:
+            self._send(500, {"error": "internal error"})
+            raise
+
+def make_server(host, port, pool=None, quiet=False):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        apply_schema(conn)
+    handler = type("Handler", (Handler,), {"pool": pool, "quiet": quiet})
+    return ThreadingHTTPServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON API for food listings and claims (database: FOOD_WASTAGE_DB)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--quiet", action="store_true", help="don't log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, quiet=args.quiet)
+    print(f"Serving the food wastage API on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
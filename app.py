@@ -1,75 +1,143 @@
+import time
+
 import streamlit as st
-import pandas as pd
-import sqlite3
-import plotly.express as px
 
-# Run this once at the start of your app.py
+from app.db import DB_NAME, get_pool
+from app.schema import apply_schema
+from app import (bulk, cache, expiry, geo, insights, matching, metrics, pagination, replica, repository,
+                 rollups, search, summary, writes)
+from app import claims as claims_service
+
+# -------------------------------------------------------
+# Shared Connection Pool
+# -------------------------------------------------------
+@st.cache_resource
+def get_db_pool():
+    return get_pool(DB_NAME)
+
+pool = get_db_pool()
+
+# Schema checks and migrations run once per server process, not on every rerun
+@st.cache_resource
 def create_tables():
-    conn = sqlite3.connect("food_wastage.db")
-    cur = conn.cursor()
-
-    # Providers table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS Providers (
-        Provider_ID INTEGER PRIMARY KEY AUTOINCREMENT,
-        Name TEXT,
-        Type TEXT,
-        Address TEXT,
-        City TEXT,
-        Contact TEXT
-    )
-    """)
-
-    # Receivers table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS Receivers (
-        Receiver_ID INTEGER PRIMARY KEY AUTOINCREMENT,
-        Name TEXT,
-        Type TEXT,
-        City TEXT,
-        Contact TEXT
-    )
-    """)
-
-    conn.commit()
-    conn.close()
+    with metrics.section("Startup / schema"), pool.connection() as conn:
+        apply_schema(conn)
 
 create_tables()
 
-# -------------------------------------------------------
-# Database Utility Functions
-# -------------------------------------------------------
-@st.cache_data
-def load_data():
-    conn = sqlite3.connect("food_wastage.db")
-
-    providers = pd.read_sql_query("SELECT * FROM Providers;", conn)
-    receivers = pd.read_sql_query("SELECT * FROM Receivers;", conn)
-    food_listings = pd.read_sql_query("SELECT * FROM Food_Listings;", conn)
-    claims = pd.read_sql_query("SELECT * FROM Claims;", conn) 
-    
-    conn.close()
-    return providers, receivers, food_listings,claims
-
-def run_query(query, params=()):
-    conn = sqlite3.connect("food_wastage.db")
-    cur = conn.cursor()
-    cur.execute(query, params)
-    conn.commit()
-    conn.close()
+# One background expiry sweep per server process (see app/expiry.py)
+@st.cache_resource
+def start_expiry_sweeper():
+    return expiry.start_sweeper(pool)
+
+start_expiry_sweeper()
+
+# One writer thread per server process applies the Manage pages' single-row
+# writes in group commits (see app/writes.py)
+@st.cache_resource
+def get_write_queue():
+    return writes.get_write_queue(pool)
+
+write_queue = get_write_queue()
+
+# The dashboard pages read from a replica of the database that a background
+# thread copies and refreshes from the primary (see app/replica.py); the
+# Manage pages read and write the primary. Until the first copy is done,
+# which on a big database takes a while, the dashboards read the primary too.
+@st.cache_resource
+def get_replica():
+    if not replica.ENABLED:
+        return None
+    with metrics.section("Startup / replica"):
+        return replica.Replica(pool).start()
+
+read_replica = get_replica()
+read_pool = read_replica.pool if read_replica and read_replica.ready() else pool
 
 # -------------------------------------------------------
-# Load Data
+# Database Utility Functions
 # -------------------------------------------------------
-providers, receivers, food_listings,claims = load_data()
-
-# Handle missing City column gracefully
-if "City" not in providers.columns:
-    providers["City"] = "Unknown"
-if "City" not in receivers.columns:
-    receivers["City"] = "Unknown"
-if "City" not in food_listings.columns:
-    food_listings["City"] = "Unknown"
+# Pages read only what they show; cached reads are reloaded only after a
+# write to their table (see app/cache.py), so CRUD changes made through
+# app/repository.py show up on the next rerun of the Manage pages and after
+# the next replica refresh on the dashboard pages.
+#
+# Single-row writes are queued on the write queue; write() waits until the
+# write's group has committed and returns the write's result (or raises its
+# error).
+def write(func, *args, **kwargs):
+    return write_queue.submit(func, *args, **kwargs).result()
+
+# Keyset-paginated browser for the CRUD "View" tabs: only one page of rows is
+# read and sent to the browser. Previous-page cursors are kept in session state.
+def paginated_view(view):
+    columns = list(pagination.VIEWS[view]["columns"])
+    c1, c2, c3, c4, c5 = st.columns([2, 1, 2, 2, 1])
+    sort_col = c1.selectbox("Sort by", columns, key=f"{view}_sort")
+    descending = c2.checkbox("Descending", key=f"{view}_desc")
+    search_col = c3.selectbox("Search column", columns, index=1, key=f"{view}_search_col")
+    search = c4.text_input("Search", key=f"{view}_search").strip()
+    page_size = c5.selectbox("Rows", pagination.PAGE_SIZES, index=1, key=f"{view}_page_size")
+
+    # Any change to sort, search or page size starts again from the first page
+    signature = (sort_col, descending, search_col, search, page_size)
+    state = st.session_state.setdefault(f"{view}_pages", {"signature": None, "cursors": [None]})
+    if state["signature"] != signature:
+        state.update(signature=signature, cursors=[None])
+
+    with metrics.section(f"{view} / page query"):
+        df, next_cursor = pagination.fetch_page(view, sort_col, descending, search_col, search,
+                                                after=state["cursors"][-1], page_size=page_size, pool=pool)
+        total = pagination.count_rows(view, search_col, search, pool=pool)
+    page = len(state["cursors"])
+
+    st.dataframe(df, use_container_width=True)
+    p1, p2, p3 = st.columns([1, 2, 1])
+    if p1.button("⬅️ Previous", key=f"{view}_prev", disabled=page == 1):
+        state["cursors"].pop()
+        st.rerun()
+    p2.caption(f"Page {page} of {max(1, -(-total // page_size))} · {total} rows")
+    if p3.button("Next ➡️", key=f"{view}_next", disabled=next_cursor is None):
+        state["cursors"].append(next_cursor)
+        st.rerun()
+
+    # The file is only written when the button is clicked, streamed from SQLite
+    st.download_button(f"⬇️ Export {total} rows (CSV)", file_name=f"{view.lower()}.csv", mime="text/csv",
+                       data=lambda: bulk.export_file(view, sort_col, descending, search_col, search, pool=pool),
+                       key=f"{view}_export")
+
+# Bulk upload for the Manage pages: the whole file is validated at once, bad
+# rows are listed and skipped, the good ones inserted in batches (app/bulk.py).
+def bulk_import(table):
+    st.caption(f"Required columns: {', '.join(bulk.REQUIRED[table])}. "
+               f"Other {table} columns are optional; an ID column must hold new IDs.")
+    upload = st.file_uploader("CSV or Excel file", type=["csv", "xlsx"], key=f"{table}_upload")
+    if upload is None:
+        return
+    if st.session_state.get(f"{table}_imported") == upload.file_id:
+        st.success(f"✅ {upload.name} was imported.")
+        return
+
+    try:
+        df = bulk.read_upload(upload, upload.name)
+        good, errors = bulk.validate(table, df, pool=pool)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+
+    ignored = [c for c in df.columns if c not in good.columns]
+    if ignored:
+        st.info(f"ℹ️ Ignored columns: {', '.join(ignored)}")
+    st.write(f"{len(good)} of {len(df)} rows are valid.")
+    if not errors.empty:
+        st.error(f"⚠️ {errors['Row'].nunique()} rows have problems and will be skipped:")
+        st.dataframe(errors, use_container_width=True)
+
+    if len(good) and st.button(f"Import {len(good)} Rows", key=f"{table}_import"):
+        with metrics.section(f"{table} / bulk import"):
+            inserted = bulk.insert_rows(table, good, pool=pool)
+        st.session_state[f"{table}_imported"] = upload.file_id
+        st.success(f"✅ Imported {inserted} rows into {table}.")
 
 # -------------------------------------------------------
 # Streamlit Page Config
@@ -89,45 +157,68 @@ st.markdown("Gain insights into **providers, receivers, and food donation trends
 menu = st.sidebar.radio(
     "📍 Navigate",
     ["Overview", "Providers", "Receivers", "Food Insights", "Map View",
-     "Manage Providers", "Manage Receivers","Manage Claims","Manage Food Listings"]
+     "Manage Providers", "Manage Receivers","Manage Claims","Manage Food Listings", "Performance"]
 )
 
+# How current the dashboard pages' replica is
+if read_replica and not menu.startswith("Manage") and menu != "Performance":
+    if read_pool is pool:
+        st.sidebar.caption("🕒 Copying the database for the dashboards; showing live data until then")
+    else:
+        lag = read_replica.staleness()
+        st.sidebar.caption(f"🕒 Dashboard data as of {time.strftime('%H:%M:%S', time.localtime(read_replica.refreshed_at))} "
+                           f"({lag['age_s']:.0f}s ago, {lag['writes_behind']} changes behind)")
+        if lag["writes_behind"] and st.sidebar.button("🔄 Refresh data"):
+            read_replica.refresh()
+            st.rerun()
+
+# Whole-page wall time, recorded at the end of the script (see app/metrics.py)
+page_started = time.perf_counter()
+
 # -------------------------------------------------------
 # Overview Page
 # -------------------------------------------------------
 if menu == "Overview":
+    import plotly.express as px  # imported by the chart pages only, on first use
+
     st.subheader("📊 Project Overview")
     col1, col2, col3 = st.columns(3)
 
-    col1.metric("Total Providers", len(providers))
-    col2.metric("Total Receivers", len(receivers))
-    col3.metric("Food Listings", len(food_listings))
+    with metrics.section("Overview / summaries and chart"):
+        # Totals and per-city counts come from the trigger-maintained summaries
+        col1.metric("Total Providers", summary.total("providers_by_city", pool=read_pool)[0])
+        col2.metric("Total Receivers", summary.total("receivers_by_city", pool=read_pool)[0])
+        col3.metric("Food Listings", summary.total("listings_by_provider_type", pool=read_pool)[0])
 
-    st.markdown("---")
+        st.markdown("---")
 
-    prov_city = providers["City"].value_counts().reset_index()
-    prov_city.columns = ["City", "Providers"]
+        prov_city = summary.providers_by_city(pool=read_pool)
 
-    fig1 = px.bar(prov_city.head(15), x="City", y="Providers", color="Providers",
-                  title="Top 15 Cities with Most Providers")
-    st.plotly_chart(fig1, use_container_width=True)
+        fig1 = px.bar(prov_city.head(15), x="City", y="Providers", color="Providers",
+                      title="Top 15 Cities with Most Providers")
+        st.plotly_chart(fig1, use_container_width=True)
 
 
 # -------------------------------------------------------
 # Providers Page
 # -------------------------------------------------------
 elif menu == "Providers":
+    import plotly.express as px
+
     st.subheader("🏙️ Providers Analysis")
 
-    if providers.empty:
+    # City options come from the summary table; only the selected city's rows
+    # are read, found through the integer City_ID index
+    prov_city = summary.providers_by_city(pool=read_pool)
+    if prov_city.empty:
         st.warning("⚠️ No provider data available.")
     else:
-        selected_city = st.selectbox("Select a City", options=providers["City"].unique())
-        filtered = providers[providers["City"] == selected_city]
-        st.write(f"### Providers in {selected_city}", filtered)
-
-        prov_city = providers["City"].value_counts().reset_index()
-        prov_city.columns = ["City", "Providers"]
+        # Picked by position: the '' option (no city) has City_ID None
+        selected = st.selectbox("Select a City", options=prov_city.index,
+                                format_func=lambda i: prov_city.at[i, "City"] or "(no city)")
+        city_id = prov_city.at[selected, "City_ID"]
+        filtered = cache.load_rows("Providers", "City_ID", city_id, pool=read_pool).drop(columns="City_ID")
+        st.write(f"### Providers in {prov_city.at[selected, 'City'] or '(no city)'}", filtered)
 
         fig = px.bar(prov_city, x="City", y="Providers", color="Providers",
                      title="Providers by City")
@@ -137,17 +228,20 @@ elif menu == "Providers":
 # Receivers Page
 # -------------------------------------------------------
 elif menu == "Receivers":
+    import plotly.express as px
+
     st.subheader("👥 Receivers Analysis")
 
-    if receivers.empty:
+    recv_city = summary.receivers_by_city(pool=read_pool)
+    if recv_city.empty:
         st.warning("⚠️ No receiver data available.")
     else:
-        selected_city = st.selectbox("Select a City", options=receivers["City"].unique())
-        filtered = receivers[receivers["City"] == selected_city]
-        st.write(f"### Receivers in {selected_city}", filtered)
-
-        recv_city = receivers["City"].value_counts().reset_index()
-        recv_city.columns = ["City", "Receivers"]
+        # Picked by position: the '' option (no city) has City_ID None
+        selected = st.selectbox("Select a City", options=recv_city.index,
+                                format_func=lambda i: recv_city.at[i, "City"] or "(no city)")
+        city_id = recv_city.at[selected, "City_ID"]
+        filtered = cache.load_rows("Receivers", "City_ID", city_id, pool=read_pool).drop(columns="City_ID")
+        st.write(f"### Receivers in {recv_city.at[selected, 'City'] or '(no city)'}", filtered)
 
         fig = px.bar(recv_city, x="City", y="Receivers", color="Receivers",
                      title="Receivers by City")
@@ -158,205 +252,195 @@ elif menu == "Receivers":
 # Food Insights Page with Filters (Final)
 # -------------------------------------------------------
 elif menu == "Food Insights":
+    import plotly.express as px
+
     st.subheader("📊 Food Insights Dashboard")
 
     # basic empty guard
-    if food_listings.empty or providers.empty or receivers.empty or claims.empty:
+    if not all(insights.has_rows(t, pool=read_pool) for t in ["Food_Listings", "Providers", "Receivers", "Claims"]):
         st.warning("⚠️ One or more datasets are empty. Please add data first.")
     else:
         # -------------------- Filters --------------------
         st.subheader("🔎 Filter Options")
-
-        # 🔹 City filter
-        city_sources = []
-        if "City" in food_listings.columns:
-            city_sources.extend(food_listings["City"].dropna().unique().tolist())
-        if "City" in providers.columns:
-            city_sources.extend(providers["City"].dropna().unique().tolist())
-        if "City" in receivers.columns:
-            city_sources.extend(receivers["City"].dropna().unique().tolist())
-        city_options = sorted(set(city_sources)) if city_sources else []
-        city_filter = st.selectbox("🏙️ Select City", [""] + city_options)
-
-        # 🔹 Provider filter
-        prov_options = providers["Name"].dropna().unique().tolist() if "Name" in providers.columns else []
-        prov_filter = st.selectbox("🏢 Select Provider", [""] + prov_options)
-
-        # 🔹 Food type filter
-        food_options = food_listings["Food_Type"].dropna().unique().tolist() if "Food_Type" in food_listings.columns else []
-        food_filter = st.selectbox("🥗 Select Food Type", [""] + food_options)
-
-        # 🔹 Meal type filter
-        meal_options = food_listings["Meal_Type"].dropna().unique().tolist() if "Meal_Type" in food_listings.columns else []
-        meal_filter = st.selectbox("🍽️ Select Meal Type", [""] + meal_options)
-
-        # -------------------- Apply Filters --------------------
-        filtered_listings = food_listings.copy()
-
-        # City filter
-        if city_filter != "":
-            prov_in_city = providers[providers["City"] == city_filter]["Provider_ID"].tolist() if "City" in providers.columns else []
-            recv_in_city = receivers[receivers["City"] == city_filter]["Receiver_ID"].tolist() if "City" in receivers.columns else []
-
-            if "Provider_ID" in filtered_listings.columns:
-                filtered_listings = filtered_listings[
-                    filtered_listings["Provider_ID"].isin(prov_in_city) |
-                    (filtered_listings["Receiver_ID"].isin(recv_in_city) if "Receiver_ID" in filtered_listings.columns else False)
-                ]
-
-        # Provider filter
-        if prov_filter != "" and "Provider_ID" in filtered_listings.columns:
-            prov_id = providers.loc[providers["Name"] == prov_filter, "Provider_ID"].values
-            if len(prov_id) > 0:
-                filtered_listings = filtered_listings[filtered_listings["Provider_ID"] == prov_id[0]]
-
-        # Food type filter
-        if food_filter != "" and "Food_Type" in filtered_listings.columns:
-            filtered_listings = filtered_listings[filtered_listings["Food_Type"] == food_filter]
-
-        # Meal type filter
-        if meal_filter != "" and "Meal_Type" in filtered_listings.columns:
-            filtered_listings = filtered_listings[filtered_listings["Meal_Type"] == meal_filter]
-
-        # -------------------- KPIs --------------------
-        c1, c2, c3 = st.columns(3)
-
-        # Providers count
-        unique_providers = filtered_listings["Provider_ID"].nunique() if "Provider_ID" in filtered_listings.columns else providers.shape[0]
-        c1.metric("🏢 Providers", unique_providers)
-
-        # Receivers count
-        unique_receivers = filtered_listings["Receiver_ID"].nunique() if "Receiver_ID" in filtered_listings.columns else (receivers.shape[0] if not receivers.empty else 0)
-        c2.metric("🤝 Receivers", unique_receivers)
-
-        # Food Listings count
-        c3.metric("🍱 Food Listings", filtered_listings.shape[0])
-
-        # -------------------- Charts & Insights --------------------
-        city_col = "City" if "City" in filtered_listings.columns else None
-
-        # 1) Food Type Distribution
-        if "Food_Type" in filtered_listings.columns and not filtered_listings.empty:
-            ft = filtered_listings["Food_Type"].value_counts().reset_index()
-            ft.columns = ["Food_Type", "Count"]
-            st.subheader("🥗 Food Type Distribution")
-            st.plotly_chart(px.pie(ft, names="Food_Type", values="Count", hole=0.4), use_container_width=True)
-
-        # 2) Availability by City
-        if city_col and "Food_Type" in filtered_listings.columns:
-            city_food = filtered_listings.groupby([city_col, "Food_Type"]).size().reset_index(name="Count")
+        with metrics.section("Food Insights / filter options"):
+            options = insights.filter_options(pool=read_pool)
+
+        city_filter = st.selectbox("🏙️ Select City", [""] + options["city"])
+        prov_filter = st.selectbox("🏢 Select Provider", [""] + options["provider"])
+        food_filter = st.selectbox("🥗 Select Food Type", [""] + options["food_type"])
+        meal_filter = st.selectbox("🍽️ Select Meal Type", [""] + options["meal_type"])
+
+        filters = {"city": city_filter, "provider": prov_filter, "food_type": food_filter, "meal_type": meal_filter}
+
+        # All aggregates below come from one cached pass over the filtered listings
+        with metrics.section("Food Insights / compute"):
+            results = insights.compute(filters, pool=read_pool)
+
+        with metrics.section("Food Insights / KPIs and charts 1-6"):
+            # -------------------- KPIs --------------------
+            c1, c2, c3 = st.columns(3)
+            kpi = results["kpis"]
+            c1.metric("🏢 Providers", kpi["providers"])
+            c2.metric("🤝 Receivers", kpi["receivers"])
+            c3.metric("🍱 Food Listings", kpi["listings"])
+
+            # -------------------- Charts & Insights --------------------
+            # 1) Food Type Distribution
+            ft = results["food_type_counts"]
+            if not ft.empty:
+                st.subheader("🥗 Food Type Distribution")
+                st.plotly_chart(px.pie(ft, names="Food_Type", values="Count", hole=0.4), use_container_width=True)
+
+            # 2) Availability by City
+            city_food = results["food_type_by_city"]
             st.subheader("🏙️ Food Type Availability by City")
-            st.plotly_chart(px.bar(city_food, x=city_col, y="Count", color="Food_Type", barmode="group"), use_container_width=True)
+            st.plotly_chart(px.bar(city_food, x="City", y="Count", color="Food_Type", barmode="group"), use_container_width=True)
 
-        # 3) Top Providers by Listings
-        if "Provider_ID" in filtered_listings.columns and "Provider_ID" in providers.columns:
-            top_prov = filtered_listings.groupby("Provider_ID").size().reset_index(name="Total_Listings") \
-                        .merge(providers[["Provider_ID", "Name"]], on="Provider_ID", how="left")
+            # 3) Top Providers by Listings
+            top_prov = results["provider_listing_counts"].head(5)
             st.subheader("⭐ Top Providers by Listings")
-            st.dataframe(top_prov.sort_values("Total_Listings", ascending=False).head(5), use_container_width=True)
+            st.dataframe(top_prov, use_container_width=True)
 
-        # 4) Top Receivers by Claims
-        if "Receiver_ID" in claims.columns and "Receiver_ID" in receivers.columns:
-            filtered_claims = claims.merge(filtered_listings[["Food_ID"]], on="Food_ID", how="inner")
-            top_recv = filtered_claims.groupby("Receiver_ID").size().reset_index(name="Total_Claims") \
-                        .merge(receivers[["Receiver_ID", "Name"]], on="Receiver_ID", how="left")
+            # 4) Top Receivers by Claims
+            top_recv = results["receiver_claim_counts"].head(5)
             st.subheader("🙌 Top Receivers by Claims")
-            st.dataframe(top_recv.sort_values("Total_Claims", ascending=False).head(5), use_container_width=True)
-
-        # 5) Meal Type Popularity
-        if "Meal_Type" in filtered_listings.columns and not filtered_listings.empty:
-            meal = filtered_listings["Meal_Type"].value_counts().reset_index()
-            meal.columns = ["Meal_Type", "Count"]
-            st.subheader("🍽️ Meal Type Popularity")
-            st.bar_chart(meal.set_index("Meal_Type"))
-
-        # 6) Expired vs Valid Listings
-        if "Expiry_Date" in filtered_listings.columns:
-            tmp = filtered_listings.copy()
-            tmp["Expiry_Date"] = pd.to_datetime(tmp["Expiry_Date"], errors="coerce")
-            today = pd.Timestamp.today().normalize()
-            tmp["Expiry_Status"] = tmp["Expiry_Date"].apply(lambda d: "Expired" if pd.notna(d) and d < today else "Valid")
-            exp_status = tmp["Expiry_Status"].value_counts().reset_index()
-            exp_status.columns = ["Status", "Count"]
+            st.dataframe(top_recv, use_container_width=True)
+
+            # 5) Meal Type Popularity
+            meal = results["meal_type_counts"]
+            if not meal.empty:
+                st.subheader("🍽️ Meal Type Popularity")
+                st.bar_chart(meal.set_index("Meal_Type"))
+
+            # 6) Expired vs Valid Listings
+            exp_status = results["expiry_status"]
             st.subheader("⏳ Expired vs Valid Listings")
             st.plotly_chart(px.pie(exp_status, names="Status", values="Count", hole=0.35), use_container_width=True)
 
-        # 7) Donations Over Time
-        if "Listing_Date" in filtered_listings.columns:
-            don_time = filtered_listings.copy()
-            don_time["Listing_Date"] = pd.to_datetime(don_time["Listing_Date"], errors="coerce")
-            don_time = don_time.dropna(subset=["Listing_Date"]).groupby("Listing_Date").size().reset_index(name="Count")
-            st.subheader("📅 Donations Over Time")
-            st.plotly_chart(px.line(don_time, x="Listing_Date", y="Count"), use_container_width=True)
-
-        # 8) Claims Over Time
-        if "Claim_Date" in claims.columns:
-            clm_time = claims.copy()
-            clm_time["Claim_Date"] = pd.to_datetime(clm_time["Claim_Date"], errors="coerce")
-            clm_time = clm_time.dropna(subset=["Claim_Date"]).groupby("Claim_Date").size().reset_index(name="Count")
-            st.subheader("📅 Claims Over Time")
-            st.plotly_chart(px.line(clm_time, x="Claim_Date", y="Count"), use_container_width=True)
-
-        # 9) Most Wasted Food Types
-        if "Expiry_Date" in filtered_listings.columns and "Food_Type" in filtered_listings.columns:
-            tmp = filtered_listings.copy()
-            tmp["Expiry_Date"] = pd.to_datetime(tmp["Expiry_Date"], errors="coerce")
-            wasted = tmp[tmp["Expiry_Date"] < today].groupby("Food_Type").size().reset_index(name="Expired_Count")
+        # 7-8) Trends read the incrementally maintained time rollups (app/rollups.py);
+        # they split by listing location and food type, not provider or meal type
+        with metrics.section("Food Insights / trends"):
+            first, last = rollups.bucket_range(pool=read_pool)
+            if first is not None:
+                t1, t2 = st.columns([3, 1])
+                period = t1.date_input("📅 Trend period", (first, last))
+                grain = t2.selectbox("Granularity", ["auto", "hour", "day", "week"])
+                if len(period) == 2:
+                    start, end = period
+                    grain = rollups.effective_grain(start, end, None if grain == "auto" else grain)
+
+                    # 7) Donations Over Time
+                    don_time = rollups.series("listings", start, end, grain, city=city_filter,
+                                              food_type=food_filter, pool=read_pool)
+                    if not don_time.empty:
+                        st.subheader(f"📅 Donations Over Time (per {grain})")
+                        st.plotly_chart(px.line(don_time, x="Bucket", y="Count", hover_data=["Quantity"]),
+                                        use_container_width=True)
+
+                    # 8) Claims Over Time
+                    clm_time = rollups.series("claims", start, end, grain, city=city_filter,
+                                              food_type=food_filter, by="Status", pool=read_pool)
+                    if not clm_time.empty:
+                        st.subheader(f"📅 Claims Over Time (per {grain})")
+                        st.plotly_chart(px.line(clm_time, x="Bucket", y="Count", color="Status"),
+                                        use_container_width=True)
+
+        with metrics.section("Food Insights / charts 9-15"):
+            # 9) Most Wasted Food Types
+            wasted = results["wasted_food_types"]
             if not wasted.empty:
                 st.subheader("🚮 Most Wasted Food Types")
                 st.bar_chart(wasted.set_index("Food_Type"))
 
-        # 10) Claims by City
-        if "Receiver_ID" in claims.columns and "City" in receivers.columns:
-            claims_city = claims.merge(receivers[["Receiver_ID", "City"]], on="Receiver_ID", how="left") \
-                                .groupby("City").size().reset_index(name="Claims")
-            if city_filter != "":
-                claims_city = claims_city[claims_city["City"] == city_filter]
+            # 10) Claims by City
+            claims_city = results["claims_by_city"]
             st.subheader("🌍 Claims by City")
             st.bar_chart(claims_city.set_index("City"))
 
-        # 11) Providers Contribution %
-        if "Provider_ID" in filtered_listings.columns and "Provider_ID" in providers.columns:
-            prov_share = filtered_listings.groupby("Provider_ID").size().reset_index(name="Total_Listings") \
-                          .merge(providers[["Provider_ID", "Name"]], on="Provider_ID", how="left")
-            prov_share["Share %"] = (prov_share["Total_Listings"] / prov_share["Total_Listings"].sum()) * 100 if prov_share["Total_Listings"].sum() > 0 else 0
+            # 11) Providers Contribution %
+            prov_share = results["provider_shares"]
             st.subheader("📊 Providers Contribution %")
-            st.dataframe(prov_share.sort_values("Share %", ascending=False)[["Name", "Total_Listings", "Share %"]], use_container_width=True)
-
-        # 12) Receivers Contribution %
-        if "Receiver_ID" in claims.columns and "Receiver_ID" in receivers.columns:
-            recv_share = claims.merge(filtered_listings[["Food_ID"]], on="Food_ID", how="inner") \
-                               .groupby("Receiver_ID").size().reset_index(name="Total_Claims") \
-                               .merge(receivers[["Receiver_ID", "Name"]], on="Receiver_ID", how="left")
-            recv_share["Share %"] = (recv_share["Total_Claims"] / recv_share["Total_Claims"].sum()) * 100 if recv_share["Total_Claims"].sum() > 0 else 0
+            st.dataframe(prov_share[["Name", "Total_Listings", "Share %"]], use_container_width=True)
+
+            # 12) Receivers Contribution %
+            recv_share = results["receiver_shares"]
             st.subheader("📊 Receivers Contribution %")
-            st.dataframe(recv_share.sort_values("Share %", ascending=False)[["Name", "Total_Claims", "Share %"]], use_container_width=True)
+            st.dataframe(recv_share[["Name", "Total_Claims", "Share %"]], use_container_width=True)
 
-        # 13) Listings by Provider Type
-        if "Provider_Type" in filtered_listings.columns:
-            prov_type = filtered_listings.groupby("Provider_Type").size().reset_index(name="Donations")
+            # 13) Listings by Provider Type
+            prov_type = results["provider_type_counts"]
             st.subheader("🏭 Listings by Provider Type")
             st.bar_chart(prov_type.set_index("Provider_Type"))
 
-        # 14) Quantity by City
-        if city_col and "Quantity" in filtered_listings.columns:
-            qty_city = filtered_listings.groupby(city_col)["Quantity"].sum().reset_index()
+            # 14) Quantity by City
+            qty_city = results["quantity_by_city"]
             st.subheader("📦 Total Quantity by City")
-            st.plotly_chart(px.bar(qty_city, x=city_col, y="Quantity"), use_container_width=True)
+            st.plotly_chart(px.bar(qty_city, x="City", y="Quantity"), use_container_width=True)
 
-        # 15) Quantity by Food Type
-        if "Food_Type" in filtered_listings.columns and "Quantity" in filtered_listings.columns:
-            qty_ft = filtered_listings.groupby("Food_Type")["Quantity"].sum().reset_index()
+            # 15) Quantity by Food Type
+            qty_ft = results["quantity_by_food_type"]
             st.subheader("📦 Total Quantity by Food Type")
             st.plotly_chart(px.bar(qty_ft, x="Food_Type", y="Quantity"), use_container_width=True)
 
+# -------------------------------------------------------
+# Map View
+# -------------------------------------------------------
+# Places are geocoded into Geo_Locations when they are written and clustered
+# per zoom level in SQL (see app/geo.py), so the map gets one marker per grid
+# cell and layer; drawing the page only reads.
+elif menu == "Map View":
+    st.subheader("🗺️ Map View")
+
+    layer_colors = {"Providers": "#1f77b4cc", "Receivers": "#2ca02ccc",
+                    "All listings": "#ff7f0ecc", "Open listings": "#d62728cc"}
+
+    c1, c2, c3 = st.columns([3, 1, 2])
+    layers = c1.multiselect("Layers", list(geo.LAYERS), default=["Providers", "Receivers", "Open listings"])
+    zoom = c2.slider("Zoom", geo.MIN_ZOOM, geo.MAX_ZOOM, 4)
+    focus = c3.text_input("Centre on city / location").strip()
+
+    bounds = None
+    if focus:
+        place = geo.location_of(focus, pool=read_pool)
+        if place is None:
+            st.warning(f"No geocoded place named '{focus}'.")
+        else:
+            # Half a tile in each direction around the place
+            half = 360 / 2 ** zoom / 2
+            bounds = (place["Lat"] - half, place["Lat"] + half, place["Lon"] - half, place["Lon"] + half)
+
+    with metrics.section("Map View / clusters"):
+        points = geo.clusters(layers, zoom, bounds, pool=read_pool)
+    if points.empty:
+        st.info("No places with a known position in the selected layers.")
+    else:
+        # Marker radius in metres, scaled by the square root of the cluster size
+        cell_m = geo.cell_degrees(zoom) * 111_000
+        points = points.assign(
+            Color=points["Layer"].map(layer_colors),
+            Size=(cell_m / 2) * (points["Count"] / points["Count"].max()) ** 0.5,
+        )
+        st.map(points, latitude="Lat", longitude="Lon", color="Color", size="Size",
+               zoom=zoom if bounds else None)
+        st.caption(" · ".join(f"{layer}: {layer_colors[layer][:7]}" for layer in layers))
+
+        st.write(f"{len(points)} markers")
+        st.dataframe(points.drop(columns=["Color", "Size"]), use_container_width=True)
+
+    # Places the offline gazetteer doesn't know have no position and are left off
+    missing = geo.unlocated(layers, pool=read_pool)
+    missing = missing[missing["Places"] > 0]
+    if not missing.empty:
+        st.caption("⚠️ Not on the map (place not in the offline gazetteer): " + " · ".join(
+            f"{row.Layer}: {row.Count:,} in {row.Places:,} places" for row in missing.itertuples()))
+
 # -------------------------------------------------------
 # Manage Providers (CRUD)
 # -------------------------------------------------------
 elif menu == "Manage Providers":
     st.subheader("📝 Manage Providers (CRUD Operations)")
 
-    choice = st.radio("Choose Operation", ["Add", "View", "Update", "Delete"])
+    choice = st.radio("Choose Operation", ["Add", "Bulk Import", "View", "Update", "Delete"])
 
     if choice == "Add":
         with st.form("add_provider"):
@@ -368,17 +452,15 @@ elif menu == "Manage Providers":
             submit = st.form_submit_button("Add Provider")
 
             if submit:
-                run_query(
-                    "INSERT INTO Providers (Name, Type, Address, City, Contact) VALUES (?, ?, ?, ?, ?)", 
-                    (name, ptype, address, city, contact)
-                )
+                write(repository.insert, repository.Provider(
+                    Name=name, Type=ptype, Address=address, City=city, Contact=contact))
                 st.success("✅ Provider Added Successfully!")
 
+    elif choice == "Bulk Import":
+        bulk_import("Providers")
+
     elif choice == "View":
-        conn = sqlite3.connect("food_wastage.db")
-        df = pd.read_sql_query("SELECT * FROM Providers;", conn)
-        st.dataframe(df, use_container_width=True)
-        conn.close()
+        paginated_view("Providers")
 
     elif choice == "Update":
         provider_id = st.number_input("Enter Provider ID to Update", min_value=1)
@@ -390,16 +472,16 @@ elif menu == "Manage Providers":
             new_contact = st.text_input("New Contact")
             submit_update = st.form_submit_button("Update")
             if submit_update:
-                run_query(
-                    "UPDATE Providers SET Name=?, Type=?, Address=?, City=?, Contact=? WHERE Provider_ID=?", 
-                    (new_name, new_type, new_address, new_city, new_contact, provider_id)
-                )
-                st.success(f"✅ Provider {provider_id} Updated Successfully!")
+                provider = repository.Provider(provider_id, new_name, new_type, new_address, new_city, new_contact)
+                if write(repository.update, provider):
+                    st.success(f"✅ Provider {provider_id} Updated Successfully!")
+                else:
+                    st.error("❌ Provider ID not found!")
 
     elif choice == "Delete":
         provider_id = st.number_input("Enter Provider ID to Delete", min_value=1)
         if st.button("Delete Provider"):
-            run_query("DELETE FROM Providers WHERE Provider_ID=?", (provider_id,))
+            write(repository.delete, repository.Provider, provider_id)
             st.success(f"❌ Provider {provider_id} Deleted Successfully!")
 
 
@@ -409,7 +491,7 @@ elif menu == "Manage Providers":
 elif menu == "Manage Receivers":
     st.subheader("📝 Manage Receivers (CRUD Operations)")
 
-    choice = st.radio("Choose Operation", ["Add", "View", "Update", "Delete"])
+    choice = st.radio("Choose Operation", ["Add", "Bulk Import", "View", "Update", "Delete"])
 
     if choice == "Add":
         with st.form("add_receiver"):
@@ -420,17 +502,14 @@ elif menu == "Manage Receivers":
             submit = st.form_submit_button("Add Receiver")
 
             if submit:
-                run_query(
-                    "INSERT INTO Receivers (Name, Type, City, Contact) VALUES (?, ?, ?, ?)", 
-                    (name, rtype, city, contact)
-                )
+                write(repository.insert, repository.Receiver(Name=name, Type=rtype, City=city, Contact=contact))
                 st.success("✅ Receiver Added Successfully!")
 
+    elif choice == "Bulk Import":
+        bulk_import("Receivers")
+
     elif choice == "View":
-        conn = sqlite3.connect("food_wastage.db")
-        df = pd.read_sql_query("SELECT * FROM Receivers;", conn)
-        st.dataframe(df, use_container_width=True)
-        conn.close()
+        paginated_view("Receivers")
 
     elif choice == "Update":
         receiver_id = st.number_input("Enter Receiver ID to Update", min_value=1)
@@ -441,16 +520,16 @@ elif menu == "Manage Receivers":
             new_contact = st.text_input("New Contact")
             submit_update = st.form_submit_button("Update")
             if submit_update:
-                run_query(
-                    "UPDATE Receivers SET Name=?, Type=?, City=?, Contact=? WHERE Receiver_ID=?", 
-                    (new_name, new_type, new_city, new_contact, receiver_id)
-                )
-                st.success(f"✅ Receiver {receiver_id} Updated Successfully!")
+                receiver = repository.Receiver(receiver_id, new_name, new_type, new_city, new_contact)
+                if write(repository.update, receiver):
+                    st.success(f"✅ Receiver {receiver_id} Updated Successfully!")
+                else:
+                    st.error("❌ Receiver ID not found!")
 
     elif choice == "Delete":
         receiver_id = st.number_input("Enter Receiver ID to Delete", min_value=1)
         if st.button("Delete Receiver"):
-            run_query("DELETE FROM Receivers WHERE Receiver_ID=?", (receiver_id,))
+            write(repository.delete, repository.Receiver, receiver_id)
             st.success(f"❌ Receiver {receiver_id} Deleted Successfully!")
 
 # -------------------------------------------------------
@@ -459,62 +538,40 @@ elif menu == "Manage Receivers":
 elif menu == "Manage Claims":
     st.subheader("📝 Manage Claims (CRUD Operations)")
 
-    choice = st.radio("Choose Operation", ["Add", "View", "Update", "Delete"])
+    choice = st.radio("Choose Operation", ["Add", "Bulk Import", "View", "Update", "Bulk Approve", "Suggested Matches", "Delete"])
 
     # ---------------- Add Claim ----------------
     if choice == "Add":
-        conn = sqlite3.connect("food_wastage.db")
-        
-        # Fetch Receivers
-        receivers = pd.read_sql_query("SELECT Receiver_ID, Name, City FROM Receivers", conn)
-        receiver_options = {
-            f"{row['Name']} ({row['City']})": row['Receiver_ID'] for _, row in receivers.iterrows()
-        }
-
-        # Fetch Food
-        food_items = pd.read_sql_query("SELECT Food_ID, Food_Type, Quantity FROM Food_Listings", conn)
-        food_options = {
-            f"{row['Food_Type']} (Available: {row['Quantity']})": row['Food_ID'] for _, row in food_items.iterrows()
-        }
-
-        conn.close()
+        # Typeahead: each picker only holds the top matches for what was typed
+        s1, s2 = st.columns(2)
+        food_term = s1.text_input("🔎 Search food (name, type or location)")
+        receiver_term = s2.text_input("🔎 Search receivers (name or city)")
+
+        food_options = dict(search.search_food(food_term, pool=pool))
+        receiver_options = dict(search.search_receivers(receiver_term, pool=pool))
+        if not food_options:
+            st.info("ℹ️ No unexpired listings with stock match this search.")
 
         with st.form("add_claim"):
-            food_choice = st.selectbox("Select Food", list(food_options.keys()))
-            receiver_choice = st.selectbox("Select Receiver", list(receiver_options.keys()))
+            food_choice = st.selectbox("Select Food", list(food_options), format_func=food_options.get)
+            receiver_choice = st.selectbox("Select Receiver", list(receiver_options), format_func=receiver_options.get)
             status = st.selectbox("Status", ["Pending", "Approved", "Rejected"])
             submit = st.form_submit_button("Add Claim")
 
-            if submit:
-                run_query(
-                    "INSERT INTO Claims (Food_ID, Receiver_ID, Status, Timestamp) VALUES (?, ?, ?, datetime('now'))", 
-                    (
-                        food_options[food_choice], 
-                        receiver_options[receiver_choice],  
-                        status
-                    )
-                )
-                st.success("✅ Claim Added Successfully!")
+            if submit and food_choice is not None and receiver_choice is not None:
+                # An Approved claim takes its unit of stock, as approving it later would
+                if write(claims_service.add_claim, food_choice, receiver_choice, status) == claims_service.OUT_OF_STOCK:
+                    st.error("⚠️ Not enough stock to approve this claim!")
+                else:
+                    st.success("✅ Claim Added Successfully!")
+
+    # ---------------- Bulk Import Claims ----------------
+    elif choice == "Bulk Import":
+        bulk_import("Claims")
 
     # ---------------- View Claims ----------------
     elif choice == "View":
-        conn = sqlite3.connect("food_wastage.db")
-        query = """
-            SELECT 
-                c.Claim_ID,
-                r.Name AS Receiver_Name,
-                r.City AS Receiver_City,
-                f.Food_Type,
-                f.Quantity AS Available_Quantity,
-                c.Status,
-                c.Timestamp
-            FROM Claims c
-            JOIN Receivers r ON c.Receiver_ID = r.Receiver_ID
-            JOIN Food_Listings f ON c.Food_ID = f.Food_ID;
-        """
-        df = pd.read_sql_query(query, conn)
-        st.dataframe(df, use_container_width=True)
-        conn.close()
+        paginated_view("Claims")
 
     # ---------------- Update Claim ----------------
     elif choice == "Update":
@@ -524,37 +581,73 @@ elif menu == "Manage Claims":
             submit_update = st.form_submit_button("Update Claim")
 
             if submit_update:
-                # Fetch food linked to claim
-                conn = sqlite3.connect("food_wastage.db")
-                claim = pd.read_sql_query("SELECT * FROM Claims WHERE Claim_ID=?", conn, params=(claim_id,))
-                
-                if not claim.empty:
-                    food_id = claim.at[0, "Food_ID"]
-                    current_status = claim.at[0, "Status"]
-
-                    if current_status != "Approved" and new_status == "Approved":
-                        # Reduce food stock
-                        food = pd.read_sql_query("SELECT Quantity FROM Food_Listings WHERE Food_ID=?", conn, params=(food_id,))
-                        if not food.empty:
-                            available_qty = food.at[0, "Quantity"]
-                            if available_qty > 0:
-                                run_query("UPDATE Food_Listings SET Quantity = Quantity - 1 WHERE Food_ID=?", (food_id,))
-                            else:
-                                st.error("⚠️ Not enough stock to approve this claim!")
-                                conn.close()
-                                st.stop()
-
-                    run_query("UPDATE Claims SET Status=? WHERE Claim_ID=?", (new_status, claim_id))
+                # Stock check, stock decrement and status change in one transaction
+                result = write(claims_service.update_claim_status, claim_id, new_status)
+
+                if result == claims_service.UPDATED:
                     st.success(f"✅ Claim {claim_id} Updated Successfully!")
+                elif result == claims_service.OUT_OF_STOCK:
+                    st.error("⚠️ Not enough stock to approve this claim!")
                 else:
                     st.error("❌ Claim ID not found!")
-                conn.close()
+
+    # ---------------- Bulk Approve Claims ----------------
+    elif choice == "Bulk Approve":
+        ids_text = st.text_area("Claim IDs to approve (comma or newline separated)")
+        if st.button("Approve Claims"):
+            tokens = ids_text.replace(",", " ").split()
+            claim_ids = [int(x) for x in tokens if x.isdecimal()]
+            rejected = [x for x in tokens if not x.isdecimal()]
+            if rejected:
+                st.error(f"❌ Not Claim IDs, skipped: {', '.join(rejected)}")
+            if not claim_ids:
+                st.warning("⚠️ Enter at least one Claim ID.")
+            else:
+                results = claims_service.approve_claims(claim_ids, pool=pool)
+                approved = [cid for cid, r in results if r == claims_service.UPDATED]
+                no_stock = [cid for cid, r in results if r == claims_service.OUT_OF_STOCK]
+                missing = [cid for cid, r in results if r == claims_service.NOT_FOUND]
+                st.success(f"✅ Approved {len(approved)} of {len(results)} claims.")
+                if no_stock:
+                    st.error(f"⚠️ Not enough stock for claims: {', '.join(map(str, no_stock))}")
+                if missing:
+                    st.error(f"❌ Claim IDs not found: {', '.join(map(str, missing))}")
+
+    # ---------------- Suggested Matches ----------------
+    # The matching engine proposes a receiver for every open listing (own city
+    # first, then the nearest cities with known positions, most urgent expiry
+    # first); the batch is created and approved at once.
+    elif choice == "Suggested Matches":
+        c1, c2 = st.columns(2)
+        limit = c1.number_input("Max suggestions", min_value=1, value=100)
+        per_receiver = c2.number_input("Max listings per receiver", min_value=1,
+                                       value=matching.MAX_PER_RECEIVER)
+
+        if st.button("Find Matches"):
+            with metrics.section("Manage Claims / suggest matches"):
+                st.session_state["suggested_claims"] = matching.suggest_claims(
+                    limit=int(limit), max_per_receiver=int(per_receiver), pool=pool)
+
+        suggestions = st.session_state.get("suggested_claims")
+        if suggestions is not None:
+            if suggestions.empty:
+                st.info("ℹ️ No open listings (stock left, not expired) to match.")
+            else:
+                st.dataframe(suggestions, use_container_width=True)
+                st.caption("Places missing from the offline gazetteer are only matched within their own city "
+                           "and have no distance.")
+                if st.button(f"Create & Approve {len(suggestions)} Claims"):
+                    with metrics.section("Manage Claims / accept matches"):
+                        results = matching.accept_suggestions(suggestions, pool=pool)
+                    approved = sum(r == claims_service.UPDATED for _, r in results)
+                    st.success(f"✅ Created {len(results)} claims, approved {approved}.")
+                    del st.session_state["suggested_claims"]
 
     # ---------------- Delete Claim ----------------
     elif choice == "Delete":
         claim_id = st.number_input("Enter Claim ID to Delete", min_value=1)
         if st.button("Delete Claim"):
-            run_query("DELETE FROM Claims WHERE Claim_ID=?", (claim_id,))
+            write(repository.delete, repository.Claim, claim_id)
             st.success(f"❌ Claim {claim_id} Deleted Successfully!")
 
 
@@ -564,7 +657,7 @@ elif menu == "Manage Claims":
 elif menu == "Manage Food Listings":
     st.subheader("📝 Manage Food Listings (CRUD Operations)")
 
-    choice = st.radio("Choose Operation", ["Add", "View", "Update", "Delete"])
+    choice = st.radio("Choose Operation", ["Add", "Bulk Import", "View", "Update", "Expiring Soon", "Delete"])
 
     if choice == "Add":
         with st.form("add_food"):
@@ -579,15 +672,16 @@ elif menu == "Manage Food Listings":
             submit = st.form_submit_button("Add Food")
 
             if submit:
-                run_query("INSERT INTO Food_Listings (Food_Name, Quantity, Expiry_Date, Provider_ID, Provider_Type, Location, Food_Type, Meal_Type) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                          (food_name, quantity, str(expiry_date), provider_id, provider_type, location, food_type, meal_type))
+                write(repository.insert, repository.FoodListing(
+                    Food_Name=food_name, Quantity=quantity, Expiry_Date=str(expiry_date), Provider_ID=provider_id,
+                    Provider_Type=provider_type, Location=location, Food_Type=food_type, Meal_Type=meal_type))
                 st.success("✅ Food Listing Added Successfully!")
 
+    elif choice == "Bulk Import":
+        bulk_import("Food_Listings")
+
     elif choice == "View":
-        conn = sqlite3.connect("food_wastage.db")
-        df = pd.read_sql_query("SELECT * FROM Food_Listings;", conn)
-        st.dataframe(df, use_container_width=True)
-        conn.close()
+        paginated_view("Food_Listings")
 
     elif choice == "Update":
         food_id = st.number_input("Enter Food ID to Update", min_value=1)
@@ -596,12 +690,60 @@ elif menu == "Manage Food Listings":
             new_expiry = st.date_input("New Expiry Date")
             submit_update = st.form_submit_button("Update")
             if submit_update:
-                run_query("UPDATE Food_Listings SET Quantity=?, Expiry_Date=? WHERE Food_ID=?",
-                          (new_quantity, str(new_expiry), food_id))
-                st.success(f"✅ Food Listing {food_id} Updated Successfully!")
+                listing = repository.FoodListing(Food_ID=food_id, Quantity=new_quantity, Expiry_Date=str(new_expiry))
+                if write(repository.update, listing, columns=["Quantity", "Expiry_Date"]):
+                    st.success(f"✅ Food Listing {food_id} Updated Successfully!")
+                else:
+                    st.error("❌ Food ID not found!")
+
+    elif choice == "Expiring Soon":
+        hours = st.slider("Expiring within the next (hours)", 1, 168, 48)
+        soon = expiry.expiring_within(hours, pool=pool)
+        if soon.empty:
+            st.info(f"ℹ️ No listings with stock expire in the next {hours} hours.")
+        else:
+            st.dataframe(soon, use_container_width=True)
+
+        # The sweeper also runs in the background every few minutes
+        if st.button("Run Expiry Sweep Now"):
+            result = expiry.sweep(pool=pool)
+            st.success(f"✅ Marked {result['expired']} listings expired, cancelled {result['cancelled']} pending claims.")
 
     elif choice == "Delete":
         food_id = st.number_input("Enter Food ID to Delete", min_value=1)
         if st.button("Delete Food"):
-            run_query("DELETE FROM Food_Listings WHERE Food_ID=?", (food_id,))
+            write(repository.delete, repository.FoodListing, food_id)
             st.success(f"❌ Food Listing {food_id} Deleted Successfully!")
+
+# -------------------------------------------------------
+# Performance (admin)
+# -------------------------------------------------------
+# Timings of the SQL statements, page sections and whole pages of this server
+# process, from the ring buffer in app/metrics.py.
+elif menu == "Performance":
+    st.subheader("⏱️ Performance")
+
+    if not metrics.ENABLED:
+        st.info("ℹ️ Instrumentation is off (FOOD_WASTAGE_METRICS=0).")
+    else:
+        kind = st.radio("Show", ["page", "section", "sql"], horizontal=True,
+                        format_func={"page": "Pages", "section": "Sections", "sql": "SQL statements"}.get)
+        stats = metrics.summary(kind)
+        st.caption(f"p50 / p95 / p99 over the last {metrics.MAX_SAMPLES} samples, slowest p95 first")
+        st.dataframe(stats, use_container_width=True)
+
+        st.subheader("🐢 Slowest Samples")
+        st.dataframe(metrics.slowest(), use_container_width=True)
+
+        st.subheader("📤 Export")
+        fmt = st.radio("Format", ["Prometheus", "JSON"], horizontal=True)
+        if fmt == "Prometheus":
+            st.download_button("Download metrics.txt", metrics.to_prometheus(), "metrics.txt", "text/plain")
+        else:
+            st.download_button("Download metrics.json", metrics.to_json(), "metrics.json", "application/json")
+
+        if st.button("Clear Samples"):
+            metrics.clear()
+            st.rerun()
+
+metrics.record_since("page", menu, page_started)
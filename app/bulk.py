@@ -0,0 +1,195 @@
+import csv
+import io
+import json
+import tempfile
+
+import pandas as pd
+
+from app import claims, geo, repository
+from app.db import get_pool, transaction
+from app.importer import DATE_COLUMNS, PRIMARY_KEYS, insert_sql, normalize_date_column, to_rows
+from app.pagination import export_query
+
+BATCH_ROWS = 1_000            # rows per insert transaction
+EXPORT_BATCH_ROWS = 5_000     # rows fetched from SQLite per export chunk
+SPOOL_BYTES = 8 * 1024 * 1024 # export files bigger than this go to a temp file on disk
+
+# -------------------------------
+# Upload Rules
+# -------------------------------
+# Columns an uploaded file must have; the table's other columns are optional.
+REQUIRED = {
+    "Providers": ["Name", "City"],
+    "Receivers": ["Name", "City"],
+    "Food_Listings": ["Food_Name", "Quantity", "Expiry_Date", "Provider_ID", "Location"],
+    "Claims": ["Food_ID", "Receiver_ID", "Status"],
+}
+
+# Columns that must point at an existing row of another table
+REFERENCES = {
+    "Food_Listings": {"Provider_ID": ("Providers", "Provider_ID")},
+    "Claims": {"Food_ID": ("Food_Listings", "Food_ID"), "Receiver_ID": ("Receivers", "Receiver_ID")},
+}
+
+POSITIVE = {"Food_Listings": ["Quantity"]}
+
+# Columns that only take one of a fixed set of values
+CHOICES = {"Claims": {"Status": claims.STATUSES}}
+
+# Kept up by the app (expiry sweeper, rollup and city triggers), never taken from a file
+MANAGED = {
+    "Providers": ["City_ID"],
+    "Receivers": ["City_ID"],
+    "Food_Listings": ["Expired", "Listed_At", "City_ID"],
+}
+
+# Filled with the time of the upload (UTC, like every other stamp) when blank or absent
+STAMPED = {"Claims": ["Timestamp"]}
+
+# -------------------------------
+# Reading Uploads
+# -------------------------------
+# Every cell is read as text so validation sees exactly what was uploaded;
+# blank cells become missing values.
+def read_upload(data, file_name):
+    if file_name.lower().endswith((".xlsx", ".xls")):
+        try:
+            df = pd.read_excel(data, dtype=str)
+        except ImportError as e:
+            raise ValueError("Reading Excel files needs openpyxl (pip install openpyxl).") from e
+    else:
+        df = pd.read_csv(data, dtype=str, keep_default_na=False)
+    df.columns = [str(c).strip() for c in df.columns]
+    return df.apply(lambda col: col.str.strip()).replace("", pd.NA)
+
+# -------------------------------
+# Validation
+# -------------------------------
+# Types come from the table's schema (INTEGER columns must hold whole
+# numbers). Returns (columns the table accepts, integer columns).
+def table_schema(conn, table):
+    info = conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+    columns = [row[1] for row in info if row[1] not in MANAGED.get(table, [])]
+    integers = [row[1] for row in info if row[2].upper() == "INTEGER"]
+    return columns, integers
+
+def existing_ids(conn, table, key, values):
+    ids = sorted({int(v) for v in values})
+    rows = conn.execute(
+        f'SELECT t."{key}" FROM json_each(?) j JOIN "{table}" t ON t."{key}" = j.value', (json.dumps(ids),))
+    return {row[0] for row in rows}
+
+# Checks a whole upload column by column and returns (good rows ready to
+# insert, one row per problem). Row numbers are the line numbers in the file
+# (the header is line 1). A row with any problem is left out entirely.
+def validate(table, df, pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        columns, integers = table_schema(conn, table)
+        problems = []
+
+        def flag(mask, column, message):
+            mask = mask.fillna(False).astype(bool)
+            for idx in mask[mask].index:
+                problems.append((idx, column, df.at[idx, column] if column in df.columns else None, message))
+
+        missing = [c for c in REQUIRED[table] if c not in df.columns]
+        if missing:
+            raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+        clean = df[[c for c in df.columns if c in columns]].copy()
+
+        for column in REQUIRED[table]:
+            flag(clean[column].isna(), column, "required")
+
+        for column in [c for c in integers if c in clean.columns]:
+            numbers = pd.to_numeric(clean[column], errors="coerce")
+            bad = clean[column].notna() & (numbers.isna() | (numbers % 1 != 0))
+            flag(bad, column, "not a whole number")
+            clean[column] = numbers.where(~bad).astype("Int64")
+
+        for column in POSITIVE.get(table, []):
+            flag(clean[column].notna() & (clean[column] <= 0), column, "must be greater than 0")
+
+        for column, allowed in CHOICES.get(table, {}).items():
+            if column in clean.columns:
+                flag(clean[column].notna() & ~clean[column].isin(allowed), column,
+                     f"must be one of {', '.join(allowed)}")
+
+        # Dates are normalized as the CSV importer does; a value it couldn't
+        # parse comes back unchanged, so isn't in the ISO format afterwards
+        for column, (source_format, iso_format) in DATE_COLUMNS.get(table, {}).items():
+            if column in clean.columns:
+                clean[column] = normalize_date_column(clean[column], source_format, iso_format)
+                parsed = pd.to_datetime(clean[column], format=iso_format, errors="coerce")
+                flag(clean[column].notna() & parsed.isna(), column, "not a date")
+
+        now = repository.utc_now()
+        for column in STAMPED.get(table, []):
+            clean[column] = clean[column].fillna(now) if column in clean.columns else now
+
+        key = PRIMARY_KEYS[table]
+        if key in clean.columns:
+            ids = clean[key]
+            flag(ids.notna() & ids.duplicated(keep=False), key, "duplicate ID in the file")
+            taken = existing_ids(conn, table, key, ids.dropna())
+            flag(ids.isin(taken), key, "ID already exists")
+
+        for column, (ref_table, ref_key) in REFERENCES.get(table, {}).items():
+            values = clean[column]
+            known = existing_ids(conn, ref_table, ref_key, values.dropna())
+            flag(values.notna() & ~values.isin(known), column, f"no such {ref_key}")
+
+    errors = pd.DataFrame(problems, columns=["Row", "Column", "Value", "Error"]).sort_values(["Row", "Column"])
+    good = clean.drop(index=errors["Row"].unique())
+    errors["Row"] += 2
+    return good, errors.reset_index(drop=True)
+
+# -------------------------------
+# Batched Insert
+# -------------------------------
+# Inserts the validated rows BATCH_ROWS at a time, each batch in its own
+# write transaction, so other writers get the lock between batches. Returns
+# the number of rows inserted.
+def insert_rows(table, good, batch_rows=BATCH_ROWS, pool=None):
+    pool = pool or get_pool()
+    sql = insert_sql(table, good.columns)
+    with pool.connection() as conn:
+        for start in range(0, len(good), batch_rows):
+            with transaction(conn, immediate=True):
+                conn.executemany(sql, to_rows(good.iloc[start:start + batch_rows]))
+        geo.refresh(pool=pool)
+    return len(good)
+
+# -------------------------------
+# Streaming Export
+# -------------------------------
+# Yields the (searched, sorted) view as CSV text, EXPORT_BATCH_ROWS rows at a
+# time straight from the cursor, so no DataFrame or whole-file string is built.
+def iter_csv(view, sort_col=None, descending=False, search_col=None, search=None, pool=None):
+    pool = pool or get_pool()
+    sql, params = export_query(view, sort_col, descending, search_col, search)
+    with pool.connection() as conn:
+        cursor = conn.execute(sql, params)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(col[0] for col in cursor.description)
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+            if not rows:
+                break
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        cursor.close()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+# The export as a rewound binary file for st.download_button: held in memory
+# up to SPOOL_BYTES, on disk beyond that.
+def export_file(view, sort_col=None, descending=False, search_col=None, search=None, pool=None):
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    for text in iter_csv(view, sort_col, descending, search_col, search, pool=pool):
+        out.write(text.encode("utf-8"))
+    out.seek(0)
+    return out
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from app.db import fetch_all, get_pool, read_sql
+
+DEFAULT_TTL = 600          # seconds an entry may be served without a re-check of its age
+DEFAULT_MAX_ENTRIES = 64   # per cached function, e.g. one per filter combination
+
+# -------------------------------
+# Table Versions
+# -------------------------------
+# Table_Versions is kept current by the triggers in sql/schema.sql, so every
+# writer (the app, the helper modules, the import scripts) bumps it.
+def table_versions(pool=None):
+    return dict(fetch_all("SELECT Table_Name, Version FROM Table_Versions", pool=pool))
+
+# -------------------------------
+# Versioned Cache
+# -------------------------------
+# An entry is served only while the versions of the tables it was built from
+# are unchanged and it is younger than the TTL. The least recently used entry
+# is evicted once the cache holds max_entries values.
+class VersionedCache:
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, versions):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_versions, created, value = entry
+                if entry_versions == versions and time.monotonic() - created < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, versions, value):
+        with self._lock:
+            self._entries[key] = (versions, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+# `tables` lists the tables a function reads from, or is a callable that
+# returns them for the given arguments (e.g. load_table(table) -> [table]).
+# The `pool` keyword is passed through; the cache key holds its database's
+# path, so two databases with equal version counters never share entries.
+def versioned_cache(tables, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+    def decorator(func):
+        cache = VersionedCache(ttl=ttl, max_entries=max_entries)
+
+        @wraps(func)
+        def wrapper(*args, pool=None, **kwargs):
+            deps = tables(*args, **kwargs) if callable(tables) else tables
+            current = table_versions(pool=pool)
+            versions = tuple(current.get(t) for t in deps)
+            key = (os.path.abspath((pool or get_pool()).db_name), _freeze(args), _freeze(kwargs))
+
+            hit, value = cache.get(key, versions)
+            if hit:
+                return value
+            value = func(*args, pool=pool, **kwargs)
+            cache.put(key, versions, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+# -------------------------------
+# Cached Loaders
+# -------------------------------
+# Whole tables come from the memory-mapped snapshots (app/snapshot.py), so
+# the cached frames of every worker process share one copy of the data.
+@versioned_cache(tables=lambda table: [table], max_entries=8)
+def load_table(table, pool=None):
+    from app import snapshot  # snapshot.py is built on this module
+    return snapshot.frame(table, pool=pool)
+
+# The rows of one table where `column` equals `value`, e.g. the providers of
+# one city, for pages that show a slice rather than the whole table. `IS`
+# rather than `=`, so value=None finds the rows where the column is NULL.
+@versioned_cache(tables=lambda table, column, value: [table], max_entries=32)
+def load_rows(table, column, value, pool=None):
+    return read_sql(f'SELECT * FROM "{table}" WHERE "{column}" IS ?;', (value,), pool=pool)
+
+def load_data(pool=None):
+    return tuple(load_table(t, pool=pool) for t in ["Providers", "Receivers", "Food_Listings", "Claims"])
@@ -0,0 +1,88 @@
+from app.db import fetch_all
+
+# -------------------------------
+# City Dimension
+# -------------------------------
+# Every distinct city name used by Providers.City, Receivers.City and
+# Food_Listings.Location gets one Cities row. Names are trimmed and compared
+# case-insensitively (COLLATE NOCASE), so "Austin", "austin " and "AUSTIN"
+# are one city, spelled the way it was first seen. Each of the three tables
+# carries the integer City_ID of its name, kept current by triggers, so city
+# filters and per-city groupings work on an indexed integer instead of text.
+#
+# table: (primary key, city name column)
+CITY_COLUMNS = {
+    "Providers": ("Provider_ID", "City"),
+    "Receivers": ("Receiver_ID", "City"),
+    "Food_Listings": ("Food_ID", "Location"),
+}
+
+CITIES_DDL = """
+CREATE TABLE IF NOT EXISTS Cities (
+    City_ID INTEGER PRIMARY KEY,
+    Name TEXT NOT NULL UNIQUE COLLATE NOCASE
+)
+"""
+
+# Blank names have no city
+def clean_name(expr):
+    return f"NULLIF(trim({expr}), '')"
+
+def _assign(table, key, column, row="NEW"):
+    name = clean_name(f"{row}.{column}")
+    # INSERT OR IGNORE skips both known names and NULL
+    return (f"INSERT OR IGNORE INTO Cities (Name) VALUES ({name}); "
+            f"UPDATE {table} SET City_ID = (SELECT c.City_ID FROM Cities c WHERE c.Name = {name}) "
+            f"WHERE {key} = {row}.{key};")
+
+def trigger_statements():
+    statements = []
+    for table, (key, column) in CITY_COLUMNS.items():
+        name = table.lower()
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_cities_{name}_insert AFTER INSERT ON {table}\n"
+            f"WHEN {clean_name(f'NEW.{column}')} IS NOT NULL\n"
+            f"BEGIN {_assign(table, key, column)} END")
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_cities_{name}_update AFTER UPDATE OF {column} ON {table}\n"
+            f"WHEN NEW.{column} IS NOT OLD.{column}\n"
+            f"BEGIN {_assign(table, key, column)} END")
+    return statements
+
+def index_statements():
+    return [f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_city_id ON {table}(City_ID)" for table in CITY_COLUMNS]
+
+# -------------------------------
+# Install / Backfill
+# -------------------------------
+# Adds City_ID to databases created before it existed, then interns the names
+# of rows that have none yet. The backfill finds those rows through the
+# City_ID index, so on an up-to-date database it reads nothing.
+def backfill(conn):
+    for table, (key, column) in CITY_COLUMNS.items():
+        missing = f"City_ID IS NULL AND {clean_name(column)} IS NOT NULL"
+        conn.execute(f"INSERT OR IGNORE INTO Cities (Name) SELECT {clean_name(column)} FROM {table} WHERE {missing}")
+        conn.execute(f"UPDATE {table} SET City_ID = (SELECT c.City_ID FROM Cities c "
+                     f"WHERE c.Name = {clean_name(f'{table}.{column}')}) WHERE {missing}")
+
+def install(conn):
+    conn.execute(CITIES_DDL)
+    for table in CITY_COLUMNS:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        if "City_ID" not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN City_ID INTEGER REFERENCES Cities(City_ID)")
+    for statement in index_statements() + trigger_statements():
+        conn.execute(statement)
+    backfill(conn)
+
+# -------------------------------
+# Lookups
+# -------------------------------
+def city_id(name, pool=None):
+    if name is None:
+        return None
+    rows = fetch_all("SELECT City_ID FROM Cities WHERE Name = NULLIF(trim(?), '')", (name,), pool=pool)
+    return rows[0][0] if rows else None
+
+def city_ids(pool=None):
+    return dict(fetch_all("SELECT Name, City_ID FROM Cities", pool=pool))
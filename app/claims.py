@@ -0,0 +1,113 @@
+from app import repository
+from app.db import get_pool, transaction
+from app.search import OPEN_LISTING
+
+APPROVED = "Approved"
+STATUSES = ("Pending", "Approved", "Rejected", "Completed", "Cancelled")
+
+# Results of a status change
+UPDATED = "updated"
+NOT_FOUND = "not_found"
+OUT_OF_STOCK = "out_of_stock"
+
+# Results of a claim request that could not be made
+LISTING_CLOSED = "listing_closed"
+RECEIVER_NOT_FOUND = "receiver_not_found"
+
+# -------------------------------
+# Claim Approval
+# -------------------------------
+# Approving a claim takes one unit of stock from its food listing. The stock
+# check, the decrement and the status change run in one BEGIN IMMEDIATE
+# transaction, and the decrement only succeeds while Quantity > 0, so two
+# operators approving claims on the same listing can never oversell it.
+def _take_stock(conn, food_id):
+    cur = conn.execute(
+        "UPDATE Food_Listings SET Quantity = Quantity - 1 WHERE Food_ID=? AND Quantity > 0", (food_id,))
+    return cur.rowcount > 0
+
+def _set_status(conn, claim_id, new_status):
+    row = conn.execute("SELECT Food_ID, Status FROM Claims WHERE Claim_ID=?", (claim_id,)).fetchone()
+    if row is None:
+        return NOT_FOUND
+
+    food_id, current_status = row
+    if current_status != APPROVED and new_status == APPROVED and not _take_stock(conn, food_id):
+        return OUT_OF_STOCK
+
+    conn.execute("UPDATE Claims SET Status=? WHERE Claim_ID=?", (new_status, claim_id))
+    return UPDATED
+
+# Adds one claim and returns its Claim_ID. A claim added as Approved takes
+# its unit of stock in the same transaction, like any approval; when the
+# listing has none left nothing is added and OUT_OF_STOCK is returned.
+def add_claim(food_id, receiver_id, status="Pending", pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            if status == APPROVED and not _take_stock(conn, int(food_id)):
+                return OUT_OF_STOCK
+            return repository.insert(
+                repository.Claim(Food_ID=int(food_id), Receiver_ID=int(receiver_id), Status=status), pool=pool)
+
+def update_claim_status(claim_id, new_status, pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            return _set_status(conn, int(claim_id), new_status)
+
+# Sets many claims' statuses in a single transaction from [(claim_id, status)]
+# and returns [(claim_id, result)], one per update in the same order (a
+# claim listed twice gets two results). Claims are processed in the given
+# order, so earlier claims get the stock first when a listing runs out
+# part-way through the batch.
+def update_claim_statuses(updates, pool=None):
+    pool = pool or get_pool()
+    results = []
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            for claim_id, new_status in updates:
+                results.append((int(claim_id), _set_status(conn, int(claim_id), new_status)))
+    return results
+
+# Approves many claims in one transaction, in the given order
+def approve_claims(claim_ids, pool=None):
+    return update_claim_statuses([(claim_id, APPROVED) for claim_id in claim_ids], pool=pool)
+
+# Inserts new claims for [(food_id, receiver_id)] pairs in one transaction and
+# returns their Claim_IDs in the same order.
+def create_claims(pairs, status="Pending", pool=None):
+    pool = pool or get_pool()
+    rows = [(int(food_id), int(receiver_id), status) for food_id, receiver_id in pairs]
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            last_id = conn.execute("SELECT IFNULL(MAX(Claim_ID), 0) FROM Claims").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO Claims (Food_ID, Receiver_ID, Status, Timestamp) VALUES (?, ?, ?, datetime('now'))", rows)
+            return [row[0] for row in conn.execute(
+                "SELECT Claim_ID FROM Claims WHERE Claim_ID > ? ORDER BY Claim_ID", (last_id,))]
+
+# Claims requested from outside (the JSON API in api.py): a pair is only
+# claimed while its listing is open (see app/search.py) and its receiver
+# exists. Checks and inserts run in one transaction; returns one result per
+# (food_id, receiver_id) pair, in order: the new Claim_ID, or NOT_FOUND,
+# LISTING_CLOSED or RECEIVER_NOT_FOUND.
+def request_claims(pairs, pool=None):
+    pool = pool or get_pool()
+    results = []
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            for food_id, receiver_id in pairs:
+                listing = conn.execute(f"SELECT {OPEN_LISTING} FROM Food_Listings f WHERE f.Food_ID = ?",
+                                       (int(food_id),)).fetchone()
+                if listing is None:
+                    results.append(NOT_FOUND)
+                elif not listing[0]:
+                    results.append(LISTING_CLOSED)
+                elif conn.execute("SELECT 1 FROM Receivers WHERE Receiver_ID = ?", (int(receiver_id),)).fetchone() is None:
+                    results.append(RECEIVER_NOT_FOUND)
+                else:
+                    results.append(repository.insert(
+                        repository.Claim(Food_ID=int(food_id), Receiver_ID=int(receiver_id), Status="Pending"),
+                        pool=pool))
+    return results
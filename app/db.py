@@ -0,0 +1,148 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from app import metrics
+
+DB_NAME = os.environ.get("FOOD_WASTAGE_DB", "food_wastage.db")
+
+BUSY_TIMEOUT_MS = 5000
+CACHED_STATEMENTS = 256
+POOL_SIZE = 8
+
+# -------------------------------
+# Connection Pool
+# -------------------------------
+# Every connection is opened once with WAL, busy_timeout, foreign keys
+# enforced, a large statement cache and per-statement timing
+# (app/metrics.py), then handed back to the pool instead of being closed.
+# A thread that asks for a connection while it already holds one gets the
+# same connection back, so nested helpers share one transaction. A read-only pool (the replica in app/replica.py) refuses
+# writes with PRAGMA query_only.
+class ConnectionPool:
+    def __init__(self, db_name=DB_NAME, size=POOL_SIZE, read_only=False):
+        self.db_name = db_name
+        self.size = size
+        self.read_only = read_only
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+            factory=metrics.connection_factory(),
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        if self.read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_name=DB_NAME):
+    with _pools_lock:
+        pool = _pools.get(db_name)
+        if pool is None:
+            pool = _pools[db_name] = ConnectionPool(db_name)
+        return pool
+
+# -------------------------------
+# Transactions
+# -------------------------------
+# Joins the caller's transaction if one is already open on this
+# connection, otherwise opens (and commits or rolls back) its own.
+@contextmanager
+def transaction(conn, immediate=False):
+    if conn.in_transaction:
+        yield conn
+        return
+
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+# -------------------------------
+# Query Helpers
+# -------------------------------
+def execute(query, params=(), pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn):
+            return conn.execute(query, params)
+
+def executemany(query, seq_of_params, pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn):
+            return conn.executemany(query, seq_of_params)
+
+def fetch_all(query, params=(), pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        return conn.execute(query, params).fetchall()
+
+def read_sql(query, params=(), pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+# -------------------------------
+# Trigger Upgrades
+# -------------------------------
+# CREATE TRIGGER IF NOT EXISTS keeps a trigger from an older version, so
+# modules that generate triggers compare the stored definitions of theirs
+# (names starting with `prefix`) with the current statements. True when they
+# differ and the old ones need to be dropped and the data they keep rebuilt.
+def triggers_changed(conn, prefix, statements):
+    stored = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='trigger' AND name LIKE ? ORDER BY name", (prefix + "%",))]
+    current = sorted(s.replace(" IF NOT EXISTS", "", 1) for s in statements)
+    return bool(stored) and sorted(stored) != current
@@ -1,77 +1,46 @@
-import sqlite3
+from app import repository
+from app.repository import FoodListing, Provider, Receiver
 
-DB_NAME = "food_wastage.db"
+# Thin wrappers kept for existing callers; app/repository.py does the work.
 
 # -------------------------------
 # Providers CRUD
 # -------------------------------
 def add_provider(name, city, contact):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("INSERT INTO Providers (Name, City, Contact) VALUES (?, ?, ?)", (name, city, contact))
-    conn.commit()
-    conn.close()
+    return repository.insert(Provider(Name=name, City=city, Contact=contact))
 
 def update_provider(provider_id, name, city, contact):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("UPDATE Providers SET Name=?, City=?, Contact=? WHERE Provider_ID=?", (name, city, contact, provider_id))
-    conn.commit()
-    conn.close()
+    return repository.update(Provider(Provider_ID=provider_id, Name=name, City=city, Contact=contact),
+                             columns=["Name", "City", "Contact"])
 
 def delete_provider(provider_id):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("DELETE FROM Providers WHERE Provider_ID=?", (provider_id,))
-    conn.commit()
-    conn.close()
+    return repository.delete(Provider, provider_id)
 
 # -------------------------------
 # Receivers CRUD
 # -------------------------------
 def add_receiver(name, city, contact):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("INSERT INTO Receivers (Name, City, Contact) VALUES (?, ?, ?)", (name, city, contact))
-    conn.commit()
-    conn.close()
+    return repository.insert(Receiver(Name=name, City=city, Contact=contact))
 
 def update_receiver(receiver_id, name, city, contact):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("UPDATE Receivers SET Name=?, City=?, Contact=? WHERE Receiver_ID=?", (name, city, contact, receiver_id))
-    conn.commit()
-    conn.close()
+    return repository.update(Receiver(Receiver_ID=receiver_id, Name=name, City=city, Contact=contact),
+                             columns=["Name", "City", "Contact"])
 
 def delete_receiver(receiver_id):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("DELETE FROM Receivers WHERE Receiver_ID=?", (receiver_id,))
-    conn.commit()
-    conn.close()
+    return repository.delete(Receiver, receiver_id)
 
 # -------------------------------
 # Food Listings CRUD
 # -------------------------------
+# Listings have no City column; the city a listing is in is its Location.
 def add_food(item, food_type, city, expiry_date, provider_id):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("INSERT INTO Food_Listings (Food_Name, Food_Type, City, Expiry_Date, Provider_ID) VALUES (?, ?, ?, ?, ?)", 
-              (item, food_type, city, expiry_date, provider_id))
-    conn.commit()
-    conn.close()
+    return repository.insert(FoodListing(Food_Name=item, Food_Type=food_type, Location=city,
+                                         Expiry_Date=expiry_date, Provider_ID=provider_id))
 
 def update_food(food_id, item, food_type, city, expiry_date):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("UPDATE Food_Listings SET Food_Name=?, Food_Type=?, City=?, Expiry_Date=? WHERE Food_ID=?", 
-              (item, food_type, city, expiry_date, food_id))
-    conn.commit()
-    conn.close()
+    return repository.update(FoodListing(Food_ID=food_id, Food_Name=item, Food_Type=food_type, Location=city,
+                                         Expiry_Date=expiry_date),
+                             columns=["Food_Name", "Food_Type", "Location", "Expiry_Date"])
 
 def delete_food(food_id):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("DELETE FROM Food_Listings WHERE Food_ID=?", (food_id,))
-    conn.commit()
-    conn.close()
+    return repository.delete(FoodListing, food_id)
@@ -1,45 +1,22 @@
-import sqlite3
-
-DB_NAME = "food_wastage.db"
+from app import repository
+from app.repository import FoodListing, Provider, Receiver
 
 # -----------------------------
 # Add Provider
 # -----------------------------
 def add_provider(name, contact, city):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Providers (Provider_Name, Contact, City)
-        VALUES (?, ?, ?)
-    """, (name, contact, city))
-    conn.commit()
-    conn.close()
+    return repository.insert(Provider(Name=name, Contact=contact, City=city))
 
 # -----------------------------
 # Add Receiver
 # -----------------------------
 def add_receiver(name, contact, city):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Receivers (Receiver_Name, Contact, City)
-        VALUES (?, ?, ?)
-    """, (name, contact, city))
-    conn.commit()
-    conn.close()
+    return repository.insert(Receiver(Name=name, Contact=contact, City=city))
 
 # -----------------------------
 # Add Food
 # -----------------------------
-import sqlite3
-
 def add_food(food_name, food_type, quantity, expiry_date, provider_id, provider_type, location, meal_type):
-    conn = sqlite3.connect("food_wastage.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Food_Listings
-        (Food_Name, Food_Type, Quantity, Expiry_Date, Provider_ID, Provider_Type, Location, Meal_Type)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (food_name, food_type, quantity, expiry_date, provider_id, provider_type, location, meal_type))
-    conn.commit()
-    conn.close()
+    return repository.insert(FoodListing(
+        Food_Name=food_name, Food_Type=food_type, Quantity=quantity, Expiry_Date=expiry_date,
+        Provider_ID=provider_id, Provider_Type=provider_type, Location=location, Meal_Type=meal_type))
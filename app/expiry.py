@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import threading
+
+from app.db import get_pool, read_sql, transaction, triggers_changed
+
+SWEEP_INTERVAL = int(os.environ.get("FOOD_WASTAGE_SWEEP_INTERVAL", "900"))  # seconds, 0 disables
+
+CANCELLED = "Cancelled"
+
+ISO_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*"
+
+# -------------------------------
+# ISO Expiry Dates
+# -------------------------------
+# Expiry_Date is stored as YYYY-MM-DD so it sorts and range-scans as text.
+# Older rows and feeds use M/D/YYYY; those are rewritten once on install and
+# by triggers on every later insert or update.
+# The year is read from after the second slash rather than from the end, so
+# a date that carries a time ("12/31/2030 00:00") converts too.
+def iso_date(expr):
+    day_and_year = f"substr({expr}, instr({expr}, '/') + 1)"
+    year = f"substr({day_and_year}, instr({day_and_year}, '/') + 1, 4)"
+    return (
+        f"CASE WHEN {expr} GLOB '{ISO_DATE_GLOB}' THEN substr({expr}, 1, 10) "
+        f"WHEN {expr} LIKE '%/%/%' THEN printf('%04d-%02d-%02d', CAST({year} AS INTEGER), "
+        f"CAST({expr} AS INTEGER), CAST({day_and_year} AS INTEGER)) "
+        f"ELSE {expr} END"
+    )
+
+NOT_ISO = f"Expiry_Date NOT GLOB '{ISO_DATE_GLOB}'"
+
+EXPIRY_INDEX = "CREATE INDEX IF NOT EXISTS idx_food_listings_expiry ON Food_Listings(Expired, Expiry_Date)"
+
+# A new expiry date also clears the Expired flag; the next sweep sets it
+# again if the new date is already past.
+def trigger_statements():
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_expiry_food_listings_insert AFTER INSERT ON Food_Listings\n"
+        f"WHEN NEW.{NOT_ISO}\n"
+        f"BEGIN UPDATE Food_Listings SET Expiry_Date = {iso_date('NEW.Expiry_Date')} WHERE Food_ID = NEW.Food_ID; END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_expiry_food_listings_update AFTER UPDATE OF Expiry_Date ON Food_Listings\n"
+        f"WHEN NEW.Expiry_Date IS NOT OLD.Expiry_Date\n"
+        f"BEGIN UPDATE Food_Listings SET Expiry_Date = {iso_date('NEW.Expiry_Date')}, Expired = 0 "
+        f"WHERE Food_ID = NEW.Food_ID; END",
+    ]
+
+def install(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(Food_Listings)")]
+    if "Expired" not in columns:
+        conn.execute("ALTER TABLE Food_Listings ADD COLUMN Expired INTEGER NOT NULL DEFAULT 0")
+
+    created = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='trg_expiry_food_listings_insert'").fetchone() is None
+    if triggers_changed(conn, "trg_expiry_", trigger_statements()):
+        for name in ("trg_expiry_food_listings_insert", "trg_expiry_food_listings_update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.execute(EXPIRY_INDEX)
+    for statement in trigger_statements():
+        conn.execute(statement)
+    if created:
+        conn.execute(f"UPDATE Food_Listings SET Expiry_Date = {iso_date('Expiry_Date')} WHERE {NOT_ISO}")
+
+# -------------------------------
+# Sweeper
+# -------------------------------
+# Marks every listing whose expiry date has passed as Expired and cancels the
+# pending claims on those listings, in one transaction. Both steps only touch
+# the newly expired listings, found by a range scan of idx_food_listings_expiry.
+def sweep(pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            food_ids = conn.execute(
+                "SELECT Food_ID FROM Food_Listings WHERE Expired = 0 AND Expiry_Date < date('now')"
+            ).fetchall()
+            conn.executemany("UPDATE Food_Listings SET Expired = 1 WHERE Food_ID = ?", food_ids)
+            cur = conn.executemany(
+                "UPDATE Claims SET Status = ? WHERE Food_ID = ? AND Status = 'Pending'",
+                [(CANCELLED, food_id) for food_id, in food_ids])
+            return {"expired": len(food_ids), "cancelled": max(cur.rowcount, 0)}
+
+# Runs sweep() every `interval` seconds on a daemon thread until the returned
+# event is set. A sweep that finds the database locked is retried next time.
+def start_sweeper(pool=None, interval=SWEEP_INTERVAL):
+    stop = threading.Event()
+
+    def loop():
+        while not stop.is_set():
+            try:
+                sweep(pool)
+            except sqlite3.OperationalError:
+                pass
+            stop.wait(interval)
+
+    if interval > 0:
+        threading.Thread(target=loop, name="expiry-sweeper", daemon=True).start()
+    return stop
+
+# -------------------------------
+# Reads
+# -------------------------------
+# A listing is good through its expiry date (days end at midnight UTC, the
+# clock of every stored time), so it expires within the next `hours` when
+# its date is today or later but before the date `hours` from now. Reads one
+# range of idx_food_listings_expiry.
+def expiring_within(hours, limit=100, pool=None):
+    return read_sql("""
+        SELECT f.Food_ID, f.Food_Name, f.Food_Type, f.Location, f.Quantity, f.Expiry_Date
+        FROM Food_Listings f
+        WHERE f.Expired = 0
+          AND f.Expiry_Date >= date('now')
+          AND f.Expiry_Date < date('now', ?)
+          AND f.Quantity > 0
+        ORDER BY f.Expiry_Date, f.Food_ID
+        LIMIT ?
+    """, (f"+{int(hours)} hours", int(limit)), pool=pool)
@@ -0,0 +1,166 @@
+import os
+
+import pandas as pd
+
+from app import writes
+from app.cache import table_versions, versioned_cache
+from app.db import get_pool, read_sql, transaction
+from app.search import OPEN_LISTING
+
+GAZETTEER_PATH = os.environ.get(
+    "FOOD_WASTAGE_GAZETTEER",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "gazetteer.csv"))
+
+GAZETTEER = "gazetteer"
+# Source of the made-up positions older versions stored for names missing
+# from the gazetteer; install() deletes them
+APPROXIMATE = "approximate"
+
+# Where the names to geocode come from
+NAME_COLUMNS = [("Providers", "City"), ("Receivers", "City"), ("Food_Listings", "Location")]
+NAME_TABLES = [table for table, _ in NAME_COLUMNS]
+
+# One cluster cell is about this many pixels wide at the chosen zoom
+CLUSTER_PX = 48
+MIN_ZOOM, MAX_ZOOM = 2, 12
+
+# -------------------------------
+# Geocoding
+# -------------------------------
+_gazetteer = None
+
+def load_gazetteer(path=GAZETTEER_PATH):
+    global _gazetteer
+    if _gazetteer is None:
+        if os.path.exists(path):
+            df = pd.read_csv(path)
+            _gazetteer = dict(zip(df["Name"].str.strip().str.casefold(), zip(df["Lat"], df["Lon"])))
+        else:
+            _gazetteer = {}
+    return _gazetteer
+
+# (lat, lon, source) for a name in the gazetteer, None for any other name:
+# a place is never given a position it doesn't really have
+def geocode(name):
+    match = load_gazetteer().get(name.strip().casefold())
+    if match is None:
+        return None
+    return float(match[0]), float(match[1]), GAZETTEER
+
+# Only names without a Geo_Locations row are looked up. Names the gazetteer
+# doesn't know get no row, so they are looked up again next time (in case
+# the gazetteer has grown) and stay off the map meanwhile.
+def missing_names(conn):
+    selects = " UNION ".join(
+        f"SELECT {column} AS Name FROM {table} WHERE {column} IS NOT NULL AND {column} != '' "
+        f"AND NOT EXISTS (SELECT 1 FROM Geo_Locations g WHERE g.Name = {table}.{column})"
+        for table, column in NAME_COLUMNS)
+    return [row[0] for row in conn.execute(selects)]
+
+def geocode_missing(conn):
+    located = ((name, geocode(name)) for name in missing_names(conn))
+    rows = [(name, *position) for name, position in located if position is not None]
+    if rows:
+        conn.executemany(
+            "INSERT OR IGNORE INTO Geo_Locations (Name, Lat, Lon, Source) VALUES (?, ?, ?, ?)", rows)
+    return len(rows)
+
+def install(conn):
+    conn.execute("DELETE FROM Geo_Locations WHERE Source = ?", (APPROXIMATE,))
+    geocode_missing(conn)
+
+# New names are geocoded when they are written, never when a page is drawn:
+# after imports (app/importer.py), bulk uploads (app/bulk.py) and every
+# write-queue commit (app/writes.py) that changed a table with place names.
+def refresh(pool=None):
+    with (pool or get_pool()).connection() as conn:
+        with transaction(conn, immediate=True):
+            return geocode_missing(conn)
+
+# The write-queue hook: claims-only commits don't look names up again
+_looked_up = {}
+
+def refresh_after_write(pool):
+    versions = {t: v for t, v in table_versions(pool=pool).items() if t in NAME_TABLES}
+    key = os.path.abspath(pool.db_name)
+    if _looked_up.get(key) != versions:
+        refresh(pool=pool)
+        _looked_up[key] = versions
+
+writes.after_commit(refresh_after_write)
+
+# -------------------------------
+# Clustering
+# -------------------------------
+# Width of a cluster cell in degrees: a 256px map tile spans 360 / 2**zoom
+# degrees of longitude.
+def cell_degrees(zoom):
+    return 360 / 2 ** int(zoom) * CLUSTER_PX / 256
+
+# Per-place counts: providers and receivers come from the trigger-maintained
+# Summary_Counts rows (per City_ID, placed at the city's name as first seen),
+# so only open listings are counted from the base table.
+LAYERS = {
+    "Providers": """
+        SELECT c.Name, s.Row_Count AS N FROM Summary_Counts s JOIN Cities c ON c.City_ID = s.Grp
+        WHERE s.Metric = 'providers_by_city' AND s.Row_Count > 0""",
+    "Receivers": """
+        SELECT c.Name, s.Row_Count AS N FROM Summary_Counts s JOIN Cities c ON c.City_ID = s.Grp
+        WHERE s.Metric = 'receivers_by_city' AND s.Row_Count > 0""",
+    "All listings": """
+        SELECT c.Name, s.Row_Count AS N FROM Summary_Counts s JOIN Cities c ON c.City_ID = s.Grp
+        WHERE s.Metric = 'listings_by_location' AND s.Row_Count > 0""",
+    "Open listings": f"""
+        SELECT f.Location AS Name, COUNT(*) AS N FROM Food_Listings f
+        WHERE {OPEN_LISTING} GROUP BY f.Location""",
+}
+
+# Snaps every place to a grid cell for the zoom level and merges each cell
+# into one marker per layer, placed at the count-weighted centre of its
+# places. bounds=(lat_min, lat_max, lon_min, lon_max) limits the query to a
+# viewport through the Lat/Lon index.
+def cluster_query(layers, zoom, bounds=None):
+    cell = cell_degrees(zoom)
+    points = " UNION ALL ".join(
+        f"SELECT '{layer}' AS Layer, p.Name, p.N, g.Lat, g.Lon "
+        f"FROM ({LAYERS[layer]}) p JOIN Geo_Locations g ON g.Name = p.Name"
+        + (" WHERE g.Lat BETWEEN ? AND ? AND g.Lon BETWEEN ? AND ?" if bounds else "")
+        for layer in layers)
+    sql = f"""
+        SELECT Layer,
+               SUM(N) AS Count,
+               COUNT(*) AS Places,
+               SUM(Lat * N) / SUM(N) AS Lat,
+               SUM(Lon * N) / SUM(N) AS Lon,
+               CASE WHEN COUNT(*) = 1 THEN MIN(Name) ELSE MIN(Name) || ' +' || (COUNT(*) - 1) END AS Label
+        FROM ({points})
+        GROUP BY Layer, CAST((Lat + 90) / {cell!r} AS INTEGER), CAST((Lon + 180) / {cell!r} AS INTEGER)
+        ORDER BY Count DESC
+    """
+    params = tuple(bounds) * len(layers) if bounds else ()
+    return sql, params
+
+@versioned_cache(tables=["Providers", "Receivers", "Food_Listings", "Geo_Locations"], max_entries=32)
+def clusters(layers, zoom, bounds=None, pool=None):
+    layers = [layer for layer in layers if layer in LAYERS]
+    if not layers:
+        return pd.DataFrame(columns=["Layer", "Count", "Places", "Lat", "Lon", "Label"])
+    sql, params = cluster_query(layers, zoom, bounds)
+    return read_sql(sql, params, pool=pool)
+
+# Per layer, the places without a known position and how much they hold:
+# what clusters() leaves off the map
+@versioned_cache(tables=["Providers", "Receivers", "Food_Listings", "Geo_Locations"], max_entries=32)
+def unlocated(layers, pool=None):
+    layers = [layer for layer in layers if layer in LAYERS]
+    if not layers:
+        return pd.DataFrame(columns=["Layer", "Places", "Count"])
+    sql = " UNION ALL ".join(
+        f"SELECT '{layer}' AS Layer, COUNT(*) AS Places, IFNULL(SUM(p.N), 0) AS Count FROM ({LAYERS[layer]}) p "
+        f"WHERE NOT EXISTS (SELECT 1 FROM Geo_Locations g WHERE g.Name = p.Name)"
+        for layer in layers)
+    return read_sql(sql, pool=pool)
+
+def location_of(name, pool=None):
+    df = read_sql("SELECT Lat, Lon, Source FROM Geo_Locations WHERE Name = ?", (name,), pool=pool)
+    return None if df.empty else df.iloc[0]
@@ -0,0 +1,278 @@
+import hashlib
+import os
+import resource
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from app import geo, rollups, search, summary
+from app.schema import TABLES, apply_schema, table_columns
+
+DATA_DIR = os.path.join("data")
+
+CSV_FILES = {
+    "Providers": "providers_data.csv",
+    "Receivers": "receivers_data.csv",
+    "Food_Listings": "food_listings_data.csv",
+    "Claims": "claims_data.csv",
+}
+
+# Source format in the CSV feeds -> ISO format stored in SQLite
+DATE_COLUMNS = {
+    "Food_Listings": {"Expiry_Date": ("%m/%d/%Y", "%Y-%m-%d")},
+    "Claims": {"Timestamp": ("%m/%d/%Y %H:%M", "%Y-%m-%d %H:%M:%S")},
+}
+
+PRIMARY_KEYS = {
+    "Providers": "Provider_ID",
+    "Receivers": "Receiver_ID",
+    "Food_Listings": "Food_ID",
+    "Claims": "Claim_ID",
+}
+
+CHUNK_SIZE = 50_000
+COMMIT_EVERY = 250_000
+
+# -------------------------------
+# Date Normalization
+# -------------------------------
+# Parses a whole column at once: first with the feed's M/D/YYYY format, then
+# anything left over as ISO 8601. Values that parse neither way are kept as-is.
+def normalize_date_column(values, source_format, iso_format):
+    parsed = pd.to_datetime(values, format=source_format, errors="coerce")
+    leftover = parsed.isna() & values.notna()
+    if leftover.any():
+        parsed[leftover] = pd.to_datetime(values[leftover], format="ISO8601", errors="coerce")
+    return parsed.dt.strftime(iso_format).where(parsed.notna(), values)
+
+def normalize_dates(table, chunk):
+    for column, (source_format, iso_format) in DATE_COLUMNS.get(table, {}).items():
+        if column in chunk.columns:
+            chunk[column] = normalize_date_column(chunk[column], source_format, iso_format)
+    return chunk
+
+# -------------------------------
+# Chunked Reading
+# -------------------------------
+def iter_chunks(path, table, chunksize=CHUNK_SIZE, skip_rows=0):
+    skiprows = range(1, skip_rows + 1) if skip_rows else None
+    for chunk in pd.read_csv(path, chunksize=chunksize, skiprows=skiprows):
+        yield normalize_dates(table, chunk)
+
+def to_rows(chunk):
+    return list(chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None))
+
+def insert_sql(table, columns):
+    cols = ", ".join(f'"{c}"' for c in columns)
+    marks = ", ".join("?" for _ in columns)
+    return f'INSERT INTO "{table}" ({cols}) VALUES ({marks})'
+
+def upsert_sql(table, columns, key):
+    updates = ", ".join(f'"{c}" = excluded."{c}"' for c in columns if c != key)
+    return f'{insert_sql(table, columns)} ON CONFLICT ("{key}") DO UPDATE SET {updates}'
+
+# -------------------------------
+# Change Detection
+# -------------------------------
+# Hashes every row of a chunk in one vectorized call and compares it with the
+# hash stored when that ID was last imported. Rows without an ID always count
+# as new.
+def row_hashes(chunk):
+    return pd.Series(pd.util.hash_pandas_object(chunk, index=False).values.view("int64"), index=chunk.index)
+
+def changed_mask(conn, table, key, chunk, hashes):
+    ids = chunk[key].astype("Int64")
+    keyed = ids.notna()
+    if not keyed.any():
+        return ~keyed
+
+    stored = pd.read_sql_query(
+        "SELECT Row_ID, Row_Hash FROM Import_Row_Hashes WHERE Table_Name = ? AND Row_ID BETWEEN ? AND ?",
+        conn, params=(table, int(ids.min()), int(ids.max())))
+    previous = stored.set_index("Row_ID")["Row_Hash"].astype("Int64").reindex(ids.fillna(-1).values)
+    previous.index = chunk.index
+    return (~keyed | previous.isna() | (previous != hashes)).fillna(True).astype(bool)
+
+def save_hashes(conn, table, key, chunk, hashes):
+    keyed = chunk[key].notna()
+    rows = zip([table] * int(keyed.sum()), chunk.loc[keyed, key].astype("int64").tolist(), hashes[keyed].tolist())
+    conn.executemany(
+        "INSERT INTO Import_Row_Hashes (Table_Name, Row_ID, Row_Hash) VALUES (?, ?, ?) "
+        "ON CONFLICT (Table_Name, Row_ID) DO UPDATE SET Row_Hash = excluded.Row_Hash", rows)
+
+# -------------------------------
+# Checkpoints
+# -------------------------------
+# A checkpoint remembers how many data rows of a file were committed and a
+# hash of the file as it was then. A rerun of the same file skips it (or
+# resumes an interrupted import); a file that has only grown resumes after
+# the rows already imported; anything else is read again from the top and
+# relies on the row hashes to skip what did not change.
+def file_hash(path, size=None):
+    digest = hashlib.sha256()
+    remaining = os.path.getsize(path) if size is None else size
+    with open(path, "rb") as f:
+        while remaining > 0:
+            block = f.read(min(1 << 20, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+def resume_point(conn, table, path):
+    row = conn.execute(
+        "SELECT File_Size, File_Mtime, File_Hash, Rows_Done, Completed FROM Import_Checkpoints "
+        "WHERE Table_Name = ? AND File_Path = ?", (table, path)).fetchone()
+    if row is None:
+        return 0
+
+    size, mtime, digest, rows_done, completed = row
+    stat = os.stat(path)
+    if stat.st_size == size and stat.st_mtime == mtime:
+        return None if completed else rows_done
+    if stat.st_size > size and file_hash(path, size) == digest:
+        return rows_done
+    return 0
+
+def save_checkpoint(conn, table, path, stat, digest, rows_done, completed):
+    conn.execute(
+        "INSERT INTO Import_Checkpoints (Table_Name, File_Path, File_Size, File_Mtime, File_Hash, Rows_Done, Completed, Updated_At) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now')) "
+        "ON CONFLICT (Table_Name, File_Path) DO UPDATE SET File_Size = excluded.File_Size, "
+        "File_Mtime = excluded.File_Mtime, File_Hash = excluded.File_Hash, Rows_Done = excluded.Rows_Done, "
+        "Completed = excluded.Completed, Updated_At = excluded.Updated_At",
+        (table, path, stat.st_size, stat.st_mtime, digest, rows_done, int(completed)))
+
+# -------------------------------
+# Bulk Load Settings
+# -------------------------------
+# Trades durability for speed while a load is running: no fsync per commit,
+# a large page cache and in-memory temp storage. Settings are restored after.
+@contextmanager
+def bulk_load_pragmas(conn):
+    saved = {name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+             for name in ("synchronous", "cache_size", "temp_store")}
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-262144")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    try:
+        yield conn
+    finally:
+        for name, value in saved.items():
+            conn.execute(f"PRAGMA {name}={value}")
+
+# Drops the version/summary/rollup/search triggers and secondary indexes for the duration
+# of a load and rebuilds them once at the end, instead of maintaining them
+# row by row. Only use this while nothing else is writing to the database.
+@contextmanager
+def suspended_triggers(conn):
+    objects = conn.execute(
+        "SELECT type, name FROM sqlite_master "
+        "WHERE (type='trigger' AND name LIKE 'trg_%') OR (type='index' AND name LIKE 'idx_%')").fetchall()
+    if conn.in_transaction:
+        conn.commit()
+    for kind, name in objects:
+        conn.execute(f'DROP {kind.upper()} IF EXISTS "{name}"')
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.commit()
+        apply_schema(conn)
+        summary.rebuild(conn)
+        rollups.rebuild(conn)
+        search.rebuild(conn)
+        conn.execute("UPDATE Table_Versions SET Version = Version + 1")
+        conn.commit()
+
+# -------------------------------
+# Import
+# -------------------------------
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# mode="append" inserts every row; mode="upsert" inserts new IDs, updates
+# changed ones (INSERT ... ON CONFLICT DO UPDATE), skips rows whose content
+# hash is unchanged and checkpoints progress per file.
+def import_csv(conn, table, path, mode="append", chunksize=CHUNK_SIZE, commit_every=COMMIT_EVERY):
+    allowed = set(table_columns(conn, table))
+    key = PRIMARY_KEYS[table]
+    start = time.perf_counter()
+    stats = {"table": table, "rows": 0, "written": 0, "unchanged": 0,
+             "skipped_by_checkpoint": 0, "skipped_file": False}
+
+    skip_rows = 0
+    if mode == "upsert":
+        path = os.path.abspath(path)
+        skip_rows = resume_point(conn, table, path)
+        if skip_rows is None:
+            stats.update(seconds=0.0, rows_per_sec=0, peak_rss_mb=peak_rss_mb(), skipped_file=True)
+            return stats
+        stat, digest = os.stat(path), file_hash(path)
+        stats["skipped_by_checkpoint"] = skip_rows
+
+    rows_done, pending = skip_rows, 0
+    conn.execute("BEGIN")
+    try:
+        for chunk in iter_chunks(path, table, chunksize, skip_rows=skip_rows):
+            chunk = chunk[[c for c in chunk.columns if c in allowed]]
+            stats["rows"] += len(chunk)
+            rows_done += len(chunk)
+
+            if mode == "upsert" and key in chunk.columns:
+                hashes = row_hashes(chunk)
+                changed = changed_mask(conn, table, key, chunk, hashes)
+                stats["unchanged"] += int((~changed).sum())
+                chunk, hashes = chunk[changed], hashes[changed]
+                conn.executemany(upsert_sql(table, chunk.columns, key), to_rows(chunk))
+                save_hashes(conn, table, key, chunk, hashes)
+            else:
+                conn.executemany(insert_sql(table, chunk.columns), to_rows(chunk))
+
+            stats["written"] += len(chunk)
+            pending += len(chunk)
+            if pending >= commit_every:
+                if mode == "upsert":
+                    save_checkpoint(conn, table, path, stat, digest, rows_done, completed=False)
+                conn.commit()
+                conn.execute("BEGIN")
+                pending = 0
+
+        if mode == "upsert":
+            save_checkpoint(conn, table, path, stat, digest, rows_done, completed=True)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+    elapsed = time.perf_counter() - start
+    stats.update(seconds=elapsed, rows_per_sec=stats["rows"] / elapsed if elapsed else 0, peak_rss_mb=peak_rss_mb())
+    return stats
+
+def import_all(conn, data_dir=DATA_DIR, tables=TABLES, suspend_triggers=False, **kwargs):
+    stats = []
+    with bulk_load_pragmas(conn):
+        if suspend_triggers:
+            with suspended_triggers(conn):
+                for table in tables:
+                    stats.append(import_csv(conn, table, os.path.join(data_dir, CSV_FILES[table]), **kwargs))
+        else:
+            for table in tables:
+                stats.append(import_csv(conn, table, os.path.join(data_dir, CSV_FILES[table]), **kwargs))
+    # Suspended triggers are put back with apply_schema, which geocodes too
+    if not suspend_triggers:
+        geo.geocode_missing(conn)
+        conn.commit()
+    return stats
+
+def format_stats(stats):
+    if stats["skipped_file"]:
+        return f"   {stats['table']}: unchanged since the last import, skipped"
+    line = (f"   {stats['table']}: {stats['rows']} rows in {stats['seconds']:.2f}s "
+            f"({stats['rows_per_sec']:,.0f} rows/s, peak RSS {stats['peak_rss_mb']:.0f} MB)")
+    if stats["unchanged"] or stats["skipped_by_checkpoint"]:
+        line += (f", {stats['written']} written, {stats['unchanged']} unchanged, "
+                 f"{stats['skipped_by_checkpoint']} already checkpointed")
+    return line
@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+
+from app import snapshot
+from app.cache import versioned_cache
+from app.db import fetch_all, read_sql
+
+ALL_TABLES = ["Providers", "Receivers", "Food_Listings", "Claims"]
+
+# The whole page is computed by compute(filters) below, cached per filter
+# combination and invalidated only by writes to the tables it reads (see
+# app/cache.py).
+
+# Filter selectbox key -> prepared listings column. Empty strings mean "no filter".
+# The city filter is the listing's own city (Food_Listings.Location).
+FILTER_COLUMNS = {"city": "City", "provider": "Provider_Name",
+                  "food_type": "Food_Type", "meal_type": "Meal_Type"}
+
+def empty_filters():
+    return {key: "" for key in FILTER_COLUMNS}
+
+# -------------------------------
+# Filter Options
+# -------------------------------
+def has_rows(table, pool=None):
+    return bool(fetch_all(f'SELECT EXISTS (SELECT 1 FROM "{table}")', pool=pool)[0][0])
+
+def distinct_values(sql, pool=None):
+    return [row[0] for row in fetch_all(sql, pool=pool) if row[0] is not None]
+
+@versioned_cache(["Providers", "Receivers", "Food_Listings"])
+def filter_options(pool=None):
+    return {
+        "city": distinct_values(
+            "SELECT c.Name FROM Cities c "
+            "WHERE EXISTS (SELECT 1 FROM Food_Listings f WHERE f.City_ID = c.City_ID) ORDER BY 1", pool=pool),
+        "provider": distinct_values("SELECT DISTINCT Name FROM Providers", pool=pool),
+        "food_type": distinct_values("SELECT DISTINCT Food_Type FROM Food_Listings", pool=pool),
+        "meal_type": distinct_values("SELECT DISTINCT Meal_Type FROM Food_Listings", pool=pool),
+    }
+
+# -------------------------------
+# Single-Pass Stage
+# -------------------------------
+# Looks up a small dimension table's column for every row of a large frame,
+# keeping it categorical.
+def _lookup(dimension, column, ids):
+    return dimension[column].astype("category").reindex(ids).array
+
+# City_ID values as a categorical of city names. The codes come straight from
+# the integer IDs (one array lookup), so no city string is read or hashed
+# per row.
+def _cities(city_ids, cities):
+    ids = city_ids.fillna(0).astype("int64").to_numpy()
+    codes = np.full(int(max(ids.max(initial=0), cities.index.max() if len(cities) else 0)) + 1, -1)
+    codes[cities.index.to_numpy()] = np.arange(len(cities))
+    return pd.Categorical.from_codes(codes[ids], categories=cities["Name"].to_numpy())
+
+# The page's inputs are read once per data version from the memory-mapped
+# table snapshots (app/snapshot.py) into narrow frames: text dimensions
+# become categoricals, cities are decoded from their integer City_ID, expiry
+# is parsed once, every listing already carries its provider's name and
+# every claim its listing row and receiver. A filter change is then a
+# boolean mask plus a handful of groupbys, with no SQL and no re-merging.
+@versioned_cache(ALL_TABLES, max_entries=1)
+def prepared_frames(pool=None):
+    cities = read_sql("SELECT City_ID, Name FROM Cities", pool=pool).set_index("City_ID")
+    providers = snapshot.frame("Providers", ["Provider_ID", "Name"], pool=pool).set_index("Provider_ID")
+    receivers = snapshot.frame("Receivers", ["Receiver_ID", "Name", "City_ID"], pool=pool).set_index("Receiver_ID")
+    receivers["City"] = _cities(receivers.pop("City_ID"), cities)
+
+    listings = snapshot.frame("Food_Listings", ["Food_ID", "Provider_ID", "Quantity", "Expiry_Date", "City_ID",
+                                                "Food_Type", "Meal_Type", "Provider_Type"], pool=pool)
+    listings["Quantity"] = listings["Quantity"].fillna(0).astype("int64")
+    for column in ["Food_Type", "Meal_Type", "Provider_Type"]:
+        listings[column] = listings[column].astype("category")
+    listings["City"] = _cities(listings.pop("City_ID"), cities)
+    listings["Provider_Name"] = _lookup(providers, "Name", listings["Provider_ID"])
+    expiry = pd.to_datetime(listings.pop("Expiry_Date"), format="%Y-%m-%d", errors="coerce")
+    listings["Expired"] = (expiry < pd.Timestamp.now("UTC").tz_localize(None).normalize()).to_numpy()
+
+    claims = snapshot.frame("Claims", ["Food_ID", "Receiver_ID"], pool=pool)
+    claims["Receiver_Name"] = _lookup(receivers, "Name", claims["Receiver_ID"])
+    claims["Receiver_City"] = receivers["City"].reindex(claims["Receiver_ID"]).array
+    # Position of each claim's listing (-1 when the listing is gone)
+    rows = pd.Series(np.arange(len(listings)), index=listings["Food_ID"])
+    claims["Listing_Row"] = rows.reindex(claims["Food_ID"]).fillna(-1).astype("int64").to_numpy()
+
+    return listings, claims, len(receivers)
+
+def listing_mask(listings, filters):
+    mask = np.ones(len(listings), dtype=bool)
+    for key, column in FILTER_COLUMNS.items():
+        if filters.get(key):
+            mask &= (listings[column] == filters[key]).to_numpy()
+    return mask
+
+def _counts(series, name, value="Count"):
+    counts = series.value_counts(sort=True)
+    counts = counts[counts > 0]
+    return counts.rename_axis(name).reset_index(name=value)
+
+def _plain(df):
+    return df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+
+def _shares(df, column):
+    total = df[column].sum()
+    return df.assign(**{"Share %": (df[column] / total) * 100 if total > 0 else 0})
+
+# All Food Insights aggregates for one filter combination, cached per filter
+# tuple until one of the four tables is written to.
+@versioned_cache(ALL_TABLES, max_entries=64)
+def compute(filters, pool=None):
+    listings, claims, receivers = prepared_frames(pool=pool)
+    mask = listing_mask(listings, filters)
+    f = listings[mask]
+
+    # One groupby over (city, food type) feeds charts 1, 2, 14 and 15
+    by_place = f.groupby(["City", "Food_Type"], observed=True)["Quantity"].agg(["size", "sum"]).reset_index()
+    by_type = by_place.groupby("Food_Type", observed=True)[["size", "sum"]].sum()
+
+    # One groupby over providers feeds charts 3 and 11
+    providers = (f.groupby("Provider_ID")["Provider_Name"].agg(["size", "first"])
+                 .rename(columns={"size": "Total_Listings", "first": "Name"})
+                 .sort_values("Total_Listings", ascending=False, kind="stable").reset_index())
+
+    # Claims on the filtered listings feed charts 4 and 12
+    c = claims[claims["Listing_Row"] >= 0]
+    c = c[mask[c["Listing_Row"].to_numpy()]]
+    receivers_claims = (c.groupby("Receiver_ID")["Receiver_Name"].agg(["size", "first"])
+                        .rename(columns={"size": "Total_Claims", "first": "Name"})
+                        .sort_values("Total_Claims", ascending=False, kind="stable").reset_index())
+
+    # Chart 10 only follows the city filter, by receiver city
+    city_claims = claims if not filters.get("city") else claims[claims["Receiver_City"] == filters["city"]]
+
+    # Expiry was parsed once in prepared_frames; charts 6 and 9 share the flag
+    status = f["Expired"].map({True: "Expired", False: "Valid"})
+
+    frames = {
+        "kpis": {"providers": int(f["Provider_ID"].nunique()), "receivers": receivers, "listings": len(f)},
+        "food_type_counts": by_type["size"].rename("Count").sort_values(ascending=False).rename_axis("Food_Type").reset_index(),
+        "food_type_by_city": by_place.rename(columns={"size": "Count"})[["City", "Food_Type", "Count"]],
+        "provider_listing_counts": providers,
+        "receiver_claim_counts": receivers_claims,
+        "meal_type_counts": _counts(f["Meal_Type"], "Meal_Type"),
+        "expiry_status": _counts(status, "Status"),
+        "wasted_food_types": _counts(f.loc[f["Expired"], "Food_Type"], "Food_Type", "Expired_Count"),
+        "claims_by_city": _counts(city_claims["Receiver_City"], "City", "Claims"),
+        "provider_shares": _shares(providers, "Total_Listings"),
+        "receiver_shares": _shares(receivers_claims, "Total_Claims"),
+        "provider_type_counts": _counts(f["Provider_Type"], "Provider_Type", "Donations"),
+        "quantity_by_city": by_place.groupby("City", observed=True)["sum"].sum().rename("Quantity").reset_index(),
+        "quantity_by_food_type": by_type["sum"].rename("Quantity").reset_index(),
+    }
+    return {name: value if name == "kpis" else _plain(value) for name, value in frames.items()}
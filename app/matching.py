@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from app import claims, geo
+from app.db import read_sql
+from app.search import OPEN_LISTING
+
+# Receivers that get served first when several share a city
+TYPE_PRIORITY = {"Shelter": 0, "NGO": 1, "Charity": 2, "Individual": 3}
+
+MAX_PER_RECEIVER = 5
+NEIGHBOUR_PLACES = 5
+EARTH_RADIUS_KM = 6371.0
+
+SUGGESTION_COLUMNS = ["Food_ID", "Food_Name", "Location", "Expiry", "Days_Left", "Available",
+                      "Receiver_ID", "Receiver_Name", "Receiver_Type", "Receiver_City", "Distance_km"]
+
+# -------------------------------
+# Inputs
+# -------------------------------
+# Open listings with the stock that is not already spoken for by pending
+# claims (from the claims_by_food_status summary), and their geocoded place
+# (Lat/Lon/Source NULL when it has none).
+def open_listings(pool=None):
+    return read_sql(f"""
+        SELECT f.Food_ID, f.Food_Name, f.Location, f.Expiry_Date AS Expiry,
+               f.Quantity - IFNULL(p.Row_Count, 0) AS Available, g.Lat, g.Lon, g.Source
+        FROM Food_Listings f
+        LEFT JOIN Geo_Locations g ON g.Name = f.Location
+        LEFT JOIN Summary_Counts p
+               ON p.Metric = 'claims_by_food_status' AND p.Grp = f.Food_ID AND p.Sub = 'Pending'
+        WHERE {OPEN_LISTING} AND f.Quantity > IFNULL(p.Row_Count, 0)
+    """, pool=pool)
+
+def located_receivers(pool=None):
+    return read_sql("""
+        SELECT r.Receiver_ID, r.Name, r.Type, r.City, g.Lat, g.Lon, g.Source
+        FROM Receivers r LEFT JOIN Geo_Locations g ON g.Name = r.City
+    """, pool=pool)
+
+# -------------------------------
+# Nearest Places
+# -------------------------------
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+# For every source place, the k closest target places (indexes and km),
+# nearest first. Listings and receivers are first collapsed onto their
+# distinct places, so this compares places x places in chunks rather than
+# every listing with every receiver.
+def nearest_places(src_lat, src_lon, dst_lat, dst_lon, k, chunk=1024):
+    k = min(k, len(dst_lat))
+    idx = np.empty((len(src_lat), k), dtype=np.int64)
+    dist = np.empty((len(src_lat), k))
+    for start in range(0, len(src_lat), chunk):
+        end = start + chunk
+        d = haversine_km(src_lat[start:end, None], src_lon[start:end, None], dst_lat[None, :], dst_lon[None, :])
+        part = np.argpartition(d, k - 1, axis=1)[:, :k] if k < d.shape[1] else np.tile(np.arange(k), (len(d), 1))
+        part_d = np.take_along_axis(d, part, axis=1)
+        order = np.argsort(part_d, axis=1)
+        idx[start:end] = np.take_along_axis(part, order, axis=1)
+        dist[start:end] = np.take_along_axis(part_d, order, axis=1)
+    return idx, dist
+
+# Receiver cities to try for every listing place, in order, with their
+# distance in km: the place's own city first, then its `neighbours` nearest
+# other cities. Only places found in the gazetteer have a position
+# (app/geo.py); the others are only matched within their own city, and such
+# matches carry no distance (NaN). Returns
+# (city names, km), each len(spots) x (neighbours + 1), None/NaN where there
+# is no candidate.
+def candidate_cities(spots, places, neighbours):
+    cities = np.full((len(spots), neighbours + 1), None, dtype=object)
+    km = np.full((len(spots), neighbours + 1), np.nan)
+
+    own = spots.index.isin(places.index)
+    located = (spots["Source"] == geo.GAZETTEER).to_numpy()
+    cities[own, 0] = spots.index[own]
+    km[own & located, 0] = 0.0
+
+    src = spots[located]
+    dst = places[places["Source"] == geo.GAZETTEER]
+    if neighbours and len(src) and len(dst):
+        idx, dist = nearest_places(src["Lat"].to_numpy(), src["Lon"].to_numpy(),
+                                   dst["Lat"].to_numpy(), dst["Lon"].to_numpy(), neighbours + 1)
+        names = dst.index.to_numpy()[idx]
+        # The own city is already round 0: move it behind the others
+        order = np.argsort(names == src.index.to_numpy()[:, None], axis=1, kind="stable")[:, :neighbours]
+        names = np.take_along_axis(names, order, axis=1)
+        dist = np.take_along_axis(dist, order, axis=1)
+        rows = np.flatnonzero(located)
+        cities[rows, 1:names.shape[1] + 1] = names
+        km[rows, 1:names.shape[1] + 1] = dist
+    return cities, km
+
+# -------------------------------
+# Matching
+# -------------------------------
+# Each receiver offers max_per_receiver slots. Within a city the slots are
+# handed out round-robin (everyone's first slot before anyone's second),
+# shelters first, then NGOs, charities and individuals.
+def receiver_slots(receivers, max_per_receiver):
+    ranked = receivers.assign(Type_Rank=receivers["Type"].map(TYPE_PRIORITY).fillna(len(TYPE_PRIORITY)))
+    slots = ranked.loc[ranked.index.repeat(max_per_receiver)].assign(
+        Slot=np.tile(np.arange(max_per_receiver), len(ranked)))
+    slots = slots.sort_values(["City", "Slot", "Type_Rank", "Receiver_ID"], kind="stable")
+    slots["Slot_Rank"] = slots.groupby("City").cumcount()
+    return slots[["City", "Slot_Rank", "Receiver_ID", "Name", "Type"]]
+
+# Proposes one receiver per open listing. Listings are served most urgent
+# first (fewest days to expiry, then the most stock); each round offers every
+# unmatched listing the free slots of its next candidate city (see
+# candidate_cities), starting with its own city. Returns a frame in
+# SUGGESTION_COLUMNS order.
+def match(listings, receivers, max_per_receiver=MAX_PER_RECEIVER, neighbours=NEIGHBOUR_PLACES, today=None):
+    if listings.empty or receivers.empty:
+        return pd.DataFrame(columns=SUGGESTION_COLUMNS)
+
+    today = pd.Timestamp(today or pd.Timestamp.now("UTC").tz_localize(None).normalize())
+    listings = listings.assign(
+        Days_Left=(pd.to_datetime(listings["Expiry"], errors="coerce") - today).dt.days)
+    listings = listings.sort_values(["Days_Left", "Available", "Food_ID"], ascending=[True, False, True],
+                                    kind="stable").reset_index(drop=True)
+
+    places = receivers.groupby("City", sort=False)[["Lat", "Lon", "Source"]].first()
+    spots = listings.groupby("Location", sort=False)[["Lat", "Lon", "Source"]].first()
+    near_city, near_km = candidate_cities(spots, places, neighbours)
+    spot_of = pd.Series(np.arange(len(spots)), index=spots.index)[listings["Location"]].to_numpy()
+
+    slots = receiver_slots(receivers, max_per_receiver)
+    used = pd.Series(0, index=places.index)
+
+    matched = []
+    pending = np.arange(len(listings))
+    for k in range(near_city.shape[1]):
+        if len(pending) == 0:
+            break
+        candidates = pd.DataFrame({
+            "Row": pending,
+            "City": near_city[spot_of[pending], k],
+            "Distance_km": near_km[spot_of[pending], k],
+        }).dropna(subset=["City"])
+        # Rows are in priority order, so cumcount ranks listings per city
+        candidates["Slot_Rank"] = candidates.groupby("City").cumcount() + used.reindex(candidates["City"]).to_numpy()
+        hits = candidates.merge(slots, on=["City", "Slot_Rank"], how="inner")
+        matched.append(hits)
+        used = used.add(hits.groupby("City").size(), fill_value=0)
+        pending = np.setdiff1d(pending, hits["Row"].to_numpy(), assume_unique=True)
+
+    hits = pd.concat(matched, ignore_index=True).sort_values("Row")
+    chosen = listings.loc[hits["Row"]].reset_index(drop=True)
+    return chosen.assign(
+        Receiver_ID=hits["Receiver_ID"].to_numpy(),
+        Receiver_Name=hits["Name"].to_numpy(),
+        Receiver_Type=hits["Type"].to_numpy(),
+        Receiver_City=hits["City"].to_numpy(),
+        Distance_km=hits["Distance_km"].round(1).to_numpy(),
+    )[SUGGESTION_COLUMNS]
+
+# -------------------------------
+# Suggested Claims
+# -------------------------------
+def suggest_claims(limit=None, max_per_receiver=MAX_PER_RECEIVER, pool=None):
+    suggestions = match(open_listings(pool=pool), located_receivers(pool=pool), max_per_receiver)
+    return suggestions.head(limit) if limit else suggestions
+
+# Creates a claim for every suggestion and approves them in one batch
+# (claims.approve_claims), so the stock checks still apply. Returns the
+# [(claim_id, result)] of the approval.
+def accept_suggestions(suggestions, approve=True, pool=None):
+    claim_ids = claims.create_claims(zip(suggestions["Food_ID"], suggestions["Receiver_ID"]), pool=pool)
+    if not approve:
+        return [(claim_id, claims.UPDATED) for claim_id in claim_ids]
+    return claims.approve_claims(claim_ids, pool=pool)
@@ -0,0 +1,209 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+
+import pandas as pd
+
+ENABLED = os.environ.get("FOOD_WASTAGE_METRICS", "1") != "0"
+MAX_SAMPLES = int(os.environ.get("FOOD_WASTAGE_METRICS_SAMPLES", "5000"))
+
+QUANTILES = (0.5, 0.95, 0.99)
+SQL_NAME_LENGTH = 160
+PROMETHEUS_PREFIX = "food_wastage"
+
+# -------------------------------
+# Ring Buffer
+# -------------------------------
+# The last MAX_SAMPLES timings of this server process, shared by every
+# session: (kind, name, milliseconds, unix time, SQLite statements run).
+# Older samples fall off the end, so memory stays fixed however long the
+# app runs. deque.append and deque.copy are atomic, so no lock is needed.
+_samples = deque(maxlen=MAX_SAMPLES)
+
+def record(kind, name, ms, statements=None):
+    _samples.append((kind, name, ms, time.time(), statements))
+
+def samples():
+    return pd.DataFrame(list(_samples.copy()), columns=["Kind", "Name", "ms", "At", "Statements"])
+
+def clear():
+    _samples.clear()
+
+# -------------------------------
+# Sections
+# -------------------------------
+# Times a block of page code, e.g. `with metrics.section("Food Insights / charts"):`.
+# A block that raises is still recorded.
+@contextmanager
+def section(name):
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record("section", name, (time.perf_counter() - start) * 1000)
+
+def record_since(kind, name, start):
+    if ENABLED:
+        record(kind, name, (time.perf_counter() - start) * 1000)
+
+# -------------------------------
+# SQL Timing
+# -------------------------------
+# Pool connections are opened with TimedConnection, so every statement the
+# app runs (conn.execute, cursors, pandas.read_sql_query) goes through
+# TimedCursor. A SELECT is timed from execute() to the end of fetchall(), and
+# recorded when its rows have been read or the cursor is reused or closed.
+# The trace callback counts the statements SQLite actually stepped for each
+# call, including trigger bodies and implicit BEGIN/COMMIT.
+_trace = threading.local()
+_clock = time.perf_counter
+
+def _count_statement(statement):
+    _trace.statements += 1
+
+@lru_cache(maxsize=1024)
+def sql_name(sql):
+    return re.sub(r"\s+", " ", sql).strip()[:SQL_NAME_LENGTH]
+
+class TimedCursor(sqlite3.Cursor):
+    _pending = None
+
+    def _run(self, method, sql, args):
+        if self._pending is not None:
+            self._flush()
+        _trace.statements = 0
+        start = _clock()
+        try:
+            return method(self, sql, *args)
+        finally:
+            self._pending = [sql, _clock() - start, _trace.statements]
+            if self.description is None:
+                self._flush()
+
+    def _flush(self):
+        sql, elapsed, statements = self._pending
+        self._pending = None
+        record("sql", sql_name(sql), elapsed * 1000, statements)
+
+    def _fetch(self, method, args=()):
+        start = _clock()
+        try:
+            return method(self, *args)
+        finally:
+            if self._pending is not None:
+                self._pending[1] += _clock() - start
+
+    def execute(self, sql, parameters=()):
+        return self._run(sqlite3.Cursor.execute, sql, (parameters,))
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(sqlite3.Cursor.executemany, sql, (seq_of_parameters,))
+
+    def executescript(self, script):
+        return self._run(sqlite3.Cursor.executescript, script, ())
+
+    def fetchone(self):
+        return self._fetch(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(sqlite3.Cursor.fetchmany, args)
+
+    def fetchall(self):
+        rows = self._fetch(sqlite3.Cursor.fetchall)
+        if self._pending is not None:
+            self._flush()
+        return rows
+
+    def close(self):
+        if self._pending is not None:
+            self._flush()
+        sqlite3.Cursor.close(self)
+
+    def __del__(self):
+        if self._pending is not None:
+            self._flush()
+
+
+class TimedConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(_count_statement)
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+# The factory for sqlite3.connect(): timed connections unless metrics are
+# switched off with FOOD_WASTAGE_METRICS=0.
+def connection_factory():
+    return TimedConnection if ENABLED else sqlite3.Connection
+
+# -------------------------------
+# Summaries
+# -------------------------------
+# One row per (kind, name) with the count, p50/p95/p99, max and total
+# milliseconds over the samples in the ring buffer, slowest p95 first.
+def summary(kind=None):
+    df = samples()
+    if kind:
+        df = df[df["Kind"] == kind]
+    if df.empty:
+        return pd.DataFrame(columns=["Kind", "Name", "Count", "p50_ms", "p95_ms", "p99_ms", "Max_ms", "Total_ms"])
+    grouped = df.groupby(["Kind", "Name"], sort=False)["ms"]
+    quantiles = grouped.quantile(list(QUANTILES)).unstack()
+    quantiles.columns = [f"p{int(q * 100)}_ms" for q in QUANTILES]
+    out = pd.concat([grouped.size().rename("Count"), quantiles,
+                     grouped.max().rename("Max_ms"), grouped.sum().rename("Total_ms")], axis=1)
+    return out.reset_index().sort_values("p95_ms", ascending=False, ignore_index=True).round(3)
+
+def slowest(limit=20):
+    df = samples().nlargest(limit, "ms")
+    return df.assign(At=pd.to_datetime(df["At"], unit="s").dt.strftime("%Y-%m-%d %H:%M:%S")).round(3)
+
+# -------------------------------
+# Export
+# -------------------------------
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# Prometheus text exposition format: one summary per kind, in seconds, with
+# the quantiles, _sum and _count for each statement or section name.
+def to_prometheus():
+    rows = summary()
+    lines = []
+    for kind, group in rows.groupby("Kind", sort=False):
+        metric = f"{PROMETHEUS_PREFIX}_{kind}_seconds"
+        label = "statement" if kind == "sql" else "name"
+        lines += [f"# HELP {metric} Wall time per {kind} over the last {MAX_SAMPLES} samples.",
+                  f"# TYPE {metric} summary"]
+        for row in group.itertuples(index=False):
+            name = _label(row.Name)
+            for q in QUANTILES:
+                value = getattr(row, f"p{int(q * 100)}_ms") / 1000
+                lines.append(f'{metric}{{{label}="{name}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{metric}_sum{{{label}="{name}"}} {row.Total_ms / 1000:.6f}')
+            lines.append(f'{metric}_count{{{label}="{name}"}} {row.Count}')
+    return "\n".join(lines) + "\n"
+
+def _records(df):
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+def to_json():
+    return json.dumps({"summary": _records(summary()), "samples": _records(samples())}, indent=2)
@@ -0,0 +1,140 @@
+from app.cache import versioned_cache
+from app.db import read_sql
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# -------------------------------
+# Browsable Views
+# -------------------------------
+# Each view maps the displayed column names to SQL expressions. "key" is the
+# unique column used as the keyset tie-breaker.
+VIEWS = {
+    "Providers": {
+        "from": "Providers",
+        "key": "Provider_ID",
+        "columns": {c: c for c in ["Provider_ID", "Name", "Type", "Address", "City", "Contact"]},
+        "tables": ["Providers"],
+    },
+    "Receivers": {
+        "from": "Receivers",
+        "key": "Receiver_ID",
+        "columns": {c: c for c in ["Receiver_ID", "Name", "Type", "City", "Contact"]},
+        "tables": ["Receivers"],
+    },
+    "Food_Listings": {
+        "from": "Food_Listings",
+        "key": "Food_ID",
+        "columns": {c: c for c in ["Food_ID", "Food_Name", "Quantity", "Expiry_Date", "Provider_ID",
+                                   "Provider_Type", "Location", "Food_Type", "Meal_Type"]},
+        "tables": ["Food_Listings"],
+    },
+    "Claims": {
+        "from": "Claims c JOIN Receivers r ON c.Receiver_ID = r.Receiver_ID "
+                "JOIN Food_Listings f ON c.Food_ID = f.Food_ID",
+        "key": "c.Claim_ID",
+        "columns": {
+            "Claim_ID": "c.Claim_ID",
+            "Receiver_Name": "r.Name",
+            "Receiver_City": "r.City",
+            "Food_Type": "f.Food_Type",
+            "Available_Quantity": "f.Quantity",
+            "Status": "c.Status",
+            "Timestamp": "c.Timestamp",
+        },
+        "tables": ["Claims", "Receivers", "Food_Listings"],
+    },
+}
+
+# -------------------------------
+# Query Building
+# -------------------------------
+def _search_clause(view, search_col, search):
+    if not (search_col and search):
+        return [], []
+    expr = VIEWS[view]["columns"][search_col]
+    return [f"{expr} LIKE ?"], [f"%{search}%"]
+
+# Rows strictly after the cursor (sort value, key) in ORDER BY sort, key.
+# SQLite sorts NULLs first ascending and last descending, so NULL sort
+# values need their own branch.
+def _keyset_clause(sort_expr, key_expr, descending, after):
+    if after is None:
+        return [], []
+    value, key = after
+    op = "<" if descending else ">"
+    if sort_expr == key_expr:
+        return [f"{key_expr} {op} ?"], [key]
+    if value is None:
+        if descending:
+            return [f"({sort_expr} IS NULL AND {key_expr} < ?)"], [key]
+        return [f"(({sort_expr} IS NULL AND {key_expr} > ?) OR {sort_expr} IS NOT NULL)"], [key]
+    clause = f"({sort_expr} {op} ? OR ({sort_expr} = ? AND {key_expr} {op} ?)"
+    if descending:
+        clause += f" OR {sort_expr} IS NULL"
+    return [clause + ")"], [value, value, key]
+
+def page_query(view, sort_col=None, descending=False, search_col=None, search=None, after=None, page_size=50):
+    spec = VIEWS[view]
+    key_expr = spec["key"]
+    sort_expr = spec["columns"][sort_col] if sort_col else key_expr
+
+    clauses, params = _search_clause(view, search_col, search)
+    keyset, keyset_params = _keyset_clause(sort_expr, key_expr, descending, after)
+    clauses += keyset
+    params += keyset_params
+
+    select = ", ".join(f"{expr} AS {name}" for name, expr in spec["columns"].items())
+    direction = "DESC" if descending else "ASC"
+    sql = f"SELECT {select}, {sort_expr} AS _sort, {key_expr} AS _key FROM {spec['from']}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {sort_expr} {direction}, {key_expr} {direction} LIMIT {int(page_size)}"
+    return sql, tuple(params)
+
+# The whole searched view in the same order, without keyset or LIMIT, for
+# exports that stream every row.
+def export_query(view, sort_col=None, descending=False, search_col=None, search=None):
+    spec = VIEWS[view]
+    key_expr = spec["key"]
+    sort_expr = spec["columns"][sort_col] if sort_col else key_expr
+
+    clauses, params = _search_clause(view, search_col, search)
+    select = ", ".join(f"{expr} AS {name}" for name, expr in spec["columns"].items())
+    direction = "DESC" if descending else "ASC"
+    sql = f"SELECT {select} FROM {spec['from']}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {sort_expr} {direction}, {key_expr} {direction}"
+    return sql, tuple(params)
+
+# -------------------------------
+# Page / Count Reads
+# -------------------------------
+# Returns one page and the cursor for the next one (None on the last page).
+def fetch_page(view, sort_col=None, descending=False, search_col=None, search=None,
+               after=None, page_size=50, pool=None):
+    sql, params = page_query(view, sort_col, descending, search_col, search, after, page_size + 1)
+    df = read_sql(sql, params, pool=pool)
+
+    next_cursor = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        last = df.iloc[-1]
+        next_cursor = (_plain(last["_sort"]), _plain(last["_key"]))
+    return df.drop(columns=["_sort", "_key"]), next_cursor
+
+# The total is cached per view and search, so paging through a view only
+# counts once until one of its tables is written to.
+@versioned_cache(tables=lambda view, search_col=None, search=None: VIEWS[view]["tables"], max_entries=32)
+def count_rows(view, search_col=None, search=None, pool=None):
+    spec = VIEWS[view]
+    clauses, params = _search_clause(view, search_col, search)
+    sql = f"SELECT COUNT(*) AS n FROM {spec['from']}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return int(read_sql(sql, tuple(params), pool=pool)["n"].iloc[0])
+
+def _plain(value):
+    if value is None or value != value:
+        return None
+    return value.item() if hasattr(value, "item") else value
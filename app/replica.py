@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import threading
+import time
+
+from app.db import BUSY_TIMEOUT_MS, ConnectionPool, get_pool
+
+ENABLED = os.environ.get("FOOD_WASTAGE_REPLICA", "1") != "0"
+# Default: next to the database, e.g. food_wastage.replica.db for food_wastage.db
+REPLICA_PATH = os.environ.get("FOOD_WASTAGE_REPLICA_PATH")
+REFRESH_INTERVAL = float(os.environ.get("FOOD_WASTAGE_REPLICA_INTERVAL", "30"))  # seconds
+REFRESH_WRITES = int(os.environ.get("FOOD_WASTAGE_REPLICA_WRITES", "500"))  # row changes
+POLL_INTERVAL = 1.0  # seconds
+
+# -------------------------------
+# Read Replica
+# -------------------------------
+# Dashboard and analytics reads go to a copy of the database, refreshed from
+# the primary with the SQLite online backup API; CRUD stays on the primary.
+# Long analytics scans then never hold a read snapshot on the primary, so
+# its WAL can always be checkpointed and reset, and they don't compete with
+# the writers for the primary's pages in the page cache.
+#
+# The replica is in WAL mode too, so a refresh doesn't wait for readers:
+# queries that are running keep reading the copy they started on and the
+# next query sees the new one. Each refresh copies the primary as of one
+# read transaction.
+#
+# A background thread makes the first copy as soon as it starts, so opening
+# the replica never waits for a whole-database copy; until that copy is done
+# ready() is False and readers stay on the primary. After that it refreshes
+# the replica once REFRESH_WRITES rows have changed on the primary since the
+# last copy, or REFRESH_INTERVAL seconds after the last copy if anything
+# changed at all. Changes are counted from the primary's Table_Versions
+# counters, so writes from every process count.
+def replica_path(pool=None):
+    db_name = (pool or get_pool()).db_name
+    return REPLICA_PATH or os.path.splitext(os.path.abspath(db_name))[0] + ".replica.db"
+
+def write_count(pool=None):
+    with (pool or get_pool()).connection() as conn:
+        return conn.execute("SELECT COALESCE(SUM(Version), 0) FROM Table_Versions").fetchone()[0]
+
+class Replica:
+    def __init__(self, primary=None, path=None, interval=REFRESH_INTERVAL, writes=REFRESH_WRITES):
+        self.primary = primary or get_pool()
+        self.path = path or replica_path(self.primary)
+        self.interval = interval
+        self.writes = writes
+        self.refreshed_at = None
+        self.copied_writes = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        # Opens no connection until the first read
+        self.pool = ConnectionPool(self.path, size=self.primary.size, read_only=True)
+
+    # Copies the primary into the replica and returns how long it took
+    def refresh(self):
+        with self._lock:
+            start = time.perf_counter()
+            source = sqlite3.connect(self.primary.db_name, timeout=BUSY_TIMEOUT_MS / 1000)
+            target = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+            try:
+                target.execute("PRAGMA journal_mode=WAL")
+                source.execute("BEGIN")
+                copied = source.execute("SELECT COALESCE(SUM(Version), 0) FROM Table_Versions").fetchone()[0]
+                source.backup(target)
+                source.commit()
+                # The copy takes the primary's journal mode; readers must not block the next refresh
+                target.execute("PRAGMA journal_mode=WAL")
+            finally:
+                source.close()
+                target.close()
+            self.refreshed_at = time.time()
+            self.copied_writes = copied
+            self._ready.set()
+            return time.perf_counter() - start
+
+    # True once the first copy is done
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        self._ready.wait(timeout)
+        return self
+
+    # How far the replica is behind: seconds since the last copy and rows
+    # changed on the primary since then (None before the first copy)
+    def staleness(self):
+        if not self.ready():
+            return None
+        return {"age_s": time.time() - self.refreshed_at,
+                "writes_behind": write_count(self.primary) - self.copied_writes}
+
+    def due(self):
+        behind = write_count(self.primary) - self.copied_writes
+        return behind >= self.writes or (behind > 0 and time.time() - self.refreshed_at >= self.interval)
+
+    # Makes the first copy, then checks every POLL_INTERVAL seconds whether a
+    # refresh is due, until stop() is called. A copy that finds the database
+    # locked is retried on the next check.
+    def start(self):
+        def loop():
+            while True:
+                try:
+                    if not self.ready() or self.due():
+                        self.refresh()
+                except sqlite3.OperationalError:
+                    pass
+                if self._stop.wait(POLL_INTERVAL):
+                    break
+
+        threading.Thread(target=loop, name="replica-refresh", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self.stop()
+        self.pool.close()
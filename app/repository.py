@@ -0,0 +1,190 @@
+import json
+import time
+from functools import lru_cache
+
+from app.db import get_pool, transaction
+
+# -------------------------------
+# Records
+# -------------------------------
+# One class per table. The attributes are the table's columns (in schema
+# order) and are held in __slots__, so a record is a small fixed-layout
+# object rather than a dict or a DataFrame row. Columns listed in MANAGED are
+# read but never written: the app keeps them up (expiry sweeper, rollup and
+# city triggers).
+class Record:
+    __slots__ = ()
+    TABLE = None
+    KEY = None
+    MANAGED = ()
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.__slots__)} values")
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name in self.__slots__[len(args):]:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(f"{type(self).__name__} has no column(s) {', '.join(kwargs)}")
+
+    @classmethod
+    def writable(cls):
+        return tuple(c for c in cls.__slots__ if c not in cls.MANAGED)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def values(self, columns):
+        return tuple(getattr(self, c) for c in columns)
+
+    def as_dict(self):
+        return {c: getattr(self, c) for c in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.values(self.__slots__) == other.values(other.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{c}={getattr(self, c)!r}" for c in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Provider(Record):
+    __slots__ = ("Provider_ID", "Name", "Type", "Address", "City", "Contact", "City_ID")
+    TABLE, KEY = "Providers", "Provider_ID"
+    MANAGED = ("City_ID",)
+
+
+class Receiver(Record):
+    __slots__ = ("Receiver_ID", "Name", "Type", "City", "Contact", "City_ID")
+    TABLE, KEY = "Receivers", "Receiver_ID"
+    MANAGED = ("City_ID",)
+
+
+class FoodListing(Record):
+    __slots__ = ("Food_ID", "Food_Name", "Quantity", "Expiry_Date", "Provider_ID", "Provider_Type",
+                 "Location", "Food_Type", "Meal_Type", "Expired", "Listed_At", "City_ID")
+    TABLE, KEY = "Food_Listings", "Food_ID"
+    MANAGED = ("Expired", "Listed_At", "City_ID")
+
+
+class Claim(Record):
+    __slots__ = ("Claim_ID", "Food_ID", "Receiver_ID", "Status", "Timestamp")
+    TABLE, KEY = "Claims", "Claim_ID"
+
+
+RECORDS = {cls.TABLE: cls for cls in (Provider, Receiver, FoodListing, Claim)}
+
+def utc_now():
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+# -------------------------------
+# Statements
+# -------------------------------
+# Built once per (record type, columns) and reused as the identical string,
+# so every pooled connection prepares each statement once and then serves it
+# from its statement cache (cached_statements in app/db.py).
+@lru_cache(maxsize=None)
+def insert_sql(cls):
+    columns = cls.writable()
+    return (f'INSERT INTO "{cls.TABLE}" ({", ".join(columns)}) '
+            f'VALUES ({", ".join("?" for _ in columns)})')
+
+@lru_cache(maxsize=None)
+def update_sql(cls, columns):
+    assignments = ", ".join(f"{c} = ?" for c in columns)
+    return f'UPDATE "{cls.TABLE}" SET {assignments} WHERE {cls.KEY} = ?'
+
+@lru_cache(maxsize=None)
+def delete_sql(cls):
+    return f'DELETE FROM "{cls.TABLE}" WHERE {cls.KEY} = ?'
+
+@lru_cache(maxsize=None)
+def select_sql(cls, many=False):
+    columns = ", ".join(f"t.{c}" for c in cls.__slots__)
+    if many:
+        return f'SELECT {columns} FROM json_each(?) j JOIN "{cls.TABLE}" t ON t.{cls.KEY} = j.value'
+    return f'SELECT {columns} FROM "{cls.TABLE}" t WHERE t.{cls.KEY} = ?'
+
+def _update_columns(cls, columns):
+    columns = tuple(columns) if columns else tuple(c for c in cls.writable() if c != cls.KEY)
+    unknown = [c for c in columns if c not in cls.writable() or c == cls.KEY]
+    if unknown:
+        raise ValueError(f"Cannot update {cls.TABLE} column(s): {', '.join(unknown)}")
+    return columns
+
+# New claims without a timestamp are stamped with the time of the insert
+def _insert_row(record):
+    if isinstance(record, Claim) and record.Timestamp is None:
+        record.Timestamp = utc_now()
+    return record.values(record.writable())
+
+# -------------------------------
+# Reads
+# -------------------------------
+def get(cls, key, pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        row = conn.execute(select_sql(cls), (key,)).fetchone()
+    return cls.from_row(row) if row else None
+
+# Records for the keys that exist, in key order
+def get_many(cls, keys, pool=None):
+    pool = pool or get_pool()
+    ids = sorted({int(k) for k in keys})
+    with pool.connection() as conn:
+        rows = conn.execute(select_sql(cls, many=True), (json.dumps(ids),)).fetchall()
+    return sorted((cls.from_row(r) for r in rows), key=lambda r: getattr(r, cls.KEY))
+
+# -------------------------------
+# Writes
+# -------------------------------
+# A record whose key is None gets the next free ID. Returns the row's ID.
+def insert(record, pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            cur = conn.execute(insert_sql(type(record)), _insert_row(record))
+    return cur.lastrowid
+
+# Inserts every record with one executemany in a single transaction.
+# All records must be of one type. Returns the number of rows inserted.
+def insert_many(records, pool=None):
+    records = list(records)
+    if not records:
+        return 0
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            conn.executemany(insert_sql(type(records[0])), [_insert_row(r) for r in records])
+    return len(records)
+
+# Writes `columns` of the record (by default every writable column) to the
+# row with the record's key. Returns True when that row exists.
+def update(record, columns=None, pool=None):
+    return update_many([record], columns, pool=pool) == 1
+
+def update_many(records, columns=None, pool=None):
+    records = list(records)
+    if not records:
+        return 0
+    cls = type(records[0])
+    columns = _update_columns(cls, columns)
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            cur = conn.executemany(update_sql(cls, columns),
+                                   [r.values(columns) + (getattr(r, cls.KEY),) for r in records])
+    return cur.rowcount
+
+def delete(cls, key, pool=None):
+    return delete_many(cls, [key], pool=pool) == 1
+
+# Returns the number of rows deleted
+def delete_many(cls, keys, pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        with transaction(conn, immediate=True):
+            cur = conn.executemany(delete_sql(cls), [(k,) for k in keys])
+    return cur.rowcount
@@ -0,0 +1,268 @@
+import pandas as pd
+
+from app.db import read_sql, triggers_changed
+
+# -------------------------------
+# Time Rollups
+# -------------------------------
+# Time_Rollups keeps one row per (metric, grain, bucket, city, food type,
+# status) with the number of rows in it and their Quantity. Triggers update
+# it on every listing and claim write, so a trend chart reads one PK range
+# of buckets instead of parsing and grouping the base tables.
+#
+# Listings are bucketed by Listed_At, claims by Timestamp; a claim takes its
+# city and food type from its listing. The city is the listing's integer
+# City_ID (app/cities.py), 0 when it has none. Both are UTC, like every
+# time the app stores, so buckets are UTC hours, days and weeks.
+GRAINS = {
+    "hour": "strftime('%Y-%m-%d %H:00:00', {ts})",
+    "day": "date({ts})",
+    "week": "date({ts}, 'weekday 0', '-6 days')",  # Monday of the week
+}
+
+# Charts switch to a coarser grain beyond this many buckets
+MAX_BUCKETS = 500
+
+ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS Time_Rollups (
+    Metric TEXT NOT NULL,
+    Grain TEXT NOT NULL,
+    Bucket TEXT NOT NULL,
+    City_ID INTEGER NOT NULL DEFAULT 0,
+    Food_Type TEXT NOT NULL DEFAULT '',
+    Status TEXT NOT NULL DEFAULT '',
+    Row_Count INTEGER NOT NULL DEFAULT 0,
+    Quantity INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (Metric, Grain, Bucket, City_ID, Food_Type, Status)
+) WITHOUT ROWID
+"""
+
+# Listings from before Listed_At existed (or loaded with the rollup triggers
+# suspended) have none. They get the time of their first claim, or the start
+# of their expiry day if that is earlier, and the load time if they have
+# neither. The partial index keeps finding them cheap once there are none.
+UNLISTED_INDEX = "CREATE INDEX IF NOT EXISTS idx_food_listings_unlisted ON Food_Listings(Food_ID) WHERE Listed_At IS NULL"
+
+BACKFILL_LISTED_AT = """
+UPDATE Food_Listings SET Listed_At = COALESCE(
+    MIN((SELECT MIN(c.Timestamp) FROM Claims c WHERE c.Food_ID = Food_Listings.Food_ID), datetime(Expiry_Date)),
+    (SELECT MIN(c.Timestamp) FROM Claims c WHERE c.Food_ID = Food_Listings.Food_ID),
+    datetime(Expiry_Date),
+    datetime('now'))
+WHERE Listed_At IS NULL
+"""
+
+ISO_TIMESTAMP_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*"
+
+# Claims.Timestamp as 'YYYY-MM-DD HH:MM:SS'; the feeds use 'M/D/YYYY H:MM'
+def iso_timestamp(expr):
+    rest = f"substr({expr}, instr({expr}, '/') + 1)"
+    clock = f"substr({expr}, instr({expr}, ' ') + 1)"
+    hour = f"CASE WHEN instr({expr}, ' ') THEN CAST({clock} AS INTEGER) ELSE 0 END"
+    minute = f"CASE WHEN instr({expr}, ' ') THEN CAST(substr({clock}, instr({clock}, ':') + 1) AS INTEGER) ELSE 0 END"
+    return (
+        f"CASE WHEN {expr} GLOB '{ISO_TIMESTAMP_GLOB}' THEN {expr} "
+        f"WHEN {expr} LIKE '%/%/%' THEN printf('%04d-%02d-%02d %02d:%02d:00', "
+        f"CAST(substr({rest}, instr({rest}, '/') + 1, 4) AS INTEGER), CAST({expr} AS INTEGER), "
+        f"CAST({rest} AS INTEGER), {hour}, {minute}) "
+        f"ELSE {expr} END"
+    )
+
+# -------------------------------
+# Trigger Generation
+# -------------------------------
+# One source per metric: the base table, the timestamp column and SQL for
+# each dimension given the row alias (NEW / OLD / a table alias).
+def _listing_dims(row):
+    return {"ts": f"{row}.Listed_At", "city": f"IFNULL({row}.City_ID, 0)",
+            "food_type": f"IFNULL({row}.Food_Type, '')", "status": "''", "qty": f"IFNULL({row}.Quantity, 0)"}
+
+def _claim_dims(row, listing=None):
+    lookup = "(SELECT f.{col} FROM Food_Listings f WHERE f.Food_ID = " + f"{row}.Food_ID)"
+    return {"ts": f"{row}.Timestamp",
+            "city": listing["city"] if listing else f"IFNULL({lookup.format(col='City_ID')}, 0)",
+            "food_type": listing["food_type"] if listing else f"IFNULL({lookup.format(col='Food_Type')}, '')",
+            "status": f"IFNULL({row}.Status, '')", "qty": "0"}
+
+# Adds (sign "+") or removes (sign "-") rows in every grain. Without a
+# source the dims describe the single NEW/OLD row; with one (a FROM clause
+# and its condition) the matching rows are grouped per bucket and status.
+def _add(metric, dims, sign="+", source="", where=""):
+    statements = []
+    for grain, bucket in GRAINS.items():
+        bucket = bucket.format(ts=dims["ts"])
+        condition = f"{bucket} IS NOT NULL" + (f" AND {where}" if where else "")
+        key = f"Metric = '{metric}' AND Grain = '{grain}' AND City_ID = {dims['city']} AND Food_Type = {dims['food_type']}"
+        if sign == "+":
+            count, qty, group = ("COUNT(*)", f"SUM({dims['qty']})", " GROUP BY 3, 6") if source else ("1", dims["qty"], "")
+            statements.append(
+                f"INSERT INTO Time_Rollups (Metric, Grain, Bucket, City_ID, Food_Type, Status, Row_Count, Quantity) "
+                f"SELECT '{metric}', '{grain}', {bucket}, {dims['city']}, {dims['food_type']}, {dims['status']}, "
+                f"{count}, {qty} {source} WHERE {condition}{group} "
+                f"ON CONFLICT (Metric, Grain, Bucket, City_ID, Food_Type, Status) DO UPDATE SET "
+                f"Row_Count = Row_Count + excluded.Row_Count, Quantity = Quantity + excluded.Quantity;")
+        elif source:
+            statements.append(
+                f"UPDATE Time_Rollups SET Row_Count = Row_Count - r.n, Quantity = Quantity - r.q "
+                f"FROM (SELECT {bucket} AS b, {dims['status']} AS s, COUNT(*) AS n, SUM({dims['qty']}) AS q "
+                f"{source} WHERE {condition} GROUP BY 1, 2) r "
+                f"WHERE {key} AND Bucket = r.b AND Status = r.s;")
+        else:
+            statements.append(
+                f"UPDATE Time_Rollups SET Row_Count = Row_Count - 1, Quantity = Quantity - {dims['qty']} "
+                f"WHERE {key} AND Bucket = {bucket} AND Status = {dims['status']};")
+    return "\n    ".join(statements)
+
+def trigger_statements():
+    new_listing, old_listing = _listing_dims("NEW"), _listing_dims("OLD")
+    new_claim, old_claim = _claim_dims("NEW"), _claim_dims("OLD")
+    # A listing's claims move to its new city / food type when those change
+    claims_of = ("FROM Claims c", "c.Food_ID = NEW.Food_ID")
+    moved_old = _claim_dims("c", listing=old_listing)
+    moved_new = _claim_dims("c", listing=new_listing)
+    orphans = ("FROM Claims c", "c.Food_ID = OLD.Food_ID")
+    unknown = {"city": "0", "food_type": "''"}
+    return [
+        # Listed_At defaults to the time the listing was inserted
+        "CREATE TRIGGER IF NOT EXISTS trg_rollup_food_listings_listed_at AFTER INSERT ON Food_Listings\n"
+        "WHEN NEW.Listed_At IS NULL\n"
+        "BEGIN UPDATE Food_Listings SET Listed_At = datetime('now') WHERE Food_ID = NEW.Food_ID; END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_food_listings_insert AFTER INSERT ON Food_Listings\n"
+        f"BEGIN\n    {_add('listings', new_listing)}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_food_listings_delete AFTER DELETE ON Food_Listings\n"
+        f"BEGIN\n    {_add('listings', old_listing, '-')}\nEND",
+        # Claims of a deleted listing no longer have a city or food type. They
+        # are moved before the delete: with foreign keys on, the cascade
+        # deletes them before an AFTER DELETE trigger could see them.
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_food_listings_orphan_claims BEFORE DELETE ON Food_Listings\n"
+        f"BEGIN\n    {_add('claims', _claim_dims('c', listing=old_listing), '-', *orphans)}\n"
+        f"    {_add('claims', _claim_dims('c', listing=unknown), '+', *orphans)}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_food_listings_update "
+        f"AFTER UPDATE OF Listed_At, City_ID, Food_Type, Quantity ON Food_Listings\n"
+        f"BEGIN\n    {_add('listings', old_listing, '-')}\n    {_add('listings', new_listing)}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_food_listings_move_claims AFTER UPDATE OF City_ID, Food_Type ON Food_Listings\n"
+        f"WHEN NEW.City_ID IS NOT OLD.City_ID OR NEW.Food_Type IS NOT OLD.Food_Type\n"
+        f"BEGIN\n    {_add('claims', moved_old, '-', *claims_of)}\n"
+        f"    {_add('claims', moved_new, '+', *claims_of)}\nEND",
+        # Feed-style timestamps are rewritten as ISO (which re-buckets the claim)
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_claims_timestamp AFTER INSERT ON Claims\n"
+        f"WHEN NEW.Timestamp NOT GLOB '{ISO_TIMESTAMP_GLOB}'\n"
+        f"BEGIN UPDATE Claims SET Timestamp = {iso_timestamp('NEW.Timestamp')} WHERE Claim_ID = NEW.Claim_ID; END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_claims_insert AFTER INSERT ON Claims\n"
+        f"BEGIN\n    {_add('claims', new_claim)}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_claims_delete AFTER DELETE ON Claims\n"
+        f"BEGIN\n    {_add('claims', old_claim, '-')}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_claims_update AFTER UPDATE OF Timestamp, Status, Food_ID ON Claims\n"
+        f"BEGIN\n    {_add('claims', old_claim, '-')}\n    {_add('claims', new_claim)}\nEND",
+    ]
+
+# -------------------------------
+# Install / Rebuild
+# -------------------------------
+def recompute_sql():
+    selects = []
+    for grain, bucket in GRAINS.items():
+        listing = bucket.format(ts="f.Listed_At")
+        claim = bucket.format(ts="c.Timestamp")
+        selects.append(
+            f"SELECT 'listings', '{grain}', {listing}, IFNULL(f.City_ID, 0), IFNULL(f.Food_Type, ''), '', "
+            f"COUNT(*), SUM(IFNULL(f.Quantity, 0)) FROM Food_Listings f WHERE {listing} IS NOT NULL GROUP BY 3, 4, 5")
+        selects.append(
+            f"SELECT 'claims', '{grain}', {claim}, IFNULL(f.City_ID, 0), IFNULL(f.Food_Type, ''), "
+            f"IFNULL(c.Status, ''), COUNT(*), 0 FROM Claims c LEFT JOIN Food_Listings f ON f.Food_ID = c.Food_ID "
+            f"WHERE {claim} IS NOT NULL GROUP BY 3, 4, 5, 6")
+    return " UNION ALL ".join(selects)
+
+def drop_triggers(conn):
+    names = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_rollup_%'")]
+    for name in names:
+        conn.execute(f'DROP TRIGGER "{name}"')
+
+def rebuild(conn):
+    conn.execute("DELETE FROM Time_Rollups")
+    conn.execute(
+        "INSERT INTO Time_Rollups (Metric, Grain, Bucket, City_ID, Food_Type, Status, Row_Count, Quantity) "
+        + recompute_sql())
+
+def install(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(Food_Listings)")]
+    if "Listed_At" not in columns:
+        conn.execute("ALTER TABLE Food_Listings ADD COLUMN Listed_At TEXT")
+
+    # Rollups from before the city dimension was keyed on City_ID are rebuilt
+    rollup_columns = [row[1] for row in conn.execute("PRAGMA table_info(Time_Rollups)")]
+    if "City" in rollup_columns or triggers_changed(conn, "trg_rollup_", trigger_statements()):
+        drop_triggers(conn)
+        conn.execute("DROP TABLE IF EXISTS Time_Rollups")
+
+    created = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='Time_Rollups'").fetchone() is None
+    conn.execute(ROLLUP_DDL)
+    for statement in trigger_statements():
+        conn.execute(statement)
+    if created:
+        conn.execute(f"UPDATE Claims SET Timestamp = {iso_timestamp('Timestamp')} "
+                     f"WHERE Timestamp NOT GLOB '{ISO_TIMESTAMP_GLOB}'")
+    conn.execute(UNLISTED_INDEX)
+    conn.execute(BACKFILL_LISTED_AT)
+    if created:
+        rebuild(conn)
+
+# Rollup rows that disagree with a full recomputation (empty when in sync)
+def check(conn):
+    stored = pd.read_sql_query(
+        "SELECT * FROM Time_Rollups WHERE Row_Count != 0 OR Quantity != 0", conn)
+    expected = pd.read_sql_query(recompute_sql(), conn)
+    expected.columns = stored.columns
+    keys = ["Metric", "Grain", "Bucket", "City_ID", "Food_Type", "Status"]
+    merged = stored.merge(expected, on=keys, how="outer", suffixes=("_stored", "_expected"))
+    return merged[(merged["Row_Count_stored"] != merged["Row_Count_expected"])
+                  | (merged["Quantity_stored"] != merged["Quantity_expected"])]
+
+# -------------------------------
+# Reads
+# -------------------------------
+# First and last day with any rows, for one metric or for all of them
+def bucket_range(metric=None, pool=None):
+    sql = "SELECT MIN(Bucket) AS First, MAX(Bucket) AS Last FROM Time_Rollups WHERE Grain = 'day' AND Row_Count > 0"
+    params = ()
+    if metric:
+        sql += " AND Metric = ?"
+        params = (metric,)
+    first, last = read_sql(sql, params, pool=pool).iloc[0]
+    return (None, None) if first is None else (pd.Timestamp(first).date(), pd.Timestamp(last).date())
+
+# The requested grain, or a coarser one if it would draw more than
+# MAX_BUCKETS points between start and end
+def effective_grain(start, end, grain=None):
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    finest = "hour" if days * 24 <= MAX_BUCKETS else "day" if days <= MAX_BUCKETS else "week"
+    order = list(GRAINS)
+    return order[max(order.index(grain or "hour"), order.index(finest))]
+
+# Row counts and quantities per bucket between two dates (inclusive), read
+# from one Time_Rollups key range. by="Status" / "City" / "Food_Type" splits
+# the series. The city is looked up in Cities, so it matches any spelling.
+def series(metric, start, end, grain=None, city=None, food_type=None, by=None, pool=None):
+    grain = effective_grain(start, end, grain)
+    clauses = ["Metric = ?", "Grain = ?", f"Bucket >= {GRAINS[grain].format(ts='?')}", "Bucket < date(?, '+1 day')"]
+    params = [metric, grain, str(start), str(end)]
+    if city:
+        clauses.append("City_ID = (SELECT City_ID FROM Cities WHERE Name = NULLIF(trim(?), ''))")
+        params.append(city)
+    if food_type:
+        clauses.append("Food_Type = ?")
+        params.append(food_type)
+
+    group = ""
+    if by == "City":
+        group = ", IFNULL((SELECT c.Name FROM Cities c WHERE c.City_ID = r.City_ID), '') AS City"
+    elif by:
+        group = f", {by}"
+    sql = (f"SELECT Bucket{group}, SUM(Row_Count) AS Count, SUM(Quantity) AS Quantity FROM Time_Rollups r "
+           f"WHERE {' AND '.join(clauses)} GROUP BY Bucket{', r.City_ID' if by == 'City' else group} "
+           f"HAVING SUM(Row_Count) > 0 ORDER BY Bucket")
+    df = read_sql(sql, tuple(params), pool=pool)
+    df["Bucket"] = pd.to_datetime(df["Bucket"])
+    return df
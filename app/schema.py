@@ -0,0 +1,92 @@
+import os
+import sqlite3
+
+from app import cities, expiry, geo, rollups, search, summary
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql")
+SCHEMA_PATH = os.path.join(SQL_DIR, "schema.sql")
+SEARCH_SCHEMA_PATH = os.path.join(SQL_DIR, "search.sql")
+
+# Parent tables first, so foreign keys always point at rows that exist
+TABLES = ["Providers", "Receivers", "Food_Listings", "Claims"]
+
+# -------------------------------
+# Schema Helpers
+# -------------------------------
+# Connection-level PRAGMAs (foreign_keys among them) are set where the
+# connection is opened, see app/db.py; only DDL is returned.
+def schema_statements(path=SCHEMA_PATH):
+    with open(path, "r") as f:
+        script = f.read()
+
+    statements, buffer = [], ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            if not statement.upper().startswith("PRAGMA"):
+                statements.append(statement)
+            buffer = ""
+    return statements
+
+def table_exists(conn, table):
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+    return row is not None
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+def has_primary_key(conn, table):
+    return any(row[5] for row in conn.execute(f'PRAGMA table_info("{table}")'))
+
+# -------------------------------
+# Migration
+# -------------------------------
+# Databases built with DataFrame.to_sql(if_exists="replace") have the right
+# columns but no keys or indexes. Rebuild those tables from schema.sql and
+# copy the rows across; rows without an ID get a fresh one from SQLite.
+# Foreign keys are off while the tables are swapped and back on afterwards,
+# so rows are copied as they are; PRAGMA foreign_key_check lists any that
+# point at missing parents.
+def migrate_legacy_tables(conn):
+    legacy = [t for t in TABLES if table_exists(conn, t) and not has_primary_key(conn, t)]
+    if not legacy:
+        return []
+
+    if conn.in_transaction:
+        conn.commit()
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys=OFF")
+    conn.execute("PRAGMA legacy_alter_table=ON")
+    try:
+        conn.execute("BEGIN")
+        for table in legacy:
+            conn.execute(f'ALTER TABLE "{table}" RENAME TO "{table}_legacy"')
+        for statement in schema_statements():
+            conn.execute(statement)
+        for table in legacy:
+            new_cols = set(table_columns(conn, table))
+            cols = ", ".join(f'"{c}"' for c in table_columns(conn, f"{table}_legacy") if c in new_cols)
+            conn.execute(f'INSERT INTO "{table}" ({cols}) SELECT {cols} FROM "{table}_legacy"')
+            conn.execute(f'DROP TABLE "{table}_legacy"')
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA legacy_alter_table=OFF")
+        conn.execute(f"PRAGMA foreign_keys={foreign_keys}")
+    return legacy
+
+def apply_schema(conn):
+    migrated = migrate_legacy_tables(conn)
+    for statement in schema_statements():
+        conn.execute(statement)
+    cities.install(conn)
+    expiry.install(conn)
+    summary.install(conn)
+    rollups.install(conn)
+    geo.install(conn)
+    search.install(conn, schema_statements(SEARCH_SCHEMA_PATH))
+    conn.commit()
+    return migrated
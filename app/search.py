@@ -0,0 +1,166 @@
+import re
+import sqlite3
+
+from app.db import fetch_all, get_pool
+
+DEFAULT_LIMIT = 20
+
+# Expiry_Date is stored as YYYY-MM-DD (see app/expiry.py), so open listings
+# are one range of idx_food_listings_expiry
+OPEN_LISTING = "f.Expired = 0 AND f.Expiry_Date >= date('now') AND f.Quantity > 0"
+
+# -------------------------------
+# Install / Rebuild
+# -------------------------------
+# FTS5 is compiled into the standard SQLite builds, but not all of them; without
+# it the pickers fall back to LIKE prefix matching on the base tables.
+def fts_available(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='Receivers_FTS'").fetchone() is not None
+
+def install(conn, statements):
+    created = not fts_available(conn)
+    try:
+        for statement in statements:
+            conn.execute(statement)
+    except sqlite3.OperationalError as exc:
+        if "fts5" not in str(exc):
+            raise
+        return False
+    if created:
+        rebuild(conn)
+    return True
+
+def rebuild(conn):
+    if fts_available(conn):
+        conn.execute("INSERT INTO Receivers_FTS (Receivers_FTS) VALUES ('rebuild')")
+        conn.execute("INSERT INTO Food_Listings_FTS (Food_Listings_FTS) VALUES ('rebuild')")
+
+# -------------------------------
+# Query Helpers
+# -------------------------------
+# "gre ngo" -> '"gre"* AND "ngo"*': every typed word must match a token prefix
+def prefix_query(term):
+    words = re.findall(r"\w+", term or "")
+    return " AND ".join(f'"{w}"*' for w in words)
+
+def like_prefix(term):
+    return (term or "").strip().replace("%", "").replace("_", "") + "%"
+
+def _use_fts(pool):
+    with (pool or get_pool()).connection() as conn:
+        return fts_available(conn)
+
+# -------------------------------
+# Receivers
+# -------------------------------
+# Returns [(Receiver_ID, label)] for the best `limit` matches. Labels carry the
+# ID, so two receivers with the same name and city stay distinct.
+def search_receivers(term, limit=DEFAULT_LIMIT, pool=None):
+    query = prefix_query(term)
+    if not query:
+        sql, params = "SELECT r.Receiver_ID, r.Name, r.City FROM Receivers r ORDER BY r.Receiver_ID LIMIT ?", (limit,)
+    elif _use_fts(pool):
+        sql = """
+            SELECT r.Receiver_ID, r.Name, r.City
+            FROM Receivers_FTS s
+            JOIN Receivers r ON r.Receiver_ID = s.rowid
+            WHERE Receivers_FTS MATCH ?
+            ORDER BY s.rank
+            LIMIT ?
+        """
+        params = (query, limit)
+    else:
+        sql = """
+            SELECT r.Receiver_ID, r.Name, r.City FROM Receivers r
+            WHERE r.Name LIKE ? OR r.City LIKE ?
+            ORDER BY r.Name LIMIT ?
+        """
+        params = (like_prefix(term), like_prefix(term), limit)
+
+    return [(rid, f"{name} ({city}) · #{rid}") for rid, name, city in fetch_all(sql, params, pool=pool)]
+
+# -------------------------------
+# Food Listings
+# -------------------------------
+# Only listings with stock left and an expiry date of today or later are
+# offered. Without a search term the soonest-expiring listings come first.
+def search_food(term, limit=DEFAULT_LIMIT, pool=None):
+    columns = f"f.Food_ID, f.Food_Name, f.Food_Type, f.Location, f.Quantity, f.Expiry_Date AS Expiry"
+    query = prefix_query(term)
+    if not query:
+        sql = f"SELECT {columns} FROM Food_Listings f WHERE {OPEN_LISTING} ORDER BY Expiry, f.Food_ID LIMIT ?"
+        params = (limit,)
+    elif _use_fts(pool):
+        sql = f"""
+            SELECT {columns}
+            FROM Food_Listings_FTS s
+            JOIN Food_Listings f ON f.Food_ID = s.rowid
+            WHERE Food_Listings_FTS MATCH ? AND {OPEN_LISTING}
+            ORDER BY s.rank
+            LIMIT ?
+        """
+        params = (query, limit)
+    else:
+        sql = f"""
+            SELECT {columns} FROM Food_Listings f
+            WHERE (f.Food_Name LIKE ? OR f.Food_Type LIKE ? OR f.Location LIKE ?) AND {OPEN_LISTING}
+            ORDER BY Expiry LIMIT ?
+        """
+        params = (like_prefix(term),) * 3 + (limit,)
+
+    return [
+        (fid, f"{name} – {ftype} @ {location} (Available: {qty}, expires {expiry}) · #{fid}")
+        for fid, name, ftype, location, qty, expiry in fetch_all(sql, params, pool=pool)
+    ]
+
+# Listings matching exact filters, one keyset page at a time, for the JSON
+# API (api.py). Open listings come soonest-expiring first, walking
+# idx_food_listings_expiry in order; with open_only=False every listing is
+# returned in Food_ID order. `location` is matched through the interned
+# City_ID (app/cities.py), so it is case-insensitive and uses
+# idx_food_listings_city_id. Expiry bounds are YYYY-MM-DD strings.
+# Returns (rows as dicts, cursor for the next page or None); the cursor is
+# (Expiry_Date, Food_ID) for open listings and Food_ID otherwise.
+LISTING_COLUMNS = ["Food_ID", "Food_Name", "Quantity", "Expiry_Date", "Provider_ID", "Provider_Type",
+                   "Location", "Food_Type", "Meal_Type"]
+
+def find_listings(location=None, food_type=None, meal_type=None, expires_from=None, expires_to=None,
+                  open_only=True, after=None, limit=DEFAULT_LIMIT, pool=None):
+    clauses, params = [], []
+    if location:
+        clauses.append("f.City_ID = (SELECT City_ID FROM Cities WHERE Name = ?)")
+        params.append(location.strip())
+    for column, value in (("Food_Type", food_type), ("Meal_Type", meal_type)):
+        if value:
+            clauses.append(f"f.{column} = ?")
+            params.append(value)
+    if expires_from:
+        clauses.append("f.Expiry_Date >= ?")
+        params.append(expires_from)
+    if expires_to:
+        clauses.append("f.Expiry_Date <= ?")
+        params.append(expires_to)
+    if open_only:
+        clauses.append(OPEN_LISTING)
+        order = "f.Expiry_Date, f.Food_ID"
+        if after is not None:
+            clauses.append("(f.Expiry_Date, f.Food_ID) > (?, ?)")
+            params += [after[0], int(after[1])]
+    else:
+        order = "f.Food_ID"
+        if after is not None:
+            clauses.append("f.Food_ID > ?")
+            params.append(int(after))
+
+    sql = f"SELECT {', '.join('f.' + c for c in LISTING_COLUMNS)} FROM Food_Listings f"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {order} LIMIT ?"
+    rows = [dict(zip(LISTING_COLUMNS, row)) for row in fetch_all(sql, (*params, int(limit) + 1), pool=pool)]
+
+    next_after = None
+    if len(rows) > limit:
+        rows, last = rows[:limit], rows[limit - 1]
+        next_after = (last["Expiry_Date"], last["Food_ID"]) if open_only else last["Food_ID"]
+    return rows, next_after
@@ -0,0 +1,158 @@
+import os
+import threading
+
+from app import writes
+from app.cache import versioned_cache
+from app.db import fetch_all, get_pool, read_sql, transaction
+
+try:
+    import pyarrow as pa
+except ImportError:  # snapshots are optional; without pyarrow every read goes to SQLite
+    pa = None
+
+ENABLED = pa is not None and os.environ.get("FOOD_WASTAGE_SNAPSHOT", "1") != "0"
+# Default: next to the database, e.g. food_wastage.snapshot/ for food_wastage.db
+SNAPSHOT_DIR = os.environ.get("FOOD_WASTAGE_SNAPSHOT_DIR")
+
+EXPORT_BATCH_ROWS = 50_000
+VERSION_KEY = b"table_version"
+
+# -------------------------------
+# Columnar Snapshots
+# -------------------------------
+# Each table is exported to one Arrow IPC (Feather v2) file, stamped with the
+# table's Table_Versions counter. Readers memory-map the file instead of
+# querying SQLite: the columns are used in place, so every Streamlit worker
+# process on the machine shares the one copy in the OS page cache.
+#
+# A new export is written to a temporary file and moved over the old one with
+# os.replace, so a reader sees either the old or the new snapshot, never a
+# partial one. Readers that still have the old file mapped keep reading it
+# until they notice the new version.
+#
+# The version is the persistent Table_Versions counter rather than
+# PRAGMA data_version, which is only meaningful within one connection.
+def snapshot_dir(pool=None):
+    db_name = (pool or get_pool()).db_name
+    return SNAPSHOT_DIR or os.path.splitext(os.path.abspath(db_name))[0] + ".snapshot"
+
+def snapshot_path(table, pool=None):
+    return os.path.join(snapshot_dir(pool), f"{table}.arrow")
+
+def _arrow_type(declared):
+    declared = (declared or "").upper()
+    if "INT" in declared:
+        return pa.int64()
+    if any(t in declared for t in ("REAL", "FLOA", "DOUB")):
+        return pa.float64()
+    return pa.string()
+
+# SQLite doesn't enforce column types, so a numeric column holding a value
+# stored as anything else is exported as text. That is decided for the whole
+# table before the first batch, so the batches can be written as they are
+# read.
+def _types(conn, table, info):
+    types = [_arrow_type(row[2]) for row in info]
+    stored = {pa.int64(): "'integer'", pa.float64(): "'integer', 'real'"}
+    numeric = [i for i, t in enumerate(types) if t in stored]
+    if numeric:
+        checks = ", ".join(f"MAX(typeof({info[i][1]}) NOT IN ({stored[types[i]]}, 'null'))" for i in numeric)
+        mixed = conn.execute(f'SELECT {checks} FROM "{table}"').fetchone()
+        for i, is_mixed in zip(numeric, mixed):
+            if is_mixed:
+                types[i] = pa.string()
+    return types
+
+def _column(values, arrow_type):
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+def _batch(rows, schema):
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays([_column(list(c), t) for c, t in zip(columns, schema.types)], schema=schema)
+
+# Writes the table as of one read transaction and returns its version. Rows
+# are streamed into the file EXPORT_BATCH_ROWS at a time, so only one batch
+# is held in memory.
+def export(table, pool=None):
+    pool = pool or get_pool()
+    path = snapshot_path(table, pool)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with pool.connection() as conn:
+            with transaction(conn):
+                version = conn.execute(
+                    "SELECT Version FROM Table_Versions WHERE Table_Name = ?", (table,)).fetchone()[0]
+                info = conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+                names = [row[1] for row in info]
+                schema = pa.schema(list(zip(names, _types(conn, table, info))),
+                                   metadata={VERSION_KEY: str(version).encode()})
+                cursor = conn.execute(f'SELECT {", ".join(names)} FROM "{table}"')
+                with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                    while True:
+                        rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+                        if not rows:
+                            break
+                        writer.write_batch(_batch(rows, schema))
+                cursor.close()
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return version
+
+def _version(path):
+    with pa.memory_map(path) as source:
+        return int(pa.ipc.open_file(source).schema.metadata[VERSION_KEY])
+
+def _mapped(path):
+    reader = pa.ipc.open_file(pa.memory_map(path))
+    return int(reader.schema.metadata[VERSION_KEY]), reader.read_all()
+
+# The table's current snapshot, memory-mapped. Exported first when there is
+# none yet or its version isn't the table's, i.e. when the table was written
+# outside the write queue (imports, scripts, the expiry sweep, another
+# process); one process does the export and the others then map its file.
+# Cached per process until the table's version moves on.
+@versioned_cache(tables=lambda table: [table], max_entries=8)
+def mapped_table(table, pool=None):
+    current = fetch_all("SELECT Version FROM Table_Versions WHERE Table_Name = ?", (table,), pool=pool)[0][0]
+    path = snapshot_path(table, pool)
+    if os.path.exists(path):
+        version, data = _mapped(path)
+        if version == current:
+            return data
+    export(table, pool=pool)
+    return _mapped(path)[1]
+
+# Re-exports every snapshot that is behind its table. Run by the write queue
+# after each commit (app/writes.py), so the export happens on the writer
+# thread right after a write instead of in the next reader; tables that have
+# never been read have no snapshot and are left alone.
+def refresh(pool=None):
+    pool = pool or get_pool()
+    for table, version in fetch_all("SELECT Table_Name, Version FROM Table_Versions", pool=pool):
+        path = snapshot_path(table, pool)
+        if os.path.exists(path) and _version(path) != version:
+            export(table, pool=pool)
+
+if ENABLED:
+    writes.after_commit(refresh)
+
+# -------------------------------
+# Reads
+# -------------------------------
+# `columns` of the table as a DataFrame, from the snapshot when snapshots are
+# on and from SQLite otherwise. Numeric columns without nulls and text
+# columns are views of the mapped file rather than copies.
+def frame(table, columns=None, pool=None):
+    if not ENABLED:
+        select = ", ".join(columns) if columns else "*"
+        return read_sql(f'SELECT {select} FROM "{table}"', pool=pool)
+    data = mapped_table(table, pool=pool)
+    if columns:
+        data = data.select(list(columns))
+    return data.to_pandas(split_blocks=True)
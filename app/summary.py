@@ -0,0 +1,162 @@
+import pandas as pd
+
+from app.db import read_sql, triggers_changed
+
+# -------------------------------
+# Summary Metrics
+# -------------------------------
+# Each metric keeps one Summary_Counts row per group with the number of base
+# rows in it and (for listings) their total Quantity. Triggers generated from
+# this table keep the counts current on every insert, update and delete, so
+# dashboard reads cost O(groups) instead of O(rows).
+#
+# City metrics group on the integer City_ID (app/cities.py), so spellings of
+# one city are one group; rows without a city are the '' group.
+#
+# name: (table, group column, sub-group column or None, quantity column or None)
+METRICS = {
+    "providers_by_city": ("Providers", "City_ID", None, None),
+    "receivers_by_city": ("Receivers", "City_ID", None, None),
+    "listings_by_provider": ("Food_Listings", "Provider_ID", None, "Quantity"),
+    "listings_by_provider_type": ("Food_Listings", "Provider_Type", None, "Quantity"),
+    "listings_by_location": ("Food_Listings", "City_ID", None, "Quantity"),
+    "listings_by_food_type": ("Food_Listings", "Food_Type", None, "Quantity"),
+    "listings_by_meal_type": ("Food_Listings", "Meal_Type", None, "Quantity"),
+    "claims_by_status": ("Claims", "Status", None, None),
+    "claims_by_receiver_status": ("Claims", "Receiver_ID", "Status", None),
+    "claims_by_food_status": ("Claims", "Food_ID", "Status", None),
+}
+
+SUMMARY_DDL = """
+CREATE TABLE IF NOT EXISTS Summary_Counts (
+    Metric TEXT NOT NULL,
+    Grp NOT NULL,
+    Sub NOT NULL DEFAULT '',
+    Row_Count INTEGER NOT NULL DEFAULT 0,
+    Quantity INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (Metric, Grp, Sub)
+)
+"""
+
+def _expr(prefix, column):
+    return f"IFNULL({prefix}.{column}, '')" if column else "''"
+
+def _qty(prefix, column):
+    return f"IFNULL({prefix}.{column}, 0)" if column else "0"
+
+def _increment(metric, spec, prefix="NEW"):
+    _, grp, sub, qty = spec
+    return (
+        f"INSERT INTO Summary_Counts (Metric, Grp, Sub, Row_Count, Quantity) "
+        f"VALUES ('{metric}', {_expr(prefix, grp)}, {_expr(prefix, sub)}, 1, {_qty(prefix, qty)}) "
+        f"ON CONFLICT (Metric, Grp, Sub) DO UPDATE SET "
+        f"Row_Count = Row_Count + 1, Quantity = Quantity + excluded.Quantity;"
+    )
+
+def _decrement(metric, spec, prefix="OLD"):
+    _, grp, sub, qty = spec
+    return (
+        f"UPDATE Summary_Counts SET Row_Count = Row_Count - 1, Quantity = Quantity - {_qty(prefix, qty)} "
+        f"WHERE Metric = '{metric}' AND Grp = {_expr(prefix, grp)} AND Sub = {_expr(prefix, sub)};"
+    )
+
+def trigger_statements():
+    statements = []
+    for table in sorted({spec[0] for spec in METRICS.values()}):
+        metrics = [(m, spec) for m, spec in METRICS.items() if spec[0] == table]
+        columns = sorted({c for _, spec in metrics for c in spec[1:] if c})
+        name = table.lower()
+
+        inserts = "\n    ".join(_increment(m, spec) for m, spec in metrics)
+        deletes = "\n    ".join(_decrement(m, spec) for m, spec in metrics)
+        statements.append(f"CREATE TRIGGER IF NOT EXISTS trg_summary_{name}_insert AFTER INSERT ON {table}\nBEGIN\n    {inserts}\nEND")
+        statements.append(f"CREATE TRIGGER IF NOT EXISTS trg_summary_{name}_delete AFTER DELETE ON {table}\nBEGIN\n    {deletes}\nEND")
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_summary_{name}_update AFTER UPDATE OF {', '.join(columns)} ON {table}\n"
+            f"BEGIN\n    {deletes}\n    {inserts}\nEND"
+        )
+    return statements
+
+def drop_triggers(conn):
+    names = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_summary_%'")]
+    for name in names:
+        conn.execute(f'DROP TRIGGER "{name}"')
+
+# -------------------------------
+# Install / Rebuild
+# -------------------------------
+def recompute_sql(metric):
+    table, grp, sub, qty = METRICS[metric]
+    return (
+        f"SELECT '{metric}' AS Metric, {_expr('t', grp)} AS Grp, {_expr('t', sub)} AS Sub, "
+        f"COUNT(*) AS Row_Count, SUM({_qty('t', qty)}) AS Quantity "
+        f"FROM {table} t GROUP BY 2, 3"
+    )
+
+def rebuild(conn):
+    conn.execute("DELETE FROM Summary_Counts")
+    for metric in METRICS:
+        conn.execute(f"INSERT INTO Summary_Counts (Metric, Grp, Sub, Row_Count, Quantity) {recompute_sql(metric)}")
+
+def install(conn):
+    created = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='Summary_Counts'").fetchone() is None
+    conn.execute(SUMMARY_DDL)
+    if triggers_changed(conn, "trg_summary_", trigger_statements()):
+        drop_triggers(conn)
+        created = True
+    for statement in trigger_statements():
+        conn.execute(statement)
+    if created:
+        rebuild(conn)
+
+# -------------------------------
+# Consistency Check
+# -------------------------------
+# Compares every metric with a full recomputation from the base tables and
+# returns the groups that disagree (empty when everything matches).
+def check(conn):
+    mismatches = []
+    for metric in METRICS:
+        stored = pd.read_sql_query(
+            "SELECT Grp, Sub, Row_Count, Quantity FROM Summary_Counts WHERE Metric = ? AND Row_Count > 0",
+            conn, params=(metric,))
+        expected = pd.read_sql_query(recompute_sql(metric), conn).drop(columns="Metric")
+        merged = stored.merge(expected, on=["Grp", "Sub"], how="outer", suffixes=("_stored", "_expected"))
+        bad = merged[
+            (merged["Row_Count_stored"] != merged["Row_Count_expected"])
+            | (merged["Quantity_stored"] != merged["Quantity_expected"])
+        ]
+        if not bad.empty:
+            mismatches.append((metric, bad))
+    return mismatches
+
+# -------------------------------
+# Reads
+# -------------------------------
+def counts(metric, pool=None):
+    return read_sql(
+        "SELECT Grp, Sub, Row_Count, Quantity FROM Summary_Counts "
+        "WHERE Metric = ? AND Row_Count > 0 ORDER BY Row_Count DESC",
+        (metric,), pool=pool)
+
+def total(metric, pool=None):
+    df = counts(metric, pool=pool)
+    return int(df["Row_Count"].sum()), int(df["Quantity"].sum())
+
+# City name, City_ID (None for rows without a city) and row count per city
+def by_city(metric, label, pool=None):
+    df = read_sql(
+        f"SELECT IFNULL(c.Name, '') AS City, NULLIF(s.Grp, '') AS City_ID, s.Row_Count AS {label} "
+        f"FROM Summary_Counts s LEFT JOIN Cities c ON c.City_ID = s.Grp "
+        f"WHERE s.Metric = ? AND s.Row_Count > 0 ORDER BY s.Row_Count DESC",
+        (metric,), pool=pool)
+    df["City_ID"] = pd.Series([None if pd.isna(v) else int(v) for v in df["City_ID"]], index=df.index, dtype=object)
+    return df
+
+def providers_by_city(pool=None):
+    return by_city("providers_by_city", "Providers", pool=pool)
+
+def receivers_by_city(pool=None):
+    return by_city("receivers_by_city", "Receivers", pool=pool)
@@ -0,0 +1,144 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.db import get_pool, transaction
+
+WINDOW_MS = float(os.environ.get("FOOD_WASTAGE_WRITE_WINDOW_MS", "0"))
+MAX_GROUP = 256
+
+_STOP = object()
+
+# -------------------------------
+# Write Queue
+# -------------------------------
+# One writer thread per pool applies every queued write. It takes the first
+# waiting operation plus everything queued behind it, waits up to WINDOW_MS
+# for more (up to MAX_GROUP operations) and runs the whole group in one
+# BEGIN IMMEDIATE transaction with one commit. Writes that arrive while a
+# group is committing form the next group, so groups grow with the load even
+# with no window; a window only pays off when commits are slow (e.g.
+# synchronous=FULL). Callers don't compete for SQLite's write lock or wait
+# out each other's commits; they wait on a Future instead.
+#
+# Each operation runs inside its own SAVEPOINT, so one that raises is rolled
+# back on its own and its Future gets the exception while the rest of the
+# group still commits. Futures are only resolved after the commit, so a
+# result means the write is committed. If the transaction can't be opened or
+# committed, every operation in the group gets that error.
+#
+# After a group commits, and once its Futures are resolved, the writer runs
+# the after_commit hooks to bring derived data up to date with the write
+# (e.g. the table snapshots in app/snapshot.py).
+class WriteQueue:
+    def __init__(self, pool=None, window_ms=WINDOW_MS, max_group=MAX_GROUP):
+        self.pool = pool or get_pool()
+        self.window = window_ms / 1000
+        self.max_group = max_group
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    # Queues func(*args, pool=<this queue's pool>, **kwargs) and returns a
+    # Future for its return value. Any app write helper that takes a pool
+    # (app/repository.py, app/claims.py) can be queued as it is: on the writer
+    # thread its pool.connection() is the group's connection and its
+    # transaction() joins the group's transaction.
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        self._queue.put((func, args, kwargs, future))
+        return future
+
+    def close(self, timeout=None):
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        group = [first]
+        deadline = time.perf_counter() + self.window
+        while len(group) < self.max_group:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            group.append(item)
+        return group
+
+    def _run(self):
+        while True:
+            group = self._collect()
+            if group is None:
+                return
+            self._apply(group)
+
+    def _apply(self, group):
+        outcomes = []
+        try:
+            with self.pool.connection() as conn:
+                with transaction(conn, immediate=True):
+                    for func, args, kwargs, future in group:
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        conn.execute("SAVEPOINT queued_write")
+                        try:
+                            value = func(*args, pool=self.pool, **kwargs)
+                        except Exception as e:
+                            conn.execute("ROLLBACK TO queued_write")
+                            conn.execute("RELEASE queued_write")
+                            outcomes.append((future, None, e))
+                        else:
+                            conn.execute("RELEASE queued_write")
+                            outcomes.append((future, value, None))
+        except Exception as e:
+            errors = {future: error for future, _, error in outcomes}
+            for _, _, _, future in group:
+                if not future.done():
+                    future.set_exception(errors.get(future) or e)
+            return
+
+        for future, value, error in outcomes:
+            if error is None:
+                future.set_result(value)
+            else:
+                future.set_exception(error)
+        self._after_commit()
+
+    # A failing hook must not stop the writer; whatever it keeps current is
+    # brought up to date again by the next commit
+    def _after_commit(self):
+        for hook in _hooks:
+            try:
+                hook(self.pool)
+            except Exception:
+                pass
+
+_hooks = []
+
+# Registers hook(pool) to run on the writer thread after every committed group
+def after_commit(hook):
+    if hook not in _hooks:
+        _hooks.append(hook)
+    return hook
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+# The shared write queue for a pool, started on first use
+def get_write_queue(pool=None):
+    pool = pool or get_pool()
+    with _queues_lock:
+        writes = _queues.get(pool)
+        if writes is None:
+            writes = _queues[pool] = WriteQueue(pool)
+        return writes
+
+def submit(func, *args, pool=None, **kwargs):
+    return get_write_queue(pool).submit(func, *args, **kwargs)
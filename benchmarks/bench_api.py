@@ -0,0 +1,130 @@
+import argparse
+import collections
+import http.client
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_insights import FOOD_TYPES, MEAL_TYPES, make_db
+
+# -------------------------------
+# Scenarios
+# -------------------------------
+# Each returns the (method, path, body, headers) of one request for a client.
+# "poll" re-sends the ETag of an earlier response, as a partner checking for
+# new listings would; it should be all 304s while nothing is written.
+def search_request(rng, cities, etags):
+    path = f"/listings?location=City%20{rng.randrange(cities)}&food_type={rng.choice(FOOD_TYPES)}&limit=50"
+    return "GET", path, None, {}
+
+def poll_request(rng, cities, etags):
+    path, tag = rng.choice(list(etags.items()))
+    return "GET", path, None, {"If-None-Match": tag}
+
+def claims_request(rng, cities, etags):
+    body = {"claims": [{"food_id": rng.randrange(1, 1000), "receiver_id": rng.randrange(1, 1000)} for _ in range(20)]}
+    return "POST", "/claims", json.dumps(body), {"Content-Type": "application/json"}
+
+SCENARIOS = {
+    "search (200)": search_request,
+    "poll (304)": poll_request,
+    "batch of 20 claims": claims_request,
+}
+
+# -------------------------------
+# Load
+# -------------------------------
+# `clients` threads, each on its own keep-alive connection, send requests
+# back to back for `seconds`. The server runs in its own process, so the
+# client threads don't share its interpreter lock.
+def run(port, scenario, clients, seconds, cities, etags):
+    latencies, statuses = [], collections.Counter()
+    stop = threading.Event()
+
+    def client(c):
+        rng = random.Random(c)
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        mine = []
+        while not stop.is_set():
+            method, path, body, headers = SCENARIOS[scenario](rng, cities, etags)
+            t = time.perf_counter()
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            mine.append(time.perf_counter() - t)
+            statuses[response.status] += 1
+        conn.close()
+        latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "requests_per_s": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "statuses": dict(statuses),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests/s of the JSON API (api.py) for listing searches, "
+                                                 "conditional polls and batch claims")
+    parser.add_argument("--listings", type=int, default=200_000)
+    parser.add_argument("--claims", type=int, default=50_000)
+    parser.add_argument("--cities", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "api.db")
+        make_db(db, args.listings, args.claims, cities=args.cities)
+        conn = sqlite3.connect(db)
+        conn.execute("ANALYZE")  # as scripts/init_db.py does
+        conn.close()
+
+        env = dict(os.environ, FOOD_WASTAGE_DB=db, FOOD_WASTAGE_METRICS="0")
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, "api.py"), "--port", "0", "--quiet"],
+                                  cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+        try:
+            port = int(server.stdout.readline().rsplit(":", 1)[1])
+
+            # ETags for the poll scenario: one per city
+            etags = {}
+            probe = http.client.HTTPConnection("127.0.0.1", port)
+            for city in range(args.cities):
+                path = f"/listings?location=City%20{city}&limit=50"
+                probe.request("GET", path)
+                response = probe.getresponse()
+                response.read()
+                etags[path] = response.getheader("ETag")
+            probe.close()
+
+            print(f"{args.listings:,} listings, {args.clients} clients, {args.seconds:.0f}s per scenario")
+            for scenario in SCENARIOS:
+                result = run(port, scenario, args.clients, args.seconds, args.cities, etags)
+                print(f"   {scenario:<20} {result['requests_per_s']:8,.0f} requests/s   "
+                      f"p50 {result['p50_ms']:6.2f} ms   p99 {result['p99_ms']:7.2f} ms   "
+                      f"status {result['statuses']}")
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import ConnectionPool, execute, fetch_all
+
+# -------------------------------
+# Setup
+# -------------------------------
+def make_db(path, rows=1000):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE Providers (
+            Provider_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Name TEXT, Type TEXT, Address TEXT, City TEXT, Contact TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO Providers (Name, Type, Address, City, Contact) VALUES (?, ?, ?, ?, ?)",
+        [(f"Provider {i}", "Restaurant", f"{i} Main St", f"City {i % 50}", "555-0100") for i in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+# -------------------------------
+# Workloads
+# -------------------------------
+# The old behaviour: connect, run one statement, commit, close.
+def per_call_op(path, i):
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+    if i % 4 == 0:
+        cur.execute("UPDATE Providers SET Contact=? WHERE Provider_ID=?", (f"555-{i:04d}", i % 1000 + 1))
+    else:
+        cur.execute("SELECT * FROM Providers WHERE Provider_ID=?", (i % 1000 + 1,)).fetchall()
+    conn.commit()
+    conn.close()
+
+def pooled_op(pool, i):
+    if i % 4 == 0:
+        execute("UPDATE Providers SET Contact=? WHERE Provider_ID=?", (f"555-{i:04d}", i % 1000 + 1), pool=pool)
+    else:
+        fetch_all("SELECT * FROM Providers WHERE Provider_ID=?", (i % 1000 + 1,), pool=pool)
+
+def run(op, target, ops, threads):
+    per_thread = ops // threads
+
+    def worker(offset):
+        for i in range(offset, offset + per_thread):
+            op(target, i)
+
+    workers = [threading.Thread(target=worker, args=(t * per_thread,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * threads / elapsed
+
+# -------------------------------
+# Main
+# -------------------------------
+def main(ops=4000):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'threads':>8} {'per-call ops/s':>15} {'pooled ops/s':>13} {'speedup':>8}")
+        for threads in (1, 4, 8):
+            old_path = os.path.join(tmp, f"old_{threads}.db")
+            new_path = os.path.join(tmp, f"new_{threads}.db")
+            make_db(old_path)
+            make_db(new_path)
+
+            pool = ConnectionPool(new_path)
+            old = run(per_call_op, old_path, ops, threads)
+            new = run(pooled_op, pool, ops, threads)
+            pool.close()
+            print(f"{threads:>8} {old:>15.0f} {new:>13.0f} {new / old:>7.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4000)
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import insights
+from app.db import ConnectionPool
+from app.importer import suspended_triggers
+from app.schema import apply_schema
+
+FOOD_TYPES = ["Vegetarian", "Non-Vegetarian", "Vegan"]
+MEAL_TYPES = ["Breakfast", "Lunch", "Dinner", "Snacks"]
+PROVIDER_TYPES = ["Restaurant", "Grocery Store", "Supermarket", "Catering Service"]
+
+# -------------------------------
+# Setup
+# -------------------------------
+def make_db(path, listings, claims, providers=10_000, receivers=50_000, cities=500, seed=7):
+    rng = np.random.default_rng(seed)
+    city = [f"City {i}" for i in range(cities)]
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    apply_schema(conn)
+    with suspended_triggers(conn):
+        conn.executemany("INSERT INTO Providers (Provider_ID, Name, Type, City) VALUES (?, ?, ?, ?)",
+                         [(i, f"Provider {i}", PROVIDER_TYPES[i % 4], city[i % cities]) for i in range(1, providers + 1)])
+        conn.executemany("INSERT INTO Receivers (Receiver_ID, Name, Type, City) VALUES (?, ?, ?, ?)",
+                         [(i, f"Receiver {i}", "NGO", city[i % cities]) for i in range(1, receivers + 1)])
+        provider_ids = rng.integers(1, providers + 1, listings)
+        quantities = rng.integers(1, 50, listings)
+        days = rng.integers(-30, 30, listings)
+        conn.executemany(
+            "INSERT INTO Food_Listings (Food_ID, Food_Name, Quantity, Expiry_Date, Provider_ID, Provider_Type, "
+            "Location, Food_Type, Meal_Type) VALUES (?, 'Bread', ?, date('now', ? || ' days'), ?, ?, ?, ?, ?)",
+            ((i + 1, int(quantities[i]), int(days[i]), int(provider_ids[i]), PROVIDER_TYPES[i % 4],
+              city[provider_ids[i] % cities], FOOD_TYPES[i % 3], MEAL_TYPES[i % 4]) for i in range(listings)))
+        food_ids = rng.integers(1, listings + 1, claims)
+        receiver_ids = rng.integers(1, receivers + 1, claims)
+        conn.executemany(
+            "INSERT INTO Claims (Claim_ID, Food_ID, Receiver_ID, Status, Timestamp) "
+            "VALUES (?, ?, ?, 'Pending', datetime('now'))",
+            ((i + 1, int(food_ids[i]), int(receiver_ids[i])) for i in range(claims)))
+    conn.close()
+
+# -------------------------------
+# Original Page
+# -------------------------------
+# The aggregates as the page used to compute them from the full DataFrames:
+# a copy per filter step, date parsing with a row-wise apply for chart 6 and
+# again for chart 9, and a merge per claim chart.
+def original_page(providers, receivers, food_listings, claims, filters):
+    f = food_listings.copy()
+    if filters["city"]:
+        f = f[f["Provider_ID"].isin(providers.loc[providers["City"] == filters["city"], "Provider_ID"])]
+    if filters["food_type"]:
+        f = f[f["Food_Type"] == filters["food_type"]]
+    if filters["meal_type"]:
+        f = f[f["Meal_Type"] == filters["meal_type"]]
+
+    out = [f["Provider_ID"].nunique(), f["Food_Type"].value_counts().reset_index(),
+           f.groupby(["Location", "Food_Type"]).size().reset_index(name="Count")]
+    out.append(f.groupby("Provider_ID").size().reset_index(name="Total_Listings")
+               .merge(providers[["Provider_ID", "Name"]], on="Provider_ID", how="left"))
+    out.append(claims.merge(f[["Food_ID"]], on="Food_ID").groupby("Receiver_ID").size().reset_index(name="Total_Claims")
+               .merge(receivers[["Receiver_ID", "Name"]], on="Receiver_ID", how="left"))
+    out.append(f["Meal_Type"].value_counts().reset_index())
+
+    today = pd.Timestamp.now("UTC").tz_localize(None).normalize()
+    tmp = f.copy()
+    tmp["Expiry_Date"] = pd.to_datetime(tmp["Expiry_Date"], errors="coerce")
+    tmp["Expiry_Status"] = tmp["Expiry_Date"].apply(lambda d: "Expired" if pd.notna(d) and d < today else "Valid")
+    out.append(tmp["Expiry_Status"].value_counts().reset_index())
+    tmp = f.copy()
+    tmp["Expiry_Date"] = pd.to_datetime(tmp["Expiry_Date"], errors="coerce")
+    out.append(tmp[tmp["Expiry_Date"] < today].groupby("Food_Type").size().reset_index(name="Expired_Count"))
+
+    out.append(claims.merge(receivers[["Receiver_ID", "City"]], on="Receiver_ID", how="left")
+               .groupby("City").size().reset_index(name="Claims"))
+    out.append(f.groupby("Provider_ID").size().reset_index(name="Total_Listings")
+               .merge(providers[["Provider_ID", "Name"]], on="Provider_ID", how="left"))
+    out.append(claims.merge(f[["Food_ID"]], on="Food_ID").groupby("Receiver_ID").size().reset_index(name="Total_Claims")
+               .merge(receivers[["Receiver_ID", "Name"]], on="Receiver_ID", how="left"))
+    out.append(f.groupby("Provider_Type").size().reset_index(name="Donations"))
+    out.append(f.groupby("Location")["Quantity"].sum().reset_index())
+    out.append(f.groupby("Food_Type")["Quantity"].sum().reset_index())
+    return out
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main(listings=1_000_000, claims=200_000):
+    filters = [
+        insights.empty_filters(),
+        {**insights.empty_filters(), "city": "City 7"},
+        {**insights.empty_filters(), "food_type": "Vegan", "meal_type": "Lunch"},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "insights.db")
+        start = time.perf_counter()
+        make_db(path, listings, claims)
+        print(f"   built {listings:,} listings / {claims:,} claims in {time.perf_counter() - start:.1f}s")
+
+        pool = ConnectionPool(path)
+        frames = [pd.read_sql_query(f'SELECT * FROM "{t}"', sqlite3.connect(path))
+                  for t in ["Providers", "Receivers", "Food_Listings", "Claims"]]
+
+        prepare = timed(insights.prepared_frames, pool=pool)
+        print(f"   single pass: prepared frames in {prepare:.2f}s (once per data version)")
+        for f in filters:
+            label = ", ".join(f"{k}={v}" for k, v in f.items() if v) or "no filters"
+            before = timed(original_page, *frames, f)
+            after = timed(insights.compute.__wrapped__, f, pool=pool)
+            print(f"   {label:<32} original {before:6.2f}s   single pass {after:6.3f}s   ({before / after:,.0f}x)")
+        pool.close()
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,125 @@
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import repository
+from app.db import ConnectionPool
+from app.replica import Replica
+from benchmarks.bench_insights import make_db
+from scripts.explain_analytics import load_queries
+
+# -------------------------------
+# Load
+# -------------------------------
+# For `seconds`, `writers` threads add claims back to back on the primary
+# (each its own BEGIN IMMEDIATE/COMMIT, as the Manage pages do) while
+# `readers` threads run the queries of sql/analytics.sql in a loop, either on
+# the primary itself or on the replica. A sampler records the size of the
+# primary's WAL file: a read transaction that is open on the primary keeps
+# the WAL from being reset, so under constant analytics it keeps growing.
+def run(path, mode, writers, readers, seconds, refresh_writes):
+    primary = ConnectionPool(path, size=writers + readers + 1)
+    replica = Replica(primary, writes=refresh_writes).start().wait() if mode == "replica" else None
+    read_pool = replica.pool if replica else primary
+    queries = [sql for _, sql in load_queries(os.path.join(ROOT, "sql", "analytics.sql"))]
+    with primary.connection() as conn:
+        max_food, max_receiver = conn.execute(
+            "SELECT (SELECT MAX(Food_ID) FROM Food_Listings), (SELECT MAX(Receiver_ID) FROM Receivers)").fetchone()
+
+    stop = threading.Event()
+    latencies, errors, reads, wal_sizes, lags = [], [], [0], [0], []
+
+    def writer(w):
+        i = 0
+        while not stop.is_set():
+            i += 1
+            claim = repository.Claim(Food_ID=(w * 7919 + i) % max_food + 1,
+                                     Receiver_ID=(w * 104729 + i) % max_receiver + 1, Status="Pending")
+            t = time.perf_counter()
+            try:
+                repository.insert(claim, pool=primary)
+            except Exception as e:
+                errors.append(e)
+                continue
+            latencies.append(time.perf_counter() - t)
+
+    def reader(r):
+        q = r
+        while not stop.is_set():
+            with read_pool.connection() as conn:
+                conn.execute(queries[q % len(queries)]).fetchall()
+            reads[0] += 1
+            q += 1
+
+    def sampler():
+        while not stop.wait(0.1):
+            try:
+                wal_sizes.append(os.path.getsize(path + "-wal"))
+            except OSError:
+                pass
+            if replica:
+                lags.append(replica.staleness()["writes_behind"])
+
+    threads = ([threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+               + [threading.Thread(target=reader, args=(r,)) for r in range(readers)]
+               + [threading.Thread(target=sampler)])
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    if replica:
+        replica.close()
+    primary.close()
+    latencies.sort()
+    return {
+        "writes_per_s": len(latencies) / seconds,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else float("nan"),
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else "",
+        "reads_per_s": reads[0] / seconds,
+        "max_wal_mb": max(wal_sizes) / 1e6,
+        "mean_lag": statistics.mean(lags) if lags else 0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="CRUD writes and primary WAL growth under constant analytics, "
+                                                 "with the analytics on the primary vs on the read replica")
+    parser.add_argument("--listings", type=int, default=200_000)
+    parser.add_argument("--claims", type=int, default=50_000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--refresh-writes", type=int, default=500, help="replica refresh after this many changes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.db")
+        make_db(source, args.listings, args.claims)
+        print(f"{args.listings:,} listings, {args.writers} writers, {args.readers} analytics readers, "
+              f"{args.seconds:.0f}s")
+        for mode in ("primary", "replica"):
+            path = os.path.join(tmp, f"{mode}.db")
+            shutil.copy(source, path)
+            result = run(path, mode, args.writers, args.readers, args.seconds, args.refresh_writes)
+            line = (f"   analytics on {mode:<8} {result['writes_per_s']:7,.0f} writes/s   "
+                    f"p99 {result['p99_ms']:7.2f} ms   {result['reads_per_s']:5.1f} queries/s   "
+                    f"primary WAL up to {result['max_wal_mb']:6.1f} MB")
+            if mode == "replica":
+                line += f"   replica {result['mean_lag']:.0f} changes behind on average"
+            if result["errors"]:
+                line += f"   ❌ {result['errors']} failed writes: {result['first_error']}"
+            print(line)
+
+if __name__ == "__main__":
+    main()
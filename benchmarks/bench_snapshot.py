@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# One dashboard worker: builds the Food Insights frames, reports how long that
+# took, then waits until every worker is up before reading its memory from
+# /proc, so pages shared between the workers are split between them in Pss.
+WORKER = r"""
+import json, sys, time
+start = time.perf_counter()
+from app import insights
+frames = insights.prepared_frames()
+print(json.dumps({"prepare_s": time.perf_counter() - start}), flush=True)
+sys.stdin.readline()
+memory = {}
+with open("/proc/self/smaps_rollup") as f:
+    for line in f:
+        name, _, value = line.partition(":")
+        if name in ("Rss", "Pss", "Pss_Anon", "Pss_File"):
+            memory[name] = int(value.split()[0]) / 1024
+print(json.dumps(memory), flush=True)
+"""
+
+# -------------------------------
+# Measurement
+# -------------------------------
+def run_workers(db, workers, snapshot):
+    env = dict(os.environ, FOOD_WASTAGE_DB=db, FOOD_WASTAGE_SNAPSHOT="1" if snapshot else "0",
+               FOOD_WASTAGE_METRICS="0")
+    procs, results = [], []
+    for _ in range(workers):
+        procs.append(subprocess.Popen([sys.executable, "-c", WORKER], cwd=ROOT, env=env, text=True,
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE))
+        # One at a time, so with snapshots on only the first worker exports
+        results.append(json.loads(procs[-1].stdout.readline()))
+    for proc, result in zip(procs, results):
+        proc.stdin.write("\n")
+        proc.stdin.flush()
+        result.update(json.loads(proc.stdout.readline()))
+        proc.wait()
+    return results
+
+def report(label, results):
+    first, rest = results[0]["prepare_s"], [r["prepare_s"] for r in results[1:]]
+    pss = sum(r["Pss"] for r in results)
+    print(f"   {label:<16} prepare: first {first:5.2f}s, others {min(rest, default=first):5.2f}s   "
+          f"memory: {pss:7.0f} MB Pss in total ({pss / len(results):.0f} MB per worker, "
+          f"{sum(r['Pss_File'] for r in results):.0f} MB of it file-backed)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and load time of dashboard workers with and without "
+                                                 "the memory-mapped table snapshots")
+    parser.add_argument("--db", help="existing database (default: a generated insights database)")
+    parser.add_argument("--listings", type=int, default=1_000_000)
+    parser.add_argument("--claims", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    db = args.db
+    if not db:
+        from benchmarks.bench_insights import make_db
+        os.makedirs(os.path.join(ROOT, "benchmarks", "results"), exist_ok=True)
+        db = os.path.join(ROOT, "benchmarks", "results", f"snapshot-{args.listings}.db")
+        if not os.path.exists(db):
+            start = time.perf_counter()
+            make_db(db, args.listings, args.claims)
+            print(f"   built {args.listings:,} listings / {args.claims:,} claims in {time.perf_counter() - start:.1f}s")
+    db = os.path.abspath(db)
+
+    os.environ["FOOD_WASTAGE_DB"] = db
+    from app import snapshot
+    from app.db import get_pool
+    for name in os.listdir(snapshot.snapshot_dir()) if os.path.isdir(snapshot.snapshot_dir()) else []:
+        os.remove(os.path.join(snapshot.snapshot_dir(), name))
+    get_pool().close()
+
+    report("SQLite reads", run_workers(db, args.workers, snapshot=False))
+    report("snapshots", run_workers(db, args.workers, snapshot=True))
+
+if __name__ == "__main__":
+    main()
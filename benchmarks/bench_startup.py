@@ -0,0 +1,74 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["Overview", "Providers", "Food Insights", "Manage Providers", "Manage Claims"]
+
+# Runs in a fresh interpreter so the first run pays for every import, like
+# the first browser session after the server starts. Prints one JSON line:
+# seconds to the first rendered page, then per page the median time of a
+# rerun of the script itself (AppTest's own bookkeeping is left out by timing
+# Streamlit's script-exec hook).
+PROBE = r"""
+import json, os, statistics, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+from streamlit.runtime.scriptrunner import script_runner
+
+script_times = []
+exec_script = script_runner.exec_func_with_error_handling
+def timed_exec(*args, **kwargs):
+    t = time.perf_counter()
+    try:
+        return exec_script(*args, **kwargs)
+    finally:
+        script_times.append((time.perf_counter() - t) * 1000)
+script_runner.exec_func_with_error_handling = timed_exec
+
+at = AppTest.from_file(os.path.join(os.getcwd(), "app.py"), default_timeout=600)
+at.run()
+result = {"first_paint_s": time.perf_counter() - start, "first_script_ms": script_times[0], "reruns_ms": {}}
+for page in sys.argv[1].split(","):
+    at.sidebar.radio[0].set_value(page).run()
+    del script_times[:]
+    for _ in range(int(sys.argv[2])):
+        at.run()
+    result["reruns_ms"][page] = statistics.median(script_times)
+print(json.dumps(result))
+"""
+
+# -------------------------------
+# Measurement
+# -------------------------------
+def probe(root, db, pages, reruns):
+    env = dict(os.environ, FOOD_WASTAGE_SWEEP_INTERVAL="0")
+    if db:
+        env["FOOD_WASTAGE_DB"] = os.path.abspath(db)
+    out = subprocess.run([sys.executable, "-c", PROBE, ",".join(pages), str(reruns)], cwd=root, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first paint and per-rerun overhead of app.py")
+    parser.add_argument("--root", default=ROOT, help="checkout to measure (e.g. an older revision)")
+    parser.add_argument("--db", help="database to run against (default: the checkout's food_wastage.db)")
+    parser.add_argument("--starts", type=int, default=5, help="fresh processes to average the first paint over")
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [probe(args.root, args.db, PAGES, args.reruns) for _ in range(args.starts)]
+    first = [r["first_paint_s"] for r in runs]
+    script = statistics.median(r["first_script_ms"] for r in runs)
+    print(f"   first paint: median {statistics.median(first):.2f}s (min {min(first):.2f}s, {args.starts} starts), "
+          f"of which the first script run {script:.0f} ms")
+    for page in PAGES:
+        rerun = statistics.median(r["reruns_ms"][page] for r in runs)
+        print(f"   rerun {page:<20} {rerun:8.1f} ms script time")
+
+if __name__ == "__main__":
+    main()
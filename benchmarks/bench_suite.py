@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAGES = ["Overview", "Providers", "Receivers", "Food Insights", "Map View",
+         "Manage Providers", "Manage Receivers", "Manage Claims", "Manage Food Listings", "Performance"]
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+NOISE_MS = 1.0
+
+# -------------------------------
+# Timing
+# -------------------------------
+# Runs func `repeat` times and summarizes the wall time in milliseconds.
+# An exception stops the measurement and is recorded instead of a time, so
+# one broken path doesn't hide the rest of the report.
+def measure(func, repeat):
+    times = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    times.sort()
+    return {
+        "runs": len(times),
+        "min_ms": round(times[0], 3),
+        "median_ms": round(statistics.median(times), 3),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 3),
+        "max_ms": round(times[-1], 3),
+    }
+
+# -------------------------------
+# Analytics Queries
+# -------------------------------
+# Every query in sql/analytics.sql on one connection. A first, untimed run
+# counts the result rows and warms the page cache.
+def bench_queries(db_path, repeat):
+    from scripts.explain_analytics import load_queries
+
+    results = {}
+    conn = sqlite3.connect(db_path)
+    for title, sql in load_queries(os.path.join(ROOT, "sql", "analytics.sql")):
+        rows = len(conn.execute(sql).fetchall())
+        results[title] = {**measure(lambda: conn.execute(sql).fetchall(), repeat), "rows": rows}
+    conn.close()
+    return results
+
+# -------------------------------
+# Pages
+# -------------------------------
+# Every sidebar page of app.py under AppTest: one visit is a fresh app run
+# followed by switching the sidebar to the page. The first visit is timed on
+# its own (cold caches); the median of the following visits is the warm time.
+def bench_pages(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for page in PAGES:
+        def visit():
+            at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=600)
+            at.run()
+            at.sidebar.radio[0].set_value(page).run()
+            if at.exception:
+                raise RuntimeError(at.exception[0].value)
+
+        cold = measure(visit, 1)
+        warm = measure(visit, repeat) if "error" not in cold else {}
+        results[page] = {"cold_ms": cold.get("median_ms"), **warm} if "error" not in cold else cold
+    return results
+
+# -------------------------------
+# CRUD
+# -------------------------------
+# The app/db_helper.py functions, `ops` calls each: adds first, then updates
+# and deletes of the rows just added, so the generated data is left as it was.
+# The *_many entries are whole batches of `ops` rows, not per-row times.
+def bench_crud(ops):
+    from app import db_helper
+    from app.db import fetch_all
+
+    def new_ids(table, key, before):
+        return [row[0] for row in fetch_all(f"SELECT {key} FROM {table} WHERE {key} > ? ORDER BY {key}", (before,))]
+
+    def last_id(table, key):
+        return fetch_all(f"SELECT IFNULL(MAX({key}), 0) FROM {table}")[0][0]
+
+    # (table, key, add, update, delete, add arguments, update arguments)
+    entities = [
+        ("Providers", "Provider_ID", db_helper.add_provider, db_helper.update_provider, db_helper.delete_provider,
+         lambda i: (f"Bench Provider {i}", "Bench City", "555-0100"), ("Bench Provider", "Bench City", "555-0199")),
+        ("Receivers", "Receiver_ID", db_helper.add_receiver, db_helper.update_receiver, db_helper.delete_receiver,
+         lambda i: (f"Bench Receiver {i}", "Bench City", "555-0100"), ("Bench Receiver", "Bench City", "555-0199")),
+        ("Food_Listings", "Food_ID", db_helper.add_food, db_helper.update_food, db_helper.delete_food,
+         lambda i: (f"Bench Food {i}", "Vegan", "Bench City", "2030-01-01", 1),
+         ("Bench Food", "Vegetarian", "Bench City", "2030-01-02")),
+    ]
+
+    results = {}
+    for table, key, add, update, delete, add_args, update_args in entities:
+        before = last_id(table, key)
+        calls = iter(range(ops))
+        results[add.__name__] = measure(lambda: add(*add_args(next(calls))), ops)
+        ids = new_ids(table, key, before)
+        if not ids:
+            results[update.__name__] = results[delete.__name__] = {"error": f"no rows added by {add.__name__}"}
+            continue
+        pending = iter(ids)
+        results[update.__name__] = measure(lambda: update(next(pending), *update_args), len(ids))
+        pending = iter(ids)
+        results[delete.__name__] = measure(lambda: delete(next(pending)), len(ids))
+
+    # The same `ops` providers written as one batch each way (one transaction
+    # and one executemany per call)
+    from app import repository
+
+    before = last_id("Providers", "Provider_ID")
+    batch = [repository.Provider(Name=f"Bench Provider {i}", City="Bench City") for i in range(ops)]
+    results["insert_many"] = measure(lambda: repository.insert_many(batch), 1)
+    added = repository.get_many(repository.Provider, new_ids("Providers", "Provider_ID", before))
+    for provider in added:
+        provider.Contact = "555-0199"
+    results["update_many"] = measure(lambda: repository.update_many(added, columns=["Contact"]), 1)
+    results["delete_many"] = measure(
+        lambda: repository.delete_many(repository.Provider, [p.Provider_ID for p in added]), 1)
+    return results
+
+# -------------------------------
+# Report
+# -------------------------------
+def environment(db_path):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    conn = sqlite3.connect(db_path)
+    counts = {t: conn.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0]
+              for t in ["Providers", "Receivers", "Food_Listings", "Claims"]}
+    conn.close()
+    return {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "rows": counts,
+    }
+
+# Entries whose median got slower than `threshold` (1.2 = 20%) compared with
+# an earlier report. Differences under `noise_ms` are ignored; sub-millisecond
+# timings swing by more than 20% from run to run.
+def regressions(previous, current, threshold, noise_ms=NOISE_MS):
+    found = []
+    for section in ("queries", "pages", "crud"):
+        for name, now in current.get(section, {}).items():
+            before = previous.get(section, {}).get(name, {}).get("median_ms")
+            after = now.get("median_ms")
+            if before and after and after > before * threshold and after - before > noise_ms:
+                found.append((section, name, before, after))
+    return found
+
+def print_section(title, results):
+    print(f"\n{title}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"   ❌ {name}: {result['error']}")
+        else:
+            print(f"   {result['median_ms']:>10.2f} ms  {name}")
+
+# -------------------------------
+# Main
+# -------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Time the analytics queries, dashboard pages and CRUD helpers")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows per table in the synthetic database")
+    parser.add_argument("--db", help="benchmark an existing database instead of generating one")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ops", type=int, default=200, help="calls per CRUD function")
+    parser.add_argument("--skip-pages", action="store_true")
+    parser.add_argument("--out", help="JSON report path (default benchmarks/results/suite-<rows>.json)")
+    parser.add_argument("--compare", help="earlier JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    db_path = os.path.abspath(args.db or os.path.join(RESULTS_DIR, f"synthetic-{args.rows}.db"))
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    # app.db picks its database when first imported, so the app modules (and
+    # the app.py run by AppTest) are only imported after this
+    os.environ["FOOD_WASTAGE_DB"] = db_path
+
+    report = {}
+    if not args.db:
+        from benchmarks.synthetic import make_db
+        start = time.perf_counter()
+        make_db(db_path, args.rows)
+        report["generate_s"] = round(time.perf_counter() - start, 2)
+    report["environment"] = environment(db_path)
+
+    report["queries"] = bench_queries(db_path, args.repeat)
+    print_section("Analytics queries (sql/analytics.sql)", report["queries"])
+    if not args.skip_pages:
+        report["pages"] = bench_pages(args.repeat)
+        print_section("Pages (AppTest, warm median)", report["pages"])
+    report["crud"] = bench_crud(args.ops)
+    print_section("CRUD (app/db_helper.py per call, app/repository.py per batch)", report["crud"])
+
+    out = args.out or os.path.join(RESULTS_DIR, f"suite-{report['environment']['rows']['Food_Listings']}.json")
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Report written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            slower = regressions(json.load(f), report, args.threshold)
+        for section, name, before, now in slower:
+            print(f"   ❌ {section} / {name}: {before:.2f} ms -> {now:.2f} ms")
+        if slower:
+            sys.exit(1)
+        print(f"✅ Nothing more than {args.threshold - 1:.0%} slower than {args.compare}")
+
+if __name__ == "__main__":
+    main()
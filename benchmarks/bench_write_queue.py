@@ -0,0 +1,99 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import repository
+from app.db import ConnectionPool
+from app.schema import apply_schema
+from app.writes import WINDOW_MS, WriteQueue
+
+# -------------------------------
+# Setup
+# -------------------------------
+def make_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA journal_mode=WAL")
+    apply_schema(conn)
+    conn.close()
+
+# -------------------------------
+# Load
+# -------------------------------
+# `clients` threads (one per simulated session) each add `ops` providers back
+# to back, waiting for every write to commit before sending the next one.
+# "per-call" is today's path: each write is its own BEGIN IMMEDIATE/COMMIT on
+# the caller's pooled connection. "queued" submits it to the write queue and
+# waits on the Future.
+def run(path, mode, clients, ops, window_ms):
+    pool = ConnectionPool(path, size=clients)
+    writes = WriteQueue(pool, window_ms=window_ms) if mode == "queued" else None
+    latencies, errors = [], []
+    start_line = threading.Barrier(clients + 1)
+
+    def client(c):
+        mine = []
+        start_line.wait()
+        try:
+            for i in range(ops):
+                record = repository.Provider(Name=f"Client {c} write {i}", City="Bench City")
+                t = time.perf_counter()
+                if writes:
+                    writes.submit(repository.insert, record).result()
+                else:
+                    repository.insert(record, pool=pool)
+                mine.append(time.perf_counter() - t)
+        except Exception as e:
+            errors.append(e)
+        latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    for thread in threads:
+        thread.start()
+    start_line.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if writes:
+        writes.close()
+    pool.close()
+    latencies.sort()
+    return {
+        "writes_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else float("nan"),
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else "",
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Sustained writes/s and latency: per-call commits vs the write queue")
+    parser.add_argument("--clients", default="1,8,32", help="comma-separated numbers of concurrent clients")
+    parser.add_argument("--ops", type=int, default=500, help="writes per client")
+    parser.add_argument("--window-ms", type=float, default=WINDOW_MS, help="write queue group window")
+    args = parser.parse_args()
+
+    for clients in [int(c) for c in args.clients.split(",")]:
+        print(f"\n{clients} client(s) x {args.ops} writes")
+        for mode in ("per-call", "queued"):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "bench.db")
+                make_db(path)
+                result = run(path, mode, clients, args.ops, args.window_ms)
+            line = (f"   {mode:<9} {result['writes_per_s']:9,.0f} writes/s   "
+                    f"p50 {result['p50_ms']:7.2f} ms   p99 {result['p99_ms']:8.2f} ms")
+            if result["errors"]:
+                line += f"   ❌ {result['errors']} client(s) failed: {result['first_error']}"
+            print(line)
+
+if __name__ == "__main__":
+    main()
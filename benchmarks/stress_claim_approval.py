@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import claims
+from app.db import ConnectionPool
+from app.schema import apply_schema
+
+# -------------------------------
+# Setup
+# -------------------------------
+# A few listings with little stock and many more pending claims than units,
+# so concurrent approvals constantly race for the last unit of a listing.
+def make_db(path, listings, stock, claims_per_listing):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    apply_schema(conn)
+    conn.execute("INSERT INTO Providers (Provider_ID, Name, Type, City, Contact) VALUES (1, 'P', 'Restaurant', 'C', '')")
+    conn.execute("INSERT INTO Receivers (Receiver_ID, Name, Type, City, Contact) VALUES (1, 'R', 'NGO', 'C', '')")
+    conn.executemany(
+        "INSERT INTO Food_Listings (Food_ID, Food_Name, Quantity, Provider_ID) VALUES (?, 'Bread', ?, 1)",
+        [(f, stock) for f in range(1, listings + 1)])
+    conn.executemany(
+        "INSERT INTO Claims (Food_ID, Receiver_ID, Status) VALUES (?, 1, 'Pending')",
+        [(f,) for f in range(1, listings + 1) for _ in range(claims_per_listing)])
+    conn.commit()
+    conn.close()
+
+# -------------------------------
+# Stress Run
+# -------------------------------
+# Each worker has its own connection pool (its own SQLite connections) and
+# approves an interleaved slice of the claims, one at a time or in batches.
+def run(path, workers, batch_size):
+    conn = sqlite3.connect(path)
+    claim_ids = [row[0] for row in conn.execute("SELECT Claim_ID FROM Claims ORDER BY Claim_ID")]
+    conn.close()
+
+    errors = []
+
+    def worker(offset):
+        pool = ConnectionPool(path)
+        mine = claim_ids[offset::workers]
+        try:
+            for i in range(0, len(mine), batch_size):
+                batch = mine[i:i + batch_size]
+                if batch_size == 1:
+                    claims.update_claim_status(batch[0], claims.APPROVED, pool=pool)
+                else:
+                    claims.approve_claims(batch, pool=pool)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            pool.close()
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, len(claim_ids), errors
+
+def verify(path, stock):
+    conn = sqlite3.connect(path)
+    oversold = conn.execute("""
+        SELECT f.Food_ID, f.Quantity, COUNT(c.Claim_ID) AS Approved
+        FROM Food_Listings f
+        LEFT JOIN Claims c ON c.Food_ID = f.Food_ID AND c.Status = 'Approved'
+        GROUP BY f.Food_ID
+        HAVING f.Quantity < 0 OR COUNT(c.Claim_ID) + f.Quantity != ?
+    """, (stock,)).fetchall()
+    approved = conn.execute("SELECT COUNT(*) FROM Claims WHERE Status = 'Approved'").fetchone()[0]
+    conn.close()
+    return oversold, approved
+
+def main(listings=20, stock=5, claims_per_listing=25, workers=8):
+    failed = False
+    for batch_size in (1, 10):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stress.db")
+            make_db(path, listings, stock, claims_per_listing)
+            elapsed, attempted, errors = run(path, workers, batch_size)
+            oversold, approved = verify(path, stock)
+
+            ok = not oversold and not errors and approved == listings * stock
+            failed |= not ok
+            print(f"{'✅' if ok else '❌'} batch={batch_size:<3} {attempted} approvals by {workers} workers "
+                  f"in {elapsed:.2f}s ({attempted / elapsed:,.0f}/s): {approved} approved, "
+                  f"{len(oversold)} oversold listings, {len(errors)} errors")
+            for exc in errors[:3]:
+                print(f"      {exc!r}")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
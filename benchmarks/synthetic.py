@@ -0,0 +1,143 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.importer import CSV_FILES, suspended_triggers
+from app.schema import apply_schema
+
+DATA_DIR = os.path.join(ROOT, "data")
+
+CHUNK_ROWS = 250_000
+HISTORY_DAYS = 90
+
+# -------------------------------
+# Value Pools
+# -------------------------------
+# Names, cities and types are drawn from the shipped CSVs so the synthetic
+# tables have the same vocabulary (and roughly the same group sizes per
+# value) as the demo data, just more rows.
+def value_pools(data_dir=DATA_DIR):
+    frames = {table: pd.read_csv(os.path.join(data_dir, name)) for table, name in CSV_FILES.items()}
+    providers, receivers = frames["Providers"], frames["Receivers"]
+    food, claims = frames["Food_Listings"], frames["Claims"]
+    pools = {
+        "provider_name": providers["Name"], "provider_type": providers["Type"],
+        "address": providers["Address"], "city": pd.concat([providers["City"], receivers["City"]]),
+        "contact": providers["Contact"], "receiver_name": receivers["Name"], "receiver_type": receivers["Type"],
+        "food_name": food["Food_Name"], "food_type": food["Food_Type"], "meal_type": food["Meal_Type"],
+        "status": claims["Status"],
+    }
+    return {key: values.dropna().to_numpy(dtype=object) for key, values in pools.items()}
+
+def draw(rng, pool, size):
+    return pool[rng.integers(0, len(pool), size)]
+
+def timestamps(rng, now, size, days=HISTORY_DAYS):
+    seconds = rng.integers(0, days * 86400, size)
+    return (now - pd.to_timedelta(seconds, unit="s")).strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object)
+
+# -------------------------------
+# Table Generators
+# -------------------------------
+# Each generator yields lists of row tuples, CHUNK_ROWS at a time, with IDs
+# 1..rows. Listings take their Location and Provider_Type from the provider
+# they point at, like the real feed.
+def provider_chunks(rng, pools, rows, cities):
+    for start in range(0, rows, CHUNK_ROWS):
+        ids = np.arange(start + 1, min(start + CHUNK_ROWS, rows) + 1)
+        yield list(zip(ids.tolist(), draw(rng, pools["provider_name"], len(ids)),
+                       draw(rng, pools["provider_type"], len(ids)), draw(rng, pools["address"], len(ids)),
+                       cities[ids - 1], draw(rng, pools["contact"], len(ids))))
+
+def receiver_chunks(rng, pools, rows):
+    for start in range(0, rows, CHUNK_ROWS):
+        size = min(CHUNK_ROWS, rows - start)
+        yield list(zip(range(start + 1, start + size + 1), draw(rng, pools["receiver_name"], size),
+                       draw(rng, pools["receiver_type"], size), draw(rng, pools["city"], size),
+                       draw(rng, pools["contact"], size)))
+
+def listing_chunks(rng, pools, rows, providers, provider_cities, provider_types, now):
+    today = now.normalize()
+    for start in range(0, rows, CHUNK_ROWS):
+        size = min(CHUNK_ROWS, rows - start)
+        provider = rng.integers(1, providers + 1, size)
+        expiry = (today + pd.to_timedelta(rng.integers(-30, 31, size), unit="D")).strftime("%Y-%m-%d")
+        yield list(zip(range(start + 1, start + size + 1), draw(rng, pools["food_name"], size),
+                       rng.integers(1, 51, size).tolist(), expiry.to_numpy(dtype=object), provider.tolist(),
+                       provider_types[provider - 1], provider_cities[provider - 1],
+                       draw(rng, pools["food_type"], size), draw(rng, pools["meal_type"], size),
+                       timestamps(rng, now, size)))
+
+def claim_chunks(rng, pools, rows, listings, receivers, now):
+    for start in range(0, rows, CHUNK_ROWS):
+        size = min(CHUNK_ROWS, rows - start)
+        yield list(zip(range(start + 1, start + size + 1), rng.integers(1, listings + 1, size).tolist(),
+                       rng.integers(1, receivers + 1, size).tolist(), draw(rng, pools["status"], size),
+                       timestamps(rng, now, size)))
+
+# -------------------------------
+# Build
+# -------------------------------
+# Writes a fresh database at `path` with `rows` rows in every table (or the
+# per-table counts given). Triggers and indexes are suspended during the load
+# and the summaries rebuilt once at the end, as for a bulk CSV import.
+def make_db(path, rows, providers=None, receivers=None, listings=None, claims=None, seed=42, data_dir=DATA_DIR):
+    providers, receivers = providers or rows, receivers or rows
+    listings, claims = listings or rows, claims or rows
+    rng = np.random.default_rng(seed)
+    pools = value_pools(data_dir)
+    now = pd.Timestamp.now("UTC").tz_localize(None).floor("s")
+
+    provider_cities = draw(rng, pools["city"], providers)
+    provider_types = draw(rng, pools["provider_type"], providers)
+
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA journal_mode=WAL")
+    apply_schema(conn)
+    with suspended_triggers(conn):
+        inserts = [
+            ("INSERT INTO Providers (Provider_ID, Name, Type, Address, City, Contact) VALUES (?, ?, ?, ?, ?, ?)",
+             provider_chunks(rng, pools, providers, provider_cities)),
+            ("INSERT INTO Receivers (Receiver_ID, Name, Type, City, Contact) VALUES (?, ?, ?, ?, ?)",
+             receiver_chunks(rng, pools, receivers)),
+            ("INSERT INTO Food_Listings (Food_ID, Food_Name, Quantity, Expiry_Date, Provider_ID, Provider_Type, "
+             "Location, Food_Type, Meal_Type, Listed_At) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+             listing_chunks(rng, pools, listings, providers, provider_cities, provider_types, now)),
+            ("INSERT INTO Claims (Claim_ID, Food_ID, Receiver_ID, Status, Timestamp) VALUES (?, ?, ?, ?, ?)",
+             claim_chunks(rng, pools, claims, listings, receivers, now)),
+        ]
+        for sql, chunks in inserts:
+            for chunk in chunks:
+                conn.executemany(sql, chunk)
+                conn.commit()
+    conn.close()
+    return {"providers": providers, "receivers": receivers, "listings": listings, "claims": claims}
+
+# -------------------------------
+# Main
+# -------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic food wastage database")
+    parser.add_argument("rows", type=int, help="rows per table, e.g. 1000 up to 10000000")
+    parser.add_argument("--out", default="synthetic.db", help="database file to (re)create")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = make_db(args.out, args.rows, seed=args.seed)
+    print(f"✅ {args.out}: {', '.join(f'{n:,} {t}' for t, n in counts.items())} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
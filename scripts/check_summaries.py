@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import rollups, summary
+from app.schema import apply_schema
+from explain_analytics import load_queries
+
+DB_PATH = os.path.join("food_wastage.db")
+ANALYTICS_PATH = os.path.join("sql", "analytics.sql")
+SUMMARY_ANALYTICS_PATH = os.path.join("sql", "analytics_summary.sql")
+
+# -------------------------------
+# Query Parity
+# -------------------------------
+# Row order differs only between ties, so results are compared as sorted sets.
+def normalize(rows):
+    return sorted(tuple("" if v is None else round(v, 2) if isinstance(v, float) else v for v in row) for row in rows)
+
+def compare_analytics(conn):
+    failures = 0
+    pairs = zip(load_queries(ANALYTICS_PATH), load_queries(SUMMARY_ANALYTICS_PATH))
+    for (title, base_sql), (_, summary_sql) in pairs:
+        base = normalize(conn.execute(base_sql).fetchall())
+        fast = normalize(conn.execute(summary_sql).fetchall())
+        ok = base == fast
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {title}")
+    return failures
+
+def main(db_path=DB_PATH, repair=False):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    apply_schema(conn)
+
+    mismatches = summary.check(conn)
+    for metric, bad in mismatches:
+        print(f"❌ Summary '{metric}' disagrees with the base tables in {len(bad)} groups")
+        print(bad.head(10).to_string(index=False))
+    if not mismatches:
+        print("✅ Summary_Counts matches a full recomputation")
+
+    stale = rollups.check(conn)
+    if stale.empty:
+        print("✅ Time_Rollups matches a full recomputation")
+    else:
+        print(f"❌ Time_Rollups disagrees with the base tables in {len(stale)} buckets")
+        print(stale.head(10).to_string(index=False))
+
+    failures = compare_analytics(conn)
+
+    if mismatches and repair:
+        with conn:
+            summary.rebuild(conn)
+        print("🔧 Summary_Counts rebuilt from the base tables")
+    if not stale.empty and repair:
+        with conn:
+            rollups.rebuild(conn)
+        print("🔧 Time_Rollups rebuilt from the base tables")
+
+    conn.close()
+    if mismatches or failures or not stale.empty:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith("--") else DB_PATH,
+         repair="--repair" in sys.argv)
@@ -0,0 +1,73 @@
+import os
+import re
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schema import apply_schema
+
+DB_PATH = os.path.join("food_wastage.db")
+ANALYTICS_PATH = os.path.join("sql", "analytics.sql")
+
+# -------------------------------
+# Load Queries
+# -------------------------------
+# Each query in analytics.sql is preceded by a "-- N. Title" comment.
+def load_queries(path=ANALYTICS_PATH):
+    with open(path, "r") as f:
+        script = f.read()
+
+    queries, title, buffer = [], None, ""
+    for line in script.splitlines(keepends=True):
+        if line.startswith("--") and not buffer.strip():
+            title = line.lstrip("- ").strip()
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            queries.append((title, buffer.strip()))
+            title, buffer = None, ""
+    return queries
+
+# -------------------------------
+# Plan Checks
+# -------------------------------
+# A query is accepted when at most one table is read with a full scan (the
+# driving table of an aggregate that needs every row) and every other table
+# is reached through a primary key or index. Queries with a WHERE clause on
+# the driving table must not full-scan at all.
+def full_scans(plan):
+    scans = []
+    for _, _, _, detail in plan:
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and "USING" not in detail:
+            scans.append(match.group(1))
+    return scans
+
+def check_query(conn, sql):
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    scans = full_scans(plan)
+    filtered = re.search(r"\bWHERE\b", sql, re.IGNORECASE) and not re.search(r"\bJOIN\b", sql, re.IGNORECASE)
+    ok = len(scans) <= 1 and not (filtered and scans)
+    return ok, plan
+
+def main(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    apply_schema(conn)
+
+    failures = 0
+    for title, sql in load_queries():
+        ok, plan = check_query(conn, sql)
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {title}")
+        for _, _, _, detail in plan:
+            print(f"      {detail}")
+
+    conn.close()
+    if failures:
+        print(f"❌ {failures} queries fall back to full table scans")
+        sys.exit(1)
+    print("✅ All analytics queries use indexes for lookups and joins")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else DB_PATH)
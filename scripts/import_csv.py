@@ -0,0 +1,51 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.importer import CHUNK_SIZE, COMMIT_EVERY, DATA_DIR, format_stats, import_all
+from app.schema import TABLES, apply_schema
+
+DB_PATH = os.path.join("food_wastage.db")
+
+# -------------------------------
+# Streaming CSV Import
+# -------------------------------
+# Reads each feed in chunks, normalizes dates to ISO and inserts with
+# executemany inside large transactions, e.g.
+#   python scripts/import_csv.py --data-dir /feeds/2025-03-01 --tables Food_Listings Claims
+#   python scripts/import_csv.py --data-dir /feeds/daily --mode upsert
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream CSV feeds into food_wastage.db")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--tables", nargs="+", default=TABLES, choices=TABLES)
+    parser.add_argument("--mode", default="append", choices=["append", "upsert"],
+                        help="append every row, or upsert by ID skipping unchanged rows and "
+                             "rows already covered by a checkpoint")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--commit-every", type=int, default=COMMIT_EVERY)
+    parser.add_argument("--suspend-triggers", action="store_true",
+                        help="drop triggers and indexes during the load and rebuild them after "
+                             "(only while nothing else writes to the database)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    conn = sqlite3.connect(args.db)
+    conn.execute("PRAGMA foreign_keys=ON")
+    apply_schema(conn)
+
+    stats = import_all(conn, data_dir=args.data_dir, tables=args.tables,
+                       suspend_triggers=args.suspend_triggers, mode=args.mode,
+                       chunksize=args.chunksize, commit_every=args.commit_every)
+    for s in stats:
+        print(format_stats(s))
+
+    conn.close()
+    print(f"✅ Imported {sum(s['written'] for s in stats)} rows into {args.db}")
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,38 @@
 import sqlite3
-import pandas as pd
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.importer import format_stats, import_all
+from app.schema import TABLES, apply_schema
 
 # Paths
 DB_PATH = os.path.join("food_wastage.db")
 DATA_DIR = os.path.join("data")
 
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-
-    # --- Providers ---
-    providers = pd.read_csv(os.path.join(DATA_DIR, "providers_data.csv"))
-    providers.to_sql("Providers", conn, if_exists="replace", index=False)
-
-    # --- Receivers ---
-    receivers = pd.read_csv(os.path.join(DATA_DIR, "receivers_data.csv"))
-    receivers.to_sql("Receivers", conn, if_exists="replace", index=False)
-
-    # --- Food Listings ---
-    food_listings = pd.read_csv(os.path.join(DATA_DIR, "food_listings_data.csv"))
-    food_listings.to_sql("Food_Listings", conn, if_exists="replace", index=False)
-
-    # --- Claims ---
-    claims = pd.read_csv(os.path.join(DATA_DIR, "claims_data.csv"))
-    claims.to_sql("Claims", conn, if_exists="replace", index=False)
-
+def init_db(db_path=DB_PATH, data_dir=DATA_DIR):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys=ON")
+
+    # Start from an empty schema: children first so nothing dangles
+    for table in reversed(TABLES):
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+    # ...then everything derived from them, the import bookkeeping (row
+    # hashes and checkpoints would make the fresh import skip rows) and the
+    # interned cities and geocodes, which the base tables pointed at
+    for table in ["Summary_Counts", "Time_Rollups", "Table_Versions", "Receivers_FTS", "Food_Listings_FTS",
+                  "Import_Row_Hashes", "Import_Checkpoints", "Geo_Locations", "Cities"]:
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+    apply_schema(conn)
+
+    # Stream every CSV in; nothing else is using the new database yet, so
+    # triggers and indexes are rebuilt once at the end instead of per row
+    for stats in import_all(conn, data_dir=data_dir, suspend_triggers=True):
+        print(format_stats(stats))
+
+    conn.execute("ANALYZE")
+    conn.commit()
     conn.close()
     print("✅ Database initialized from CSV files!")
 
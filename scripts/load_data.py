@@ -1,28 +1,25 @@
 import sqlite3
-import pandas as pd
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.importer import format_stats, import_all
+from app.schema import apply_schema
 
 # Connect to SQLite database (it will be created if not exists)
 conn = sqlite3.connect("food_wastage.db")
-cursor = conn.cursor()
+conn.execute("PRAGMA foreign_keys=ON")
 
-# Load schema.sql file
-with open("sql/schema.sql", "r") as f:
-    cursor.executescript(f.read())
+# Create tables, indexes and triggers from sql/schema.sql
+apply_schema(conn)
 print("✅ Tables created successfully.")
 
-# Load CSVs
-providers = pd.read_csv("data/providers_data.csv")
-receivers = pd.read_csv("data/receivers_data.csv")
-food = pd.read_csv("data/food_listings_data.csv")
-claims = pd.read_csv("data/claims_data.csv")
-
-# Push into SQL tables
-providers.to_sql("Providers", conn, if_exists="append", index=False)
-receivers.to_sql("Receivers", conn, if_exists="append", index=False)
-food.to_sql("Food_Listings", conn, if_exists="append", index=False)
-claims.to_sql("Claims", conn, if_exists="append", index=False)
+# Stream the CSVs into the SQL tables in chunks; upserting by ID makes
+# reruns safe (unchanged rows and already-imported files are skipped)
+for stats in import_all(conn, data_dir="data", mode="upsert"):
+    print(format_stats(stats))
 
 print("✅ Data loaded successfully into food_wastage.db")
 
-conn.commit()
 conn.close()
@@ -0,0 +1,24 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import expiry
+from app.db import DB_NAME, get_pool
+
+# -------------------------------
+# Expiry Sweep
+# -------------------------------
+# One sweep for cron / a scheduler, for deployments where the app's own
+# background sweeper is disabled (FOOD_WASTAGE_SWEEP_INTERVAL=0).
+def main():
+    parser = argparse.ArgumentParser(description="Mark expired listings and cancel their pending claims.")
+    parser.add_argument("--db", default=DB_NAME)
+    args = parser.parse_args()
+
+    result = expiry.sweep(pool=get_pool(args.db))
+    print(f"✅ {result['expired']} listings marked expired, {result['cancelled']} pending claims cancelled")
+
+if __name__ == "__main__":
+    main()
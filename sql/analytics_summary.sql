@@ -0,0 +1,106 @@
+-- The 15 queries from analytics.sql, answered from the Summary_Counts table
+-- (kept current by triggers, see app/summary.py). Queries 4 and 12 are not
+-- additive over groups and still read the base tables through their indexes.
+
+-- 1. Number of food providers per city
+SELECT c.Name AS City, s.Row_Count AS Total_Providers
+FROM Summary_Counts s
+LEFT JOIN Cities c ON c.City_ID = s.Grp
+WHERE s.Metric = 'providers_by_city' AND s.Row_Count > 0;
+
+-- 2. Number of receivers per city
+SELECT c.Name AS City, s.Row_Count AS Total_Receivers
+FROM Summary_Counts s
+LEFT JOIN Cities c ON c.City_ID = s.Grp
+WHERE s.Metric = 'receivers_by_city' AND s.Row_Count > 0;
+
+-- 3. Provider type that contributes the most food
+SELECT Grp AS Provider_Type, Quantity AS Total_Food
+FROM Summary_Counts
+WHERE Metric = 'listings_by_provider_type' AND Row_Count > 0
+ORDER BY Total_Food DESC;
+
+-- 4. Contact information of providers in a specific city (example: Hyderabad)
+SELECT Name, Contact
+FROM Providers
+WHERE City = 'Hyderabad';
+
+-- 5. Receivers who claimed the most food
+SELECT r.Name, SUM(s.Row_Count) AS Total_Claims
+FROM Summary_Counts s
+JOIN Receivers r ON r.Receiver_ID = s.Grp
+WHERE s.Metric = 'claims_by_receiver_status' AND s.Row_Count > 0
+GROUP BY r.Name
+ORDER BY Total_Claims DESC;
+
+-- 6. Total quantity of food available
+SELECT SUM(Quantity) AS Total_Available_Food
+FROM Summary_Counts
+WHERE Metric = 'listings_by_provider_type';
+
+-- 7. City with the highest number of food listings
+SELECT c.Name AS Location, s.Row_Count AS Listings
+FROM Summary_Counts s
+LEFT JOIN Cities c ON c.City_ID = s.Grp
+WHERE s.Metric = 'listings_by_location' AND s.Row_Count > 0
+ORDER BY Listings DESC;
+
+-- 8. Most common food types available
+SELECT Grp AS Food_Type, Row_Count AS Count_Available
+FROM Summary_Counts
+WHERE Metric = 'listings_by_food_type' AND Row_Count > 0
+ORDER BY Count_Available DESC;
+
+-- 9. Number of food claims per food item
+SELECT f.Food_Name, SUM(s.Row_Count) AS Claims_Made
+FROM Summary_Counts s
+JOIN Food_Listings f ON f.Food_ID = s.Grp
+WHERE s.Metric = 'claims_by_food_status' AND s.Row_Count > 0
+GROUP BY f.Food_Name
+ORDER BY Claims_Made DESC;
+
+-- 10. Provider with the highest number of successful claims
+SELECT p.Name, SUM(s.Row_Count) AS Successful_Claims
+FROM Summary_Counts s
+JOIN Food_Listings f ON f.Food_ID = s.Grp
+JOIN Providers p ON f.Provider_ID = p.Provider_ID
+WHERE s.Metric = 'claims_by_food_status' AND s.Sub = 'Completed' AND s.Row_Count > 0
+GROUP BY p.Name
+ORDER BY Successful_Claims DESC;
+
+-- 11. Percentage of claims by status
+SELECT Grp AS Status,
+       ROUND(100.0 * Row_Count / (SELECT SUM(Row_Count) FROM Summary_Counts WHERE Metric = 'claims_by_status'), 2) AS Percentage
+FROM Summary_Counts
+WHERE Metric = 'claims_by_status' AND Row_Count > 0;
+
+-- 12. Average quantity of food claimed per receiver
+SELECT r.Name, ROUND(AVG(f.Quantity), 2) AS Avg_Quantity_Claimed
+FROM Claims c
+JOIN Food_Listings f ON c.Food_ID = f.Food_ID
+JOIN Receivers r ON c.Receiver_ID = r.Receiver_ID
+GROUP BY r.Name;
+
+-- 13. Most claimed meal type
+SELECT f.Meal_Type, SUM(s.Row_Count) AS Total_Claims
+FROM Summary_Counts s
+JOIN Food_Listings f ON f.Food_ID = s.Grp
+WHERE s.Metric = 'claims_by_food_status' AND s.Row_Count > 0
+GROUP BY f.Meal_Type
+ORDER BY Total_Claims DESC;
+
+-- 14. Total quantity of food donated by each provider
+SELECT p.Name, SUM(s.Quantity) AS Total_Donated
+FROM Summary_Counts s
+JOIN Providers p ON p.Provider_ID = s.Grp
+WHERE s.Metric = 'listings_by_provider' AND s.Row_Count > 0
+GROUP BY p.Name
+ORDER BY Total_Donated DESC;
+
+-- 15. City-wise completed claims
+SELECT r.City, SUM(s.Row_Count) AS Completed_Claims
+FROM Summary_Counts s
+JOIN Receivers r ON r.Receiver_ID = s.Grp
+WHERE s.Metric = 'claims_by_receiver_status' AND s.Sub = 'Completed' AND s.Row_Count > 0
+GROUP BY r.City
+ORDER BY Completed_Claims DESC;
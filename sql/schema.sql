@@ -6,7 +6,8 @@ CREATE TABLE IF NOT EXISTS Providers (
     Type TEXT,
     Address TEXT,
     City TEXT,
-    Contact TEXT
+    Contact TEXT,
+    City_ID INTEGER REFERENCES Cities(City_ID)  -- interned City (app/cities.py)
 );
 
 CREATE TABLE IF NOT EXISTS Receivers (
@@ -14,7 +15,8 @@ CREATE TABLE IF NOT EXISTS Receivers (
     Name TEXT,
     Type TEXT,
     City TEXT,
-    Contact TEXT
+    Contact TEXT,
+    City_ID INTEGER REFERENCES Cities(City_ID)  -- interned City (app/cities.py)
 );
 
 CREATE TABLE IF NOT EXISTS Food_Listings (
@@ -27,6 +29,9 @@ CREATE TABLE IF NOT EXISTS Food_Listings (
     Location TEXT,
     Food_Type TEXT,
     Meal_Type TEXT,
+    Expired INTEGER NOT NULL DEFAULT 0,  -- set by the expiry sweeper (app/expiry.py)
+    Listed_At TEXT,    -- YYYY-MM-DD HH:MM:SS UTC, set on insert (app/rollups.py)
+    City_ID INTEGER REFERENCES Cities(City_ID),  -- interned Location (app/cities.py)
     FOREIGN KEY (Provider_ID) REFERENCES Providers(Provider_ID) ON DELETE CASCADE
 );
 
@@ -39,3 +44,94 @@ CREATE TABLE IF NOT EXISTS Claims (
     FOREIGN KEY (Food_ID) REFERENCES Food_Listings(Food_ID) ON DELETE CASCADE,
     FOREIGN KEY (Receiver_ID) REFERENCES Receivers(Receiver_ID) ON DELETE CASCADE
 );
+
+-- Indexes used by the CRUD lookups, the dashboard filters and sql/analytics.sql
+CREATE INDEX IF NOT EXISTS idx_claims_food ON Claims(Food_ID);
+CREATE INDEX IF NOT EXISTS idx_claims_receiver_status ON Claims(Receiver_ID, Status);
+CREATE INDEX IF NOT EXISTS idx_food_listings_provider ON Food_Listings(Provider_ID);
+CREATE INDEX IF NOT EXISTS idx_food_listings_location_type_meal ON Food_Listings(Location, Food_Type, Meal_Type);
+CREATE INDEX IF NOT EXISTS idx_providers_city ON Providers(City);
+CREATE INDEX IF NOT EXISTS idx_receivers_city ON Receivers(City);
+
+-- Per-table write counters, bumped by triggers on every insert, update or
+-- delete so readers can tell which cached frames are stale
+CREATE TABLE IF NOT EXISTS Table_Versions (
+    Table_Name TEXT PRIMARY KEY,
+    Version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO Table_Versions (Table_Name, Version) VALUES
+    ('Providers', 0), ('Receivers', 0), ('Food_Listings', 0), ('Claims', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_providers_insert_version AFTER INSERT ON Providers
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Providers'; END;
+CREATE TRIGGER IF NOT EXISTS trg_providers_update_version AFTER UPDATE ON Providers
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Providers'; END;
+CREATE TRIGGER IF NOT EXISTS trg_providers_delete_version AFTER DELETE ON Providers
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Providers'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_receivers_insert_version AFTER INSERT ON Receivers
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Receivers'; END;
+CREATE TRIGGER IF NOT EXISTS trg_receivers_update_version AFTER UPDATE ON Receivers
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Receivers'; END;
+CREATE TRIGGER IF NOT EXISTS trg_receivers_delete_version AFTER DELETE ON Receivers
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Receivers'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_food_listings_insert_version AFTER INSERT ON Food_Listings
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Food_Listings'; END;
+CREATE TRIGGER IF NOT EXISTS trg_food_listings_update_version AFTER UPDATE ON Food_Listings
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Food_Listings'; END;
+CREATE TRIGGER IF NOT EXISTS trg_food_listings_delete_version AFTER DELETE ON Food_Listings
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Food_Listings'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_claims_insert_version AFTER INSERT ON Claims
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Claims'; END;
+CREATE TRIGGER IF NOT EXISTS trg_claims_update_version AFTER UPDATE ON Claims
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Claims'; END;
+CREATE TRIGGER IF NOT EXISTS trg_claims_delete_version AFTER DELETE ON Claims
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Claims'; END;
+
+-- Bookkeeping for incremental (upsert) imports: a content hash per imported
+-- row so unchanged rows are skipped, and a checkpoint per source file so
+-- reruns only read rows that were not imported yet
+CREATE TABLE IF NOT EXISTS Import_Row_Hashes (
+    Table_Name TEXT NOT NULL,
+    Row_ID INTEGER NOT NULL,
+    Row_Hash INTEGER NOT NULL,
+    PRIMARY KEY (Table_Name, Row_ID)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS Import_Checkpoints (
+    Table_Name TEXT NOT NULL,
+    File_Path TEXT NOT NULL,
+    File_Size INTEGER NOT NULL,
+    File_Mtime REAL NOT NULL,
+    File_Hash TEXT NOT NULL,
+    Rows_Done INTEGER NOT NULL DEFAULT 0,
+    Completed INTEGER NOT NULL DEFAULT 0,
+    Updated_At TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (Table_Name, File_Path)
+);
+
+-- Geocoded Providers.City / Receivers.City / Food_Listings.Location names
+-- (see app/geo.py): only names found in data/gazetteer.csv (Source
+-- 'gazetteer'); other names have no row and no position.
+CREATE TABLE IF NOT EXISTS Geo_Locations (
+    Name TEXT PRIMARY KEY,
+    Lat REAL NOT NULL,
+    Lon REAL NOT NULL,
+    Source TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_geo_locations_lat_lon ON Geo_Locations(Lat, Lon);
+
+-- Versioned like the base tables, so cached map data is rebuilt once new
+-- places have been geocoded
+INSERT OR IGNORE INTO Table_Versions (Table_Name, Version) VALUES ('Geo_Locations', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_geo_locations_insert_version AFTER INSERT ON Geo_Locations
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Geo_Locations'; END;
+CREATE TRIGGER IF NOT EXISTS trg_geo_locations_update_version AFTER UPDATE ON Geo_Locations
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Geo_Locations'; END;
+CREATE TRIGGER IF NOT EXISTS trg_geo_locations_delete_version AFTER DELETE ON Geo_Locations
+BEGIN UPDATE Table_Versions SET Version = Version + 1 WHERE Table_Name = 'Geo_Locations'; END;
@@ -0,0 +1,44 @@
+-- Full-text indexes for the Add Claim pickers (requires SQLite's FTS5 module).
+-- Both are external-content tables over the base tables, kept in sync by triggers.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS Receivers_FTS USING fts5(
+    Name, City,
+    content='Receivers', content_rowid='Receiver_ID', prefix='2 3'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS Food_Listings_FTS USING fts5(
+    Food_Name, Food_Type, Location,
+    content='Food_Listings', content_rowid='Food_ID', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_receivers_insert AFTER INSERT ON Receivers
+BEGIN
+    INSERT INTO Receivers_FTS (rowid, Name, City) VALUES (NEW.Receiver_ID, NEW.Name, NEW.City);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fts_receivers_delete AFTER DELETE ON Receivers
+BEGIN
+    INSERT INTO Receivers_FTS (Receivers_FTS, rowid, Name, City) VALUES ('delete', OLD.Receiver_ID, OLD.Name, OLD.City);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fts_receivers_update AFTER UPDATE OF Receiver_ID, Name, City ON Receivers
+BEGIN
+    INSERT INTO Receivers_FTS (Receivers_FTS, rowid, Name, City) VALUES ('delete', OLD.Receiver_ID, OLD.Name, OLD.City);
+    INSERT INTO Receivers_FTS (rowid, Name, City) VALUES (NEW.Receiver_ID, NEW.Name, NEW.City);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_food_listings_insert AFTER INSERT ON Food_Listings
+BEGIN
+    INSERT INTO Food_Listings_FTS (rowid, Food_Name, Food_Type, Location)
+    VALUES (NEW.Food_ID, NEW.Food_Name, NEW.Food_Type, NEW.Location);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fts_food_listings_delete AFTER DELETE ON Food_Listings
+BEGIN
+    INSERT INTO Food_Listings_FTS (Food_Listings_FTS, rowid, Food_Name, Food_Type, Location)
+    VALUES ('delete', OLD.Food_ID, OLD.Food_Name, OLD.Food_Type, OLD.Location);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fts_food_listings_update AFTER UPDATE OF Food_ID, Food_Name, Food_Type, Location ON Food_Listings
+BEGIN
+    INSERT INTO Food_Listings_FTS (Food_Listings_FTS, rowid, Food_Name, Food_Type, Location)
+    VALUES ('delete', OLD.Food_ID, OLD.Food_Name, OLD.Food_Type, OLD.Location);
+    INSERT INTO Food_Listings_FTS (rowid, Food_Name, Food_Type, Location)
+    VALUES (NEW.Food_ID, NEW.Food_Name, NEW.Food_Type, NEW.Location);
+END;
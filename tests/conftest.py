@@ -0,0 +1,25 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import ConnectionPool
+from app.schema import apply_schema
+
+# A new database with the full schema (tables, triggers, indexes)
+def make_pool(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    apply_schema(conn)
+    conn.close()
+    return ConnectionPool(path)
+
+# A fresh one per test
+@pytest.fixture
+def pool(tmp_path):
+    pool = make_pool(str(tmp_path / "test.db"))
+    yield pool
+    pool.close()
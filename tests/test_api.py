@@ -0,0 +1,54 @@
+import socket
+import threading
+
+import api
+from app import claims, repository
+from app.repository import Claim, FoodListing, Provider, Receiver
+
+
+# -------------------------------
+# Conditional GETs
+# -------------------------------
+def test_etag_matches_whole_tags_only():
+    tag = '"3-20250301"'
+    assert api.etag_matches('"3-20250301"', tag)
+    assert api.etag_matches(' "1-20250301" ,  "3-20250301"', tag)
+    assert api.etag_matches('W/"3-20250301"', tag)
+    assert api.etag_matches("*", tag)
+    assert not api.etag_matches("", tag)
+    assert not api.etag_matches('"13-20250301"', tag)
+    assert not api.etag_matches('"3-20250301-old"', tag)
+
+# -------------------------------
+# Batch Status Changes
+# -------------------------------
+def test_status_results_follow_the_request_order(pool):
+    provider_id = repository.insert(Provider(Name="P", City="A"), pool=pool)
+    receiver_id = repository.insert(Receiver(Name="R", City="A"), pool=pool)
+    food_id = repository.insert(FoodListing(Food_Name="Bread", Quantity=1, Provider_ID=provider_id), pool=pool)
+    first = repository.insert(Claim(Food_ID=food_id, Receiver_ID=receiver_id, Status="Pending"), pool=pool)
+    second = repository.insert(Claim(Food_ID=food_id, Receiver_ID=receiver_id, Status="Pending"), pool=pool)
+
+    body = {"updates": [{"claim_id": first, "status": "Approved"}, {"claim_id": second, "status": "Approved"},
+                        {"claim_id": first, "status": "Approved"}, {"claim_id": 999, "status": "Rejected"}]}
+    results = api.post_claim_statuses(body, pool)["results"]
+    assert [(r["claim_id"], r["result"]) for r in results] == [
+        (first, claims.UPDATED), (second, claims.OUT_OF_STOCK), (first, claims.UPDATED), (999, claims.NOT_FOUND)]
+
+# -------------------------------
+# Request Bodies
+# -------------------------------
+def test_negative_content_length_is_rejected(pool):
+    server = api.make_server("127.0.0.1", 0, pool=pool, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.create_connection(("127.0.0.1", server.server_port), timeout=5) as sock:
+            sock.sendall(b"POST /claims HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n[]")
+            response = b""
+            while chunk := sock.recv(4096):
+                response += chunk
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"Content-Length must not be negative" in response
@@ -0,0 +1,46 @@
+import ast
+import os
+import sqlite3
+
+from app import rollups, summary
+from benchmarks import bench_suite, synthetic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# -------------------------------
+# Synthetic Data
+# -------------------------------
+def test_generated_database_is_consistent(tmp_path):
+    path = str(tmp_path / "synthetic.db")
+    counts = synthetic.make_db(path, 300, claims=500, seed=1)
+    conn = sqlite3.connect(path)
+    try:
+        assert {t: conn.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0]
+                for t in ["Providers", "Receivers", "Food_Listings", "Claims"]} == {
+            "Providers": counts["providers"], "Receivers": counts["receivers"],
+            "Food_Listings": counts["listings"], "Claims": counts["claims"]}
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        assert summary.check(conn) == []
+        assert rollups.check(conn).empty
+    finally:
+        conn.close()
+
+# -------------------------------
+# Suite
+# -------------------------------
+def test_a_failing_measurement_is_recorded_not_raised():
+    assert bench_suite.measure(lambda: None, 3)["runs"] == 3
+    assert bench_suite.measure(lambda: 1 / 0, 3) == {"error": "ZeroDivisionError: division by zero"}
+
+def test_regressions_ignore_noise():
+    previous = {"queries": {"slow": {"median_ms": 10.0}, "tiny": {"median_ms": 0.1}, "same": {"median_ms": 5.0}}}
+    current = {"queries": {"slow": {"median_ms": 15.0}, "tiny": {"median_ms": 0.5}, "same": {"median_ms": 5.5}}}
+    assert bench_suite.regressions(previous, current, 1.2) == [("queries", "slow", 10.0, 15.0)]
+
+def test_every_sidebar_page_is_timed():
+    with open(os.path.join(ROOT, "app.py")) as f:
+        tree = ast.parse(f.read())
+    radio = next(node for node in ast.walk(tree)
+                 if isinstance(node, ast.Call) and ast.unparse(node.func) == "st.sidebar.radio")
+    assert bench_suite.PAGES == ast.literal_eval(radio.args[1])
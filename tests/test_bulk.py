@@ -0,0 +1,37 @@
+import pandas as pd
+
+from app import bulk, repository
+from app.repository import FoodListing, Provider, Receiver
+
+
+def upload(rows):
+    return pd.DataFrame(rows, dtype="string")
+
+def listing_and_receiver(pool):
+    provider_id = repository.insert(Provider(Name="P", City="A"), pool=pool)
+    food_id = repository.insert(FoodListing(Food_Name="Bread", Quantity=3, Provider_ID=provider_id), pool=pool)
+    receiver_id = repository.insert(Receiver(Name="R", City="A"), pool=pool)
+    return str(food_id), str(receiver_id)
+
+# -------------------------------
+# Claims Uploads
+# -------------------------------
+def test_invalid_status_is_rejected(pool):
+    food_id, receiver_id = listing_and_receiver(pool)
+    good, errors = bulk.validate("Claims", upload([
+        {"Food_ID": food_id, "Receiver_ID": receiver_id, "Status": "Pending"},
+        {"Food_ID": food_id, "Receiver_ID": receiver_id, "Status": "Shipped"},
+    ]), pool=pool)
+    assert len(good) == 1
+    assert errors[["Row", "Column", "Value"]].values.tolist() == [[3, "Status", "Shipped"]]
+
+def test_dates_are_normalized_and_blank_timestamps_stamped_in_utc(pool, monkeypatch):
+    monkeypatch.setattr(repository, "utc_now", lambda: "2024-03-01 12:00:00")
+    food_id, receiver_id = listing_and_receiver(pool)
+    good, errors = bulk.validate("Claims", upload([
+        {"Food_ID": food_id, "Receiver_ID": receiver_id, "Status": "Pending", "Timestamp": "3/17/2024 8:05"},
+        {"Food_ID": food_id, "Receiver_ID": receiver_id, "Status": "Pending", "Timestamp": None},
+        {"Food_ID": food_id, "Receiver_ID": receiver_id, "Status": "Pending", "Timestamp": "yesterday"},
+    ]), pool=pool)
+    assert good["Timestamp"].tolist() == ["2024-03-17 08:05:00", "2024-03-01 12:00:00"]
+    assert errors[["Row", "Column", "Error"]].values.tolist() == [[4, "Timestamp", "not a date"]]
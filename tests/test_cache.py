@@ -0,0 +1,27 @@
+from app import cache, repository
+from app.repository import Provider
+from conftest import make_pool
+
+
+# -------------------------------
+# Versioned Cache
+# -------------------------------
+def test_entries_are_per_database(tmp_path):
+    first, second = make_pool(str(tmp_path / "first.db")), make_pool(str(tmp_path / "second.db"))
+    try:
+        repository.insert(Provider(Name="Alpha", City=""), pool=first)
+        repository.insert(Provider(Name="Beta", City=""), pool=second)
+        # Same table versions in both, so only the database tells them apart
+        assert cache.table_versions(pool=first) == cache.table_versions(pool=second)
+
+        assert cache.load_rows("Providers", "City_ID", None, pool=first)["Name"].tolist() == ["Alpha"]
+        assert cache.load_rows("Providers", "City_ID", None, pool=second)["Name"].tolist() == ["Beta"]
+    finally:
+        first.close()
+        second.close()
+
+def test_a_write_invalidates_the_entry(pool):
+    repository.insert(Provider(Name="Alpha", City=""), pool=pool)
+    assert len(cache.load_rows("Providers", "City_ID", None, pool=pool)) == 1
+    repository.insert(Provider(Name="Beta", City=""), pool=pool)
+    assert len(cache.load_rows("Providers", "City_ID", None, pool=pool)) == 2
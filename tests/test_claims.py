@@ -0,0 +1,71 @@
+import threading
+
+from app import claims, repository
+from app.db import ConnectionPool
+from app.repository import FoodListing, Provider, Receiver
+
+
+def listing_and_receiver(pool, quantity):
+    provider_id = repository.insert(Provider(Name="P", City="A"), pool=pool)
+    receiver_id = repository.insert(Receiver(Name="R", City="A"), pool=pool)
+    food_id = repository.insert(FoodListing(Food_Name="Bread", Quantity=quantity, Provider_ID=provider_id), pool=pool)
+    return food_id, receiver_id
+
+def quantity(pool, food_id):
+    return repository.get(FoodListing, food_id, pool=pool).Quantity
+
+# -------------------------------
+# Adding Claims
+# -------------------------------
+def test_adding_an_approved_claim_takes_stock(pool):
+    food_id, receiver_id = listing_and_receiver(pool, quantity=1)
+    claim_id = claims.add_claim(food_id, receiver_id, claims.APPROVED, pool=pool)
+    assert repository.get(repository.Claim, claim_id, pool=pool).Status == claims.APPROVED
+    assert quantity(pool, food_id) == 0
+
+    assert claims.add_claim(food_id, receiver_id, claims.APPROVED, pool=pool) == claims.OUT_OF_STOCK
+    assert claims.add_claim(food_id, receiver_id, "Pending", pool=pool) > claim_id
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM Claims").fetchone()[0] == 2
+
+# -------------------------------
+# Concurrent Approvals
+# -------------------------------
+# Workers on their own connections approve every claim of a few listings
+# with far more claims than stock, one at a time and in batches; exactly the
+# stock is approved and no listing goes below zero.
+def test_concurrent_approvals_never_oversell(pool):
+    stock, listings, claims_per_listing, workers = 3, 4, 12, 6
+    receiver_id = repository.insert(Receiver(Name="R", City="A"), pool=pool)
+    provider_id = repository.insert(Provider(Name="P", City="A"), pool=pool)
+    food_ids = [repository.insert(FoodListing(Food_Name="Bread", Quantity=stock, Provider_ID=provider_id), pool=pool)
+                for _ in range(listings)]
+    claim_ids = claims.create_claims([(f, receiver_id) for f in food_ids for _ in range(claims_per_listing)],
+                                     pool=pool)
+
+    errors = []
+
+    def worker(offset):
+        own = ConnectionPool(pool.db_name)
+        try:
+            mine = claim_ids[offset::workers]
+            for i in range(0, len(mine), 1 + offset % 3):
+                batch = mine[i:i + 1 + offset % 3]
+                claims.approve_claims(batch, pool=own)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            own.close()
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with pool.connection() as conn:
+        approved = dict(conn.execute(
+            "SELECT Food_ID, COUNT(*) FROM Claims WHERE Status = 'Approved' GROUP BY Food_ID"))
+    assert approved == {food_id: stock for food_id in food_ids}
+    assert [quantity(pool, food_id) for food_id in food_ids] == [0] * listings
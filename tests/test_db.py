@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from app.db import ConnectionPool, transaction
+
+
+def count(pool):
+    with pool.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM Providers").fetchone()[0]
+
+# -------------------------------
+# Connection Pool
+# -------------------------------
+def test_nested_requests_on_a_thread_share_one_connection(pool):
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+    # Handed back to the pool, not closed
+    with pool.connection() as again:
+        assert again is outer
+
+def test_threads_get_their_own_connections(pool):
+    seen = []
+    ready, done = threading.Barrier(2), threading.Event()
+
+    def hold():
+        with pool.connection() as conn:
+            seen.append(conn)
+            ready.wait()
+            done.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    with pool.connection() as conn:
+        ready.wait()
+        assert seen[0] is not conn
+        done.set()
+    thread.join()
+
+def test_connections_enforce_foreign_keys_and_use_wal(pool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_read_only_pools_refuse_writes(pool):
+    reader = ConnectionPool(pool.db_name, read_only=True)
+    try:
+        with reader.connection() as conn, pytest.raises(Exception, match="readonly"):
+            conn.execute("INSERT INTO Providers (Name) VALUES ('x')")
+    finally:
+        reader.close()
+
+def test_an_open_transaction_is_rolled_back_when_the_connection_is_returned(pool):
+    with pool.connection() as conn:
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO Providers (Name) VALUES ('x')")
+    assert count(pool) == 0
+
+# -------------------------------
+# Transactions
+# -------------------------------
+def test_nested_transactions_join_the_outer_one(pool):
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn, transaction(conn, immediate=True):
+            conn.execute("INSERT INTO Providers (Name) VALUES ('outer')")
+            with transaction(conn):
+                conn.execute("INSERT INTO Providers (Name) VALUES ('inner')")
+            # The inner block didn't commit, so this rolls back both rows
+            raise RuntimeError
+    assert count(pool) == 0
+
+    with pool.connection() as conn, transaction(conn):
+        conn.execute("INSERT INTO Providers (Name) VALUES ('committed')")
+    assert count(pool) == 1
@@ -0,0 +1,62 @@
+import datetime
+
+from app import expiry, repository
+from app.repository import Claim, FoodListing, Provider, Receiver
+
+
+def in_days(days):
+    return (datetime.datetime.now(datetime.timezone.utc).date() + datetime.timedelta(days=days)).isoformat()
+
+def listing(pool, expiry_date, quantity=3):
+    provider_id = repository.insert(Provider(Name="P", City="Austin"), pool=pool)
+    return repository.insert(FoodListing(Food_Name="Bread", Quantity=quantity, Expiry_Date=expiry_date,
+                                         Provider_ID=provider_id), pool=pool)
+
+def expired_flags(pool):
+    with pool.connection() as conn:
+        return dict(conn.execute("SELECT Food_ID, Expired FROM Food_Listings"))
+
+# -------------------------------
+# ISO Expiry Dates
+# -------------------------------
+def test_feed_dates_are_stored_as_iso(pool):
+    food_id = listing(pool, "3/7/2025")
+    assert repository.get(FoodListing, food_id, pool=pool).Expiry_Date == "2025-03-07"
+    with pool.connection() as conn:
+        conn.execute("UPDATE Food_Listings SET Expiry_Date = '12/31/2030 00:00' WHERE Food_ID = ?", (food_id,))
+        conn.commit()
+    assert repository.get(FoodListing, food_id, pool=pool).Expiry_Date == "2030-12-31"
+
+# -------------------------------
+# Sweeper
+# -------------------------------
+def test_sweep_expires_past_listings_and_cancels_their_pending_claims(pool):
+    receiver_id = repository.insert(Receiver(Name="R", City="Austin"), pool=pool)
+    past, today = listing(pool, in_days(-1)), listing(pool, in_days(0))
+    pending = repository.insert(Claim(Food_ID=past, Receiver_ID=receiver_id, Status="Pending"), pool=pool)
+    done = repository.insert(Claim(Food_ID=past, Receiver_ID=receiver_id, Status="Completed"), pool=pool)
+    kept = repository.insert(Claim(Food_ID=today, Receiver_ID=receiver_id, Status="Pending"), pool=pool)
+
+    assert expiry.sweep(pool=pool) == {"expired": 1, "cancelled": 1}
+    assert expired_flags(pool) == {past: 1, today: 0}
+    statuses = [repository.get(Claim, claim_id, pool=pool).Status for claim_id in (pending, done, kept)]
+    assert statuses == [expiry.CANCELLED, "Completed", "Pending"]
+    # Nothing new to do
+    assert expiry.sweep(pool=pool) == {"expired": 0, "cancelled": 0}
+
+def test_a_new_expiry_date_clears_the_expired_flag(pool):
+    food_id = listing(pool, in_days(-1))
+    expiry.sweep(pool=pool)
+    with pool.connection() as conn:
+        conn.execute("UPDATE Food_Listings SET Expiry_Date = ? WHERE Food_ID = ?", (in_days(3), food_id))
+        conn.commit()
+    assert expired_flags(pool) == {food_id: 0}
+
+# -------------------------------
+# Reads
+# -------------------------------
+def test_expiring_within_lists_open_listings_soonest_first(pool):
+    later, sooner = listing(pool, in_days(1)), listing(pool, in_days(0))
+    listing(pool, in_days(0), quantity=0)
+    listing(pool, in_days(5))
+    assert expiry.expiring_within(48, pool=pool)["Food_ID"].tolist() == [sooner, later]
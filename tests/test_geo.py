@@ -0,0 +1,40 @@
+from app import geo, repository, writes
+from app.repository import Provider, Receiver
+
+
+# -------------------------------
+# Geocoding
+# -------------------------------
+def test_only_gazetteer_places_get_a_position(pool):
+    repository.insert(Provider(Name="A", City="Guntur"), pool=pool)
+    repository.insert(Provider(Name="B", City="South Christopherborough"), pool=pool)
+    repository.insert(Receiver(Name="C", City="South Christopherborough"), pool=pool)
+    geo.refresh(pool=pool)
+
+    assert geo.location_of("Guntur", pool=pool)["Source"] == geo.GAZETTEER
+    assert geo.location_of("South Christopherborough", pool=pool) is None
+
+    points = geo.clusters(["Providers", "Receivers"], 4, pool=pool)
+    assert points[["Layer", "Count", "Label"]].values.tolist() == [["Providers", 1, "Guntur"]]
+    missing = geo.unlocated(["Providers", "Receivers"], pool=pool)
+    assert missing[["Layer", "Places", "Count"]].values.tolist() == [["Providers", 1, 1], ["Receivers", 1, 1]]
+
+def test_install_drops_made_up_positions(pool):
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO Geo_Locations (Name, Lat, Lon, Source) VALUES ('Nowhere', 40.1, -90.2, ?)",
+                     (geo.APPROXIMATE,))
+        geo.install(conn)
+        conn.commit()
+    assert geo.location_of("Nowhere", pool=pool) is None
+
+def test_places_written_through_the_write_queue_are_geocoded(pool):
+    # Cached before the write, so the new position must invalidate it
+    assert geo.clusters(["Providers"], 4, pool=pool).empty
+    queue = writes.WriteQueue(pool)
+    try:
+        queue.submit(repository.insert, Provider(Name="A", City="Chennai")).result()
+    finally:
+        queue.close()  # the hooks have run once the writer has stopped
+
+    assert geo.location_of("Chennai", pool=pool)["Source"] == geo.GAZETTEER
+    assert geo.clusters(["Providers"], 4, pool=pool)["Label"].tolist() == ["Chennai"]
@@ -0,0 +1,89 @@
+import pytest
+
+from app import importer, summary
+
+
+PROVIDERS = [(1, "Green Bites", "Austin"), (2, "Bean Town", "Boston"), (3, "Fresh Co", "Austin"),
+             (4, "Daily Bread", "Chicago"), (5, "Soup Stop", "Denver")]
+
+def write_csv(path, rows):
+    path.write_text("Provider_ID,Name,Type,Address,City,Contact\n"
+                    + "".join(f"{i},{name},Restaurant,,{city},\n" for i, name, city in rows))
+    return str(path)
+
+def providers(pool):
+    with pool.connection() as conn:
+        return conn.execute("SELECT Provider_ID, Name, City FROM Providers ORDER BY 1").fetchall()
+
+# -------------------------------
+# Chunked Import
+# -------------------------------
+def test_chunks_are_streamed_and_dates_normalized(pool, tmp_path):
+    path = tmp_path / "food_listings_data.csv"
+    path.write_text("Food_ID,Food_Name,Quantity,Expiry_Date,Provider_ID\n"
+                    "1,Bread,3,3/17/2025,\n2,Rice,4,2025-03-18,\n3,Soup,5,someday,\n")
+    with pool.connection() as conn:
+        stats = importer.import_csv(conn, "Food_Listings", str(path), chunksize=2, commit_every=2)
+        expiry = [row[0] for row in conn.execute("SELECT Expiry_Date FROM Food_Listings ORDER BY Food_ID")]
+    assert (stats["rows"], stats["written"]) == (3, 3)
+    assert expiry == ["2025-03-17", "2025-03-18", "someday"]
+
+def test_suspended_triggers_are_rebuilt_after_the_load(pool, tmp_path):
+    write_csv(tmp_path / "providers_data.csv", PROVIDERS)
+    with pool.connection() as conn:
+        importer.import_all(conn, data_dir=str(tmp_path), tables=["Providers"], suspend_triggers=True)
+        assert summary.check(conn) == []
+        triggers = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'trg_providers_insert_version'")
+        assert triggers.fetchone()[0] == 1
+    assert summary.total("providers_by_city", pool=pool) == (5, 0)
+
+# -------------------------------
+# Upsert Mode
+# -------------------------------
+def test_upsert_writes_only_new_and_changed_rows(pool, tmp_path):
+    path = write_csv(tmp_path / "providers.csv", PROVIDERS[:3])
+    with pool.connection() as conn:
+        first = importer.import_csv(conn, "Providers", path, mode="upsert")
+        # Same file again: skipped by its checkpoint without being read
+        again = importer.import_csv(conn, "Providers", path, mode="upsert")
+
+        write_csv(tmp_path / "providers.csv", [(1, "Green Bites", "Austin"), (2, "Bean Town Deli", "Boston"),
+                                               (3, "Fresh Co", "Austin")])
+        changed = importer.import_csv(conn, "Providers", path, mode="upsert")
+    assert first["written"] == 3
+    assert again["skipped_file"]
+    assert (changed["rows"], changed["written"], changed["unchanged"]) == (3, 1, 2)
+    assert providers(pool)[1] == (2, "Bean Town Deli", "Boston")
+
+def test_a_grown_file_resumes_after_the_imported_rows(pool, tmp_path):
+    path = write_csv(tmp_path / "providers.csv", PROVIDERS[:3])
+    with pool.connection() as conn:
+        importer.import_csv(conn, "Providers", path, mode="upsert")
+        with open(path, "a") as f:
+            f.write("".join(f"{i},{name},Restaurant,,{city},\n" for i, name, city in PROVIDERS[3:]))
+        stats = importer.import_csv(conn, "Providers", path, mode="upsert")
+    assert (stats["skipped_by_checkpoint"], stats["rows"], stats["written"]) == (3, 2, 2)
+    assert providers(pool) == PROVIDERS
+
+def test_an_interrupted_import_resumes_from_its_checkpoint(pool, tmp_path, monkeypatch):
+    path = write_csv(tmp_path / "providers.csv", PROVIDERS)
+    save_hashes, calls = importer.save_hashes, []
+
+    def fail_on_third_chunk(*args):
+        calls.append(1)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        save_hashes(*args)
+
+    monkeypatch.setattr(importer, "save_hashes", fail_on_third_chunk)
+    with pool.connection() as conn:
+        with pytest.raises(KeyboardInterrupt):
+            importer.import_csv(conn, "Providers", path, mode="upsert", chunksize=2, commit_every=2)
+    # The first two chunks were committed with their checkpoint; the third was rolled back
+    assert len(providers(pool)) == 4
+
+    monkeypatch.undo()
+    with pool.connection() as conn:
+        stats = importer.import_csv(conn, "Providers", path, mode="upsert", chunksize=2, commit_every=2)
+    assert (stats["skipped_by_checkpoint"], stats["rows"], stats["written"]) == (4, 1, 1)
+    assert providers(pool) == PROVIDERS
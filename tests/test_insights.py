@@ -0,0 +1,79 @@
+from app import insights, repository
+from app.repository import Claim, FoodListing, Provider, Receiver
+
+
+# Two providers in Austin and Boston, one expired listing, and claims by
+# receivers from both cities
+def sample(pool):
+    austin = repository.insert(Provider(Name="Green Bites", City="Austin"), pool=pool)
+    boston = repository.insert(Provider(Name="Bean Town", City="Boston"), pool=pool)
+    r_austin = repository.insert(Receiver(Name="Shelter A", City="Austin"), pool=pool)
+    r_boston = repository.insert(Receiver(Name="Shelter B", City="Boston"), pool=pool)
+    listings = [
+        (austin, "Austin", "Vegan", "Lunch", 5, "2000-01-01"),
+        (austin, "Austin", "Vegetarian", "Dinner", 3, "2999-01-01"),
+        (boston, "Boston", "Vegan", "Lunch", 2, "2999-01-01"),
+    ]
+    food_ids = [repository.insert(FoodListing(Food_Name="Meal", Provider_ID=p, Location=city, Food_Type=food,
+                                              Meal_Type=meal, Quantity=qty, Expiry_Date=expiry,
+                                              Provider_Type="Restaurant"), pool=pool)
+                for p, city, food, meal, qty, expiry in listings]
+    for food_id, receiver_id in [(food_ids[0], r_austin), (food_ids[2], r_boston), (food_ids[2], r_austin)]:
+        repository.insert(Claim(Food_ID=food_id, Receiver_ID=receiver_id, Status="Pending"), pool=pool)
+
+def records(df):
+    return df.to_dict("records")
+
+# -------------------------------
+# Filters
+# -------------------------------
+def test_filter_options_list_listing_cities_and_values(pool):
+    sample(pool)
+    repository.insert(Receiver(Name="Shelter C", City="Chicago"), pool=pool)
+    options = insights.filter_options(pool=pool)
+    # Only cities that have listings
+    assert options["city"] == ["Austin", "Boston"]
+    assert sorted(options["provider"]) == ["Bean Town", "Green Bites"]
+    assert sorted(options["food_type"]) == ["Vegan", "Vegetarian"]
+
+def test_city_filter_uses_the_listing_location(pool):
+    sample(pool)
+    results = insights.compute({**insights.empty_filters(), "city": "Austin"}, pool=pool)
+    assert results["kpis"] == {"providers": 1, "receivers": 2, "listings": 2}
+    assert records(results["quantity_by_city"]) == [{"City": "Austin", "Quantity": 8}]
+    # Claims on Austin listings only
+    assert records(results["receiver_claim_counts"]) == [{"Receiver_ID": 1, "Total_Claims": 1, "Name": "Shelter A"}]
+    # Claims by receivers in Austin, on any listing
+    assert records(results["claims_by_city"]) == [{"City": "Austin", "Claims": 2}]
+
+# -------------------------------
+# Single-Pass Aggregates
+# -------------------------------
+def test_every_aggregate_comes_from_the_filtered_listings(pool):
+    sample(pool)
+    results = insights.compute({**insights.empty_filters(), "food_type": "Vegan"}, pool=pool)
+    assert results["kpis"] == {"providers": 2, "receivers": 2, "listings": 2}
+    assert records(results["food_type_counts"]) == [{"Food_Type": "Vegan", "Count": 2}]
+    assert records(results["food_type_by_city"]) == [{"City": "Austin", "Food_Type": "Vegan", "Count": 1},
+                                                    {"City": "Boston", "Food_Type": "Vegan", "Count": 1}]
+    assert records(results["expiry_status"]) == [{"Status": "Expired", "Count": 1}, {"Status": "Valid", "Count": 1}]
+    assert records(results["wasted_food_types"]) == [{"Food_Type": "Vegan", "Expired_Count": 1}]
+    assert records(results["receiver_claim_counts"]) == [{"Receiver_ID": 1, "Total_Claims": 2, "Name": "Shelter A"},
+                                                        {"Receiver_ID": 2, "Total_Claims": 1, "Name": "Shelter B"}]
+    assert results["provider_shares"]["Share %"].tolist() == [50.0, 50.0]
+    assert records(results["quantity_by_food_type"]) == [{"Food_Type": "Vegan", "Quantity": 7}]
+
+def test_no_matching_listings_gives_empty_charts(pool):
+    sample(pool)
+    results = insights.compute({**insights.empty_filters(), "city": "Austin", "provider": "Bean Town"}, pool=pool)
+    assert results["kpis"]["listings"] == 0
+    assert results["food_type_counts"].empty and results["provider_shares"].empty
+
+def test_a_write_is_reflected_in_the_next_compute(pool):
+    sample(pool)
+    filters = insights.empty_filters()
+    assert insights.compute(filters, pool=pool)["kpis"]["listings"] == 3
+    provider_id = repository.insert(Provider(Name="New", City="Austin"), pool=pool)
+    repository.insert(FoodListing(Food_Name="Soup", Provider_ID=provider_id, Location="Austin", Quantity=1),
+                      pool=pool)
+    assert insights.compute(filters, pool=pool)["kpis"] == {"providers": 3, "receivers": 2, "listings": 4}
@@ -0,0 +1,67 @@
+import datetime
+import math
+
+from app import claims, geo, matching, repository
+from app.repository import Claim, FoodListing, Provider, Receiver
+
+
+def in_days(days):
+    return (datetime.date.today() + datetime.timedelta(days=days)).isoformat()
+
+def receiver(pool, name, city, kind="Individual"):
+    return repository.insert(Receiver(Name=name, City=city, Type=kind), pool=pool)
+
+def listing(pool, location, days, quantity=3):
+    provider_id = repository.insert(Provider(Name="P", City=location), pool=pool)
+    return repository.insert(FoodListing(Food_Name="Bread", Location=location, Quantity=quantity,
+                                         Expiry_Date=in_days(days), Provider_ID=provider_id), pool=pool)
+
+def suggested(pool, **kwargs):
+    geo.refresh(pool=pool)
+    suggestions = matching.suggest_claims(pool=pool, **kwargs)
+    return dict(zip(suggestions["Food_ID"], suggestions["Receiver_ID"])), suggestions
+
+# -------------------------------
+# Matching
+# -------------------------------
+def test_urgent_listings_go_to_shelters_first_in_their_own_city(pool):
+    person = receiver(pool, "Person", "Chennai")
+    shelter = receiver(pool, "Shelter", "Chennai", "Shelter")
+    later, sooner = listing(pool, "Chennai", 5), listing(pool, "Chennai", 1)
+
+    pairs, suggestions = suggested(pool, max_per_receiver=1)
+    assert pairs == {sooner: shelter, later: person}
+    assert suggestions["Distance_km"].tolist() == [0.0, 0.0]
+
+def test_a_city_without_receivers_is_served_by_the_nearest_one(pool):
+    receiver(pool, "Far", "Chennai")
+    near = receiver(pool, "Near", "Amaravati")
+    food_id = listing(pool, "Guntur", 2)
+
+    pairs, suggestions = suggested(pool)
+    assert pairs == {food_id: near}
+    assert 0 < suggestions["Distance_km"].iloc[0] < 50
+
+def test_places_without_a_position_are_only_matched_in_their_own_city(pool):
+    local = receiver(pool, "Local", "South Christopherborough")
+    receiver(pool, "Elsewhere", "Chennai")
+    own = listing(pool, "South Christopherborough", 2)
+    stranded = listing(pool, "Lake Amanda", 2)
+
+    pairs, suggestions = suggested(pool)
+    assert pairs == {own: local}
+    assert stranded not in pairs
+    assert math.isnan(suggestions["Distance_km"].iloc[0])
+
+def test_accepting_suggestions_approves_them_against_the_stock(pool):
+    shelter = receiver(pool, "Shelter", "Chennai", "Shelter")
+    food_id = listing(pool, "Chennai", 1, quantity=1)
+    _, suggestions = suggested(pool)
+
+    [(claim_id, result)] = matching.accept_suggestions(suggestions, pool=pool)
+    assert result == claims.UPDATED
+    claim = repository.get(Claim, claim_id, pool=pool)
+    assert (claim.Food_ID, claim.Receiver_ID, claim.Status) == (food_id, shelter, claims.APPROVED)
+    assert repository.get(FoodListing, food_id, pool=pool).Quantity == 0
+    # Nothing is left to suggest
+    assert suggested(pool)[1].empty
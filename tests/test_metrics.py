@@ -0,0 +1,51 @@
+import pytest
+
+from app import metrics
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    metrics.clear()
+    yield
+    metrics.clear()
+
+def sql_samples():
+    df = metrics.samples()
+    return df[df["Kind"] == "sql"]
+
+# -------------------------------
+# Recording
+# -------------------------------
+def test_statements_are_timed_once_their_rows_are_read(pool):
+    with pool.connection() as conn:
+        metrics.clear()  # the connection's PRAGMAs
+        conn.execute("INSERT INTO Providers (Name) VALUES ('x')")
+        conn.commit()
+        cursor = conn.execute("SELECT Name FROM Providers")
+        assert sql_samples()["Name"].tolist() == ["INSERT INTO Providers (Name) VALUES ('x')"]
+        cursor.fetchall()
+
+    assert sql_samples()["Name"].tolist()[1] == "SELECT Name FROM Providers"
+    # The insert's trigger bodies are counted with it
+    assert sql_samples()["Statements"].iloc[0] > 1
+
+def test_a_section_that_raises_is_still_recorded():
+    with pytest.raises(ValueError), metrics.section("Page / broken"):
+        raise ValueError
+    assert metrics.samples()[["Kind", "Name"]].values.tolist() == [["section", "Page / broken"]]
+
+# -------------------------------
+# Summaries and Export
+# -------------------------------
+def test_summary_and_prometheus_export():
+    for ms in range(1, 101):
+        metrics.record("section", 'Map "View"', float(ms))
+    metrics.record("page", "Overview", 5.0)
+
+    stats = metrics.summary("section").iloc[0]
+    assert (stats["Count"], stats["Max_ms"], stats["Total_ms"]) == (100, 100.0, 5050.0)
+    assert stats["p50_ms"] == pytest.approx(50.5)
+
+    text = metrics.to_prometheus()
+    assert 'food_wastage_section_seconds_count{name="Map \\"View\\""} 100' in text
+    assert 'food_wastage_page_seconds{name="Overview",quantile="0.99"} 0.005000' in text
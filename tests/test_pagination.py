@@ -0,0 +1,45 @@
+import pytest
+
+from app import pagination, repository
+from app.db import read_sql
+from app.repository import Provider
+
+
+def providers(pool):
+    # Duplicate and NULL sort values, so the keyset has to fall back on the key
+    for name, city, contact in [("A", "Austin", "555"), ("B", "Boston", None), ("C", "Austin", "111"),
+                                ("D", "Denver", None), ("E", "Austin", "555"), ("F", None, "999"),
+                                ("G", "Boston", "111")]:
+        repository.insert(Provider(Name=name, City=city, Contact=contact), pool=pool)
+
+# Every page from the first to the last, following the cursors
+def walk(pool, **kwargs):
+    names, after = [], None
+    while True:
+        df, after = pagination.fetch_page("Providers", after=after, page_size=2, pool=pool, **kwargs)
+        names += df["Name"].tolist()
+        if after is None:
+            return names
+
+# -------------------------------
+# Keyset Pages
+# -------------------------------
+@pytest.mark.parametrize("sort_col", ["Provider_ID", "Contact", "City"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_follow_the_full_sort_order(pool, sort_col, descending):
+    providers(pool)
+    sql, params = pagination.export_query("Providers", sort_col, descending)
+    expected = read_sql(sql, params, pool=pool)["Name"].tolist()
+    assert walk(pool, sort_col=sort_col, descending=descending) == expected
+
+def test_search_filters_pages_and_count(pool):
+    providers(pool)
+    assert walk(pool, sort_col="Name", search_col="City", search="aust") == ["A", "C", "E"]
+    assert pagination.count_rows("Providers", "City", "aust", pool=pool) == 3
+    assert pagination.count_rows("Providers", pool=pool) == 7
+
+def test_a_full_last_page_has_no_next_cursor(pool):
+    for name in ["A", "B"]:
+        repository.insert(Provider(Name=name, City="Austin"), pool=pool)
+    df, after = pagination.fetch_page("Providers", page_size=2, pool=pool)
+    assert len(df) == 2 and after is None
@@ -0,0 +1,23 @@
+from app import repository
+from app.replica import Replica
+from app.repository import Provider
+
+
+# -------------------------------
+# First Copy
+# -------------------------------
+def test_first_copy_is_made_in_the_background(pool, tmp_path):
+    repository.insert(Provider(Name="Green Bites", City="Springfield"), pool=pool)
+    replica = Replica(pool, path=str(tmp_path / "replica.db"))
+    try:
+        assert not replica.ready()
+        assert replica.staleness() is None
+        assert not (tmp_path / "replica.db").exists()
+
+        replica.start().wait(timeout=10)
+        assert replica.ready()
+        with replica.pool.connection() as conn:
+            assert conn.execute("SELECT Name FROM Providers").fetchall() == [("Green Bites",)]
+        assert replica.staleness()["writes_behind"] == 0
+    finally:
+        replica.close()
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from app import db_helper, db_utils, repository
+from app.repository import Claim, FoodListing, Provider, Receiver
+
+
+def row(pool, sql, params=()):
+    with pool.connection() as conn:
+        return conn.execute(sql, params).fetchone()
+
+# -------------------------------
+# Single Records
+# -------------------------------
+def test_insert_get_update_delete(pool):
+    provider_id = repository.insert(Provider(Name="Green Bites", Type="Restaurant", City="Springfield"), pool=pool)
+    provider = repository.get(Provider, provider_id, pool=pool)
+    assert (provider.Name, provider.Type, provider.City) == ("Green Bites", "Restaurant", "Springfield")
+
+    provider.Contact = "555-0100"
+    assert repository.update(provider, columns=["Contact"], pool=pool)
+    assert repository.get(Provider, provider_id, pool=pool).Contact == "555-0100"
+    assert not repository.update(Provider(Provider_ID=provider_id + 1, Name="x"), columns=["Name"], pool=pool)
+
+    assert repository.delete(Provider, provider_id, pool=pool)
+    assert repository.get(Provider, provider_id, pool=pool) is None
+    assert not repository.delete(Provider, provider_id, pool=pool)
+
+def test_claim_timestamp_is_stamped_on_insert(pool):
+    provider_id = repository.insert(Provider(Name="P", City="A"), pool=pool)
+    food_id = repository.insert(FoodListing(Food_Name="Bread", Quantity=3, Provider_ID=provider_id), pool=pool)
+    receiver_id = repository.insert(Receiver(Name="R", City="A"), pool=pool)
+    claim_id = repository.insert(Claim(Food_ID=food_id, Receiver_ID=receiver_id, Status="Pending"), pool=pool)
+    assert repository.get(Claim, claim_id, pool=pool).Timestamp is not None
+
+def test_foreign_keys_are_enforced(pool):
+    with pytest.raises(sqlite3.IntegrityError):
+        repository.insert(Claim(Food_ID=1, Receiver_ID=1, Status="Pending"), pool=pool)
+
+# -------------------------------
+# Managed Columns
+# -------------------------------
+def test_managed_columns_are_not_written(pool):
+    provider_id = repository.insert(Provider(Name="P", City="Springfield", City_ID=999), pool=pool)
+    food_id = repository.insert(FoodListing(Food_Name="Bread", Quantity=1, Expiry_Date="2000-01-01",
+                                            Provider_ID=provider_id, Location="Springfield",
+                                            Expired=1, Listed_At="1999-01-01 00:00:00", City_ID=999), pool=pool)
+    city_id = row(pool, "SELECT City_ID FROM Cities WHERE Name = 'Springfield'")[0]
+
+    listing = repository.get(FoodListing, food_id, pool=pool)
+    assert listing.Expired == 0
+    assert listing.Listed_At != "1999-01-01 00:00:00"
+    assert listing.City_ID == city_id
+    assert repository.get(Provider, provider_id, pool=pool).City_ID == city_id
+
+def test_update_refuses_key_and_managed_columns(pool):
+    for columns in (["Food_ID"], ["Expired"], ["Listed_At"], ["City_ID"]):
+        with pytest.raises(ValueError):
+            repository.update(FoodListing(Food_ID=1), columns=columns, pool=pool)
+
+# -------------------------------
+# Batches
+# -------------------------------
+def test_batch_round_trip(pool):
+    assert repository.insert_many([Receiver(Receiver_ID=i, Name=f"R{i}", City="A") for i in range(1, 6)],
+                                  pool=pool) == 5
+    assert repository.insert_many([], pool=pool) == 0
+
+    found = repository.get_many(Receiver, [5, 1, 3, 3, 42], pool=pool)
+    assert [r.Receiver_ID for r in found] == [1, 3, 5]
+
+    for r in found:
+        r.Name = r.Name.lower()
+    assert repository.update_many(found + [Receiver(Receiver_ID=42, Name="x")], columns=["Name"], pool=pool) == 3
+    assert [r.Name for r in repository.get_many(Receiver, range(1, 6), pool=pool)] == ["r1", "R2", "r3", "R4", "r5"]
+
+    assert repository.delete_many(Receiver, [2, 4, 42], pool=pool) == 2
+    assert [r.Receiver_ID for r in repository.get_many(Receiver, range(1, 6), pool=pool)] == [1, 3, 5]
+
+def test_insert_many_is_all_or_nothing(pool):
+    repository.insert(Receiver(Receiver_ID=2, Name="taken", City="A"), pool=pool)
+    with pytest.raises(sqlite3.IntegrityError):
+        repository.insert_many([Receiver(Receiver_ID=i, Name=f"R{i}", City="A") for i in range(1, 4)], pool=pool)
+    assert row(pool, "SELECT COUNT(*) FROM Receivers")[0] == 1
+
+# -------------------------------
+# Legacy Wrappers
+# -------------------------------
+def test_legacy_wrappers_write_name_and_location(pool, monkeypatch):
+    monkeypatch.setattr(repository, "get_pool", lambda: pool)
+
+    provider_id = db_helper.add_provider("Helper Provider", "Springfield", "555-0101")
+    assert row(pool, "SELECT Name, City, Contact FROM Providers WHERE Provider_ID = ?", (provider_id,)) == \
+        ("Helper Provider", "Springfield", "555-0101")
+    assert db_helper.update_provider(provider_id, "Renamed", "Shelbyville", "555-0102")
+    assert row(pool, "SELECT Name, City FROM Providers WHERE Provider_ID = ?", (provider_id,)) == \
+        ("Renamed", "Shelbyville")
+
+    receiver_id = db_utils.add_receiver("Utils Receiver", "555-0103", "Springfield")
+    assert row(pool, "SELECT Name, City, Contact FROM Receivers WHERE Receiver_ID = ?", (receiver_id,)) == \
+        ("Utils Receiver", "Springfield", "555-0103")
+
+    food_id = db_helper.add_food("Soup", "Vegan", "Springfield", "2030-01-01", provider_id)
+    assert row(pool, "SELECT Food_Name, Location FROM Food_Listings WHERE Food_ID = ?", (food_id,)) == \
+        ("Soup", "Springfield")
+    assert db_helper.update_food(food_id, "Stew", "Vegan", "Shelbyville", "2030-01-02")
+    assert row(pool, "SELECT Food_Name, Location, Expiry_Date FROM Food_Listings WHERE Food_ID = ?", (food_id,)) == \
+        ("Stew", "Shelbyville", "2030-01-02")
+
+    food_id = db_utils.add_food("Rice", "Vegetarian", 4, "2030-01-01", provider_id, "Restaurant", "Ogdenville", "Lunch")
+    assert row(pool, "SELECT Food_Name, Location, Quantity FROM Food_Listings WHERE Food_ID = ?", (food_id,)) == \
+        ("Rice", "Ogdenville", 4)
+
+    assert db_helper.delete_provider(provider_id)
+    assert row(pool, "SELECT COUNT(*) FROM Food_Listings")[0] == 0  # cascaded
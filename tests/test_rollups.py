@@ -0,0 +1,41 @@
+from app import repository, rollups
+from app.repository import Claim, FoodListing, Provider, Receiver
+
+
+# -------------------------------
+# Listed_At Backfill
+# -------------------------------
+def test_listings_without_listed_at_are_backfilled(pool):
+    provider_id = repository.insert(Provider(Name="P", City="A"), pool=pool)
+    receiver_id = repository.insert(Receiver(Name="R", City="A"), pool=pool)
+    claimed = repository.insert(FoodListing(Food_Name="Bread", Quantity=3, Expiry_Date="2025-03-20",
+                                            Provider_ID=provider_id), pool=pool)
+    unclaimed = repository.insert(FoodListing(Food_Name="Rice", Quantity=3, Expiry_Date="2025-03-20",
+                                              Provider_ID=provider_id), pool=pool)
+    repository.insert(Claim(Food_ID=claimed, Receiver_ID=receiver_id, Status="Pending",
+                            Timestamp="2025-03-05 10:30:00"), pool=pool)
+
+    with pool.connection() as conn:
+        conn.execute("UPDATE Food_Listings SET Listed_At = NULL")
+        conn.commit()
+        rollups.install(conn)
+        conn.commit()
+        listed = dict(conn.execute("SELECT Food_ID, Listed_At FROM Food_Listings"))
+        assert rollups.check(conn).empty
+
+    assert listed == {claimed: "2025-03-05 10:30:00", unclaimed: "2025-03-20 00:00:00"}
+
+# -------------------------------
+# Deletes
+# -------------------------------
+def test_deleting_a_listing_removes_its_cascaded_claims(pool):
+    provider_id = repository.insert(Provider(Name="P", City="A"), pool=pool)
+    receiver_id = repository.insert(Receiver(Name="R", City="A"), pool=pool)
+    food_id = repository.insert(FoodListing(Food_Name="Bread", Quantity=3, Provider_ID=provider_id,
+                                            Location="Austin", Food_Type="Vegan"), pool=pool)
+    repository.insert(Claim(Food_ID=food_id, Receiver_ID=receiver_id, Status="Pending"), pool=pool)
+
+    assert repository.delete(FoodListing, food_id, pool=pool)
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM Claims").fetchone()[0] == 0
+        assert rollups.check(conn).empty
@@ -0,0 +1,46 @@
+from app import repository, search
+from app.repository import FoodListing, Provider, Receiver
+
+
+def ids(results):
+    return [item_id for item_id, _ in results]
+
+# -------------------------------
+# Receivers
+# -------------------------------
+def test_every_word_matches_a_prefix(pool):
+    green = repository.insert(Receiver(Name="Green Harvest NGO", City="Austin"), pool=pool)
+    repository.insert(Receiver(Name="Green Table", City="Boston"), pool=pool)
+    repository.insert(Receiver(Name="Harvest House", City="Austin"), pool=pool)
+
+    assert ids(search.search_receivers("gre ngo", pool=pool)) == [green]
+    assert sorted(ids(search.search_receivers("harv aus", pool=pool))) == [green, green + 2]
+    assert search.search_receivers("gre ngo", pool=pool)[0][1] == f"Green Harvest NGO (Austin) · #{green}"
+
+def test_the_index_follows_updates_and_deletes(pool):
+    receiver_id = repository.insert(Receiver(Name="Old Name", City="Austin"), pool=pool)
+    receiver = repository.get(Receiver, receiver_id, pool=pool)
+    receiver.Name = "New Name"
+    repository.update(receiver, columns=["Name"], pool=pool)
+    assert search.search_receivers("old", pool=pool) == []
+    assert ids(search.search_receivers("new", pool=pool)) == [receiver_id]
+
+    repository.delete(Receiver, receiver_id, pool=pool)
+    assert search.search_receivers("new", pool=pool) == []
+
+# -------------------------------
+# Food Listings
+# -------------------------------
+def test_only_open_listings_are_offered_soonest_expiry_first(pool):
+    provider_id = repository.insert(Provider(Name="P", City="Austin"), pool=pool)
+
+    def listing(quantity, expiry):
+        return repository.insert(FoodListing(Food_Name="Bread Loaf", Food_Type="Vegan", Location="Austin",
+                                             Quantity=quantity, Expiry_Date=expiry, Provider_ID=provider_id),
+                                 pool=pool)
+    later, sooner = listing(3, "2999-06-01"), listing(3, "2999-01-01")
+    listing(0, "2999-01-01")   # no stock left
+    listing(3, "2000-01-01")   # expired
+
+    assert ids(search.search_food("", pool=pool)) == [sooner, later]
+    assert sorted(ids(search.search_food("bread vegan", pool=pool))) == [later, sooner]
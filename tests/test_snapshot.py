@@ -0,0 +1,48 @@
+import os
+
+from app import repository, snapshot, writes
+from app.db import fetch_all
+from app.repository import FoodListing, Provider
+
+
+def snapshot_version(pool, table):
+    return snapshot._version(snapshot.snapshot_path(table, pool))
+
+# -------------------------------
+# Invalidation
+# -------------------------------
+def test_a_write_outside_the_queue_is_exported_by_the_next_reader(pool):
+    repository.insert(Provider(Name="Alpha", City="A"), pool=pool)
+    assert snapshot.frame("Providers", ["Name"], pool=pool)["Name"].tolist() == ["Alpha"]
+    repository.insert(Provider(Name="Beta", City="A"), pool=pool)
+    assert snapshot.frame("Providers", ["Name"], pool=pool)["Name"].tolist() == ["Alpha", "Beta"]
+
+def test_the_write_queue_exports_after_its_commit(pool):
+    repository.insert(Provider(Name="Alpha", City="A"), pool=pool)
+    snapshot.frame("Providers", pool=pool)
+    queue = writes.WriteQueue(pool)
+    try:
+        queue.submit(repository.insert, Provider(Name="Beta", City="A")).result()
+    finally:
+        queue.close()  # the hooks have run once the writer has stopped
+    versions = dict(fetch_all("SELECT Table_Name, Version FROM Table_Versions", pool=pool))
+    assert snapshot_version(pool, "Providers") == versions["Providers"]
+    # Tables nobody has read aren't exported
+    assert not os.path.exists(snapshot.snapshot_path("Claims", pool))
+
+# -------------------------------
+# Export
+# -------------------------------
+def test_numeric_columns_with_text_values_are_exported_as_text(pool, monkeypatch):
+    monkeypatch.setattr(snapshot, "EXPORT_BATCH_ROWS", 2)
+    provider_id = repository.insert(Provider(Name="P", City="A"), pool=pool)
+    for name in ["Bread", "Rice", "Soup"]:
+        repository.insert(FoodListing(Food_Name=name, Quantity=3, Provider_ID=provider_id), pool=pool)
+    with pool.connection() as conn:
+        # Only the last batch holds the text value
+        conn.execute("UPDATE Food_Listings SET Quantity = 'a few' WHERE Food_Name = 'Soup'")
+        conn.commit()
+
+    data = snapshot.mapped_table("Food_Listings", pool=pool)
+    assert str(data.schema.field("Food_ID").type) == "int64"
+    assert data.column("Quantity").to_pylist() == ["3", "3", "a few"]
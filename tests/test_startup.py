@@ -0,0 +1,49 @@
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs app.py with AppTest in a fresh interpreter against the test database,
+# counting apply_schema calls.
+PROBE = r"""
+import json, os, sys
+from streamlit.testing.v1 import AppTest
+from app import schema
+
+calls = []
+apply_schema = schema.apply_schema
+schema.apply_schema = lambda conn: calls.append(1) or apply_schema(conn)
+
+at = AppTest.from_file(os.path.join(os.getcwd(), "app.py"), default_timeout=120)
+at.run()
+at.sidebar.radio[0].set_value(sys.argv[1]).run()
+for _ in range(3):
+    at.run()
+print(json.dumps({"errors": [str(e.value) for e in at.exception], "schema_runs": len(calls)}))
+"""
+
+def probe(db_path, page):
+    env = dict(os.environ, FOOD_WASTAGE_DB=db_path, FOOD_WASTAGE_REPLICA="0", FOOD_WASTAGE_SWEEP_INTERVAL="0")
+    out = subprocess.run([sys.executable, "-c", PROBE, page], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+# -------------------------------
+# Cold Start
+# -------------------------------
+def test_schema_runs_once_per_process(pool):
+    assert probe(pool.db_name, "Manage Providers") == {"errors": [], "schema_runs": 1}
+
+# Streamlit imports plotly itself, so this checks the app's own imports
+def test_plotly_is_only_imported_by_the_chart_pages():
+    with open(os.path.join(ROOT, "app.py")) as f:
+        tree = ast.parse(f.read())
+    top_level = [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    assert not [line for line in top_level if "plotly" in line]
+
+    code = "import sys, app.bulk, app.geo, app.insights, app.matching, app.snapshot; print('plotly' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
@@ -0,0 +1,72 @@
+from app import cache, repository, rollups, summary
+from app.repository import Claim, FoodListing, Provider, Receiver
+
+
+# -------------------------------
+# City Groups
+# -------------------------------
+def test_city_counts_are_keyed_on_city_id(pool):
+    for name, city in [("A", "Austin"), ("B", "austin "), ("C", "AUSTIN"), ("D", "Boston"), ("E", ""), ("F", None)]:
+        repository.insert(Provider(Name=name, City=city), pool=pool)
+
+    by_city = summary.providers_by_city(pool=pool).set_index("City")
+    assert by_city["Providers"].to_dict() == {"Austin": 3, "Boston": 1, "": 2}
+    assert by_city.at["", "City_ID"] is None
+    with pool.connection() as conn:
+        assert summary.check(conn) == []
+
+def test_providers_without_a_city_can_be_listed(pool):
+    repository.insert(Provider(Name="Somewhere", City="Austin"), pool=pool)
+    repository.insert(Provider(Name="Nowhere", City=" "), pool=pool)
+    rows = cache.load_rows("Providers", "City_ID", None, pool=pool)
+    assert rows["Name"].tolist() == ["Nowhere"]
+
+def test_rollup_city_filter_matches_any_spelling(pool):
+    provider_id = repository.insert(Provider(Name="P", City="Austin"), pool=pool)
+    for location in ["Austin", "AUSTIN ", "Boston"]:
+        repository.insert(FoodListing(Food_Name="Bread", Quantity=2, Provider_ID=provider_id, Location=location),
+                          pool=pool)
+
+    today = repository.utc_now()[:10]
+    counts = rollups.series("listings", today, today, "day", city="austin", pool=pool)
+    assert counts["Count"].tolist() == [2]
+    with pool.connection() as conn:
+        assert rollups.check(conn).empty
+
+# -------------------------------
+# Trigger Maintenance
+# -------------------------------
+def test_counts_follow_inserts_updates_and_deletes(pool):
+    provider_id = repository.insert(Provider(Name="P", City="Austin"), pool=pool)
+    receiver_id = repository.insert(Receiver(Name="R", City="Austin"), pool=pool)
+    food_ids = [repository.insert(FoodListing(Food_Name="Bread", Quantity=qty, Provider_ID=provider_id,
+                                              Food_Type="Vegan", Meal_Type="Lunch"), pool=pool)
+                for qty in (2, 3, 4)]
+    claim_ids = [repository.insert(Claim(Food_ID=f, Receiver_ID=receiver_id, Status="Pending"), pool=pool)
+                 for f in food_ids]
+
+    with pool.connection() as conn:
+        conn.execute("UPDATE Food_Listings SET Food_Type = 'Vegetarian', Quantity = 10 WHERE Food_ID = ?",
+                     (food_ids[0],))
+        conn.execute("UPDATE Claims SET Status = 'Completed' WHERE Claim_ID = ?", (claim_ids[1],))
+        conn.commit()
+    repository.delete(FoodListing, food_ids[2], pool=pool)
+
+    assert summary.total("listings_by_food_type", pool=pool) == (2, 13)
+    statuses = summary.counts("claims_by_status", pool=pool).set_index("Grp")["Row_Count"].to_dict()
+    assert statuses == {"Pending": 1, "Completed": 1}
+    with pool.connection() as conn:
+        assert summary.check(conn) == []
+
+def test_changed_triggers_are_replaced_and_the_counts_rebuilt(pool):
+    repository.insert(Provider(Name="P", City="Austin"), pool=pool)
+    with pool.connection() as conn:
+        # An older trigger that counted nothing, and counts that drifted with it
+        conn.execute("DROP TRIGGER trg_summary_providers_insert")
+        conn.execute("CREATE TRIGGER trg_summary_providers_insert AFTER INSERT ON Providers BEGIN SELECT 1; END")
+        conn.execute("DELETE FROM Summary_Counts")
+        conn.commit()
+        summary.install(conn)
+        conn.commit()
+    repository.insert(Provider(Name="Q", City="Austin"), pool=pool)
+    assert summary.total("providers_by_city", pool=pool) == (2, 0)
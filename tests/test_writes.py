@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app import db, repository, writes
+from app.db import ConnectionPool
+from app.repository import Provider
+
+
+@pytest.fixture
+def queue(pool):
+    queue = writes.WriteQueue(pool)
+    yield queue
+    queue.close()
+
+def names(pool):
+    with pool.connection() as conn:
+        return [row[0] for row in conn.execute("SELECT Name FROM Providers ORDER BY Provider_ID")]
+
+# Holds the writer until the returned event is set, so the writes queued
+# meanwhile wait behind it
+def block(queue):
+    started, gate = threading.Event(), threading.Event()
+    blocker = queue.submit(lambda pool=None: started.set() or gate.wait())
+    started.wait()
+    return blocker, gate
+
+def insert_then_fail(name, pool=None):
+    repository.insert(Provider(Name=name, City="A"), pool=pool)
+    raise ValueError(name)
+
+# -------------------------------
+# Write Queue
+# -------------------------------
+def test_a_failing_write_is_rolled_back_on_its_own(pool, queue):
+    blocker, gate = block(queue)
+    futures = [queue.submit(repository.insert, Provider(Name="A", City="A")),
+               queue.submit(insert_then_fail, "B"),
+               queue.submit(repository.insert, Provider(Name="C", City="A"))]
+    gate.set()
+    blocker.result()
+
+    assert futures[0].result() == 1
+    with pytest.raises(ValueError, match="B"):
+        futures[1].result()
+    assert futures[2].result() > 1
+    assert names(pool) == ["A", "C"]
+
+def test_results_mean_the_write_is_committed(pool, queue):
+    queue.submit(repository.insert, Provider(Name="A", City="A")).result()
+    # Visible to a connection of another pool straight away
+    other = ConnectionPool(pool.db_name)
+    try:
+        assert names(other) == ["A"]
+    finally:
+        other.close()
+
+def test_writes_queued_behind_a_busy_writer_commit_together(pool, queue, monkeypatch):
+    commits = []
+    monkeypatch.setattr(writes, "_hooks", [lambda pool: commits.append(1)])
+    blocker, gate = block(queue)
+    futures = [queue.submit(repository.insert, Provider(Name=str(i), City="A")) for i in range(20)]
+    gate.set()
+    blocker.result()
+    for future in futures:
+        future.result()
+
+    queue.close()
+    # The blocker's group, then everything queued behind it
+    assert len(commits) == 2
+    assert len(names(pool)) == 20
+
+def test_a_failed_transaction_fails_every_write_in_the_group(pool, monkeypatch):
+    monkeypatch.setattr(db, "BUSY_TIMEOUT_MS", 0)
+    impatient = ConnectionPool(pool.db_name)
+    queue = writes.WriteQueue(impatient)
+    other = sqlite3.connect(pool.db_name)
+    other.execute("BEGIN IMMEDIATE")  # holds the write lock
+    try:
+        futures = [queue.submit(repository.insert, Provider(Name=str(i), City="A")) for i in range(2)]
+        for future in futures:
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                future.result(timeout=10)
+    finally:
+        other.rollback()
+        other.close()
+        queue.close()
+        impatient.close()
+    assert names(pool) == []